@@ -0,0 +1,118 @@
+# File: rag_project/adapters/cache/sqlite_embedding_cache.py
+
+import sqlite3
+import time
+from typing import Dict, List
+import numpy as np
+from rag_project.core.ports.embedding_cache_port import EmbeddingCachePort
+
+# Keys per SELECT, below SQLite's default limit on bound parameters
+_LOOKUP_BATCH = 500
+
+
+class SqliteEmbeddingCache(EmbeddingCachePort):
+    """
+    Adapter for an on-disk embedding cache in a single SQLite file.
+
+    Vectors are stored as raw float32 blobs keyed by (model name, content
+    hash). Every hit refreshes the entry's access time, and once the stored
+    vectors exceed `max_bytes` the least recently used entries are evicted
+    down to `evict_to` of the limit.
+    """
+    def __init__(self, db_path: str = "embedding_cache.db", max_bytes: int = 1024 * 1024 * 1024, evict_to: float = 0.9):
+        self.max_bytes = max_bytes
+        self.evict_to = evict_to
+        self.conn = sqlite3.connect(db_path)
+        # WAL lets readers proceed during writes and avoids an fsync per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_table()
+        self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM embedding_cache").fetchone()[0]
+
+    def _create_table(self):
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            model TEXT NOT NULL,
+            content_hash BLOB NOT NULL,
+            vector BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (model, content_hash)
+        ) WITHOUT ROWID
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_access ON embedding_cache (last_access)"
+        )
+        self.conn.commit()
+
+    def get_many(self, model_name: str, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _LOOKUP_BATCH):
+            batch = unique[start:start + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            cursor = self.conn.execute(
+                f"SELECT content_hash, vector FROM embedding_cache "
+                f"WHERE model = ? AND content_hash IN ({placeholders})",
+                [model_name, *batch],
+            )
+            for content_hash, vector in cursor:
+                found[content_hash] = np.frombuffer(vector, dtype=np.float32)
+
+        if found:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE embedding_cache SET last_access = ? WHERE model = ? AND content_hash = ?",
+                    ((now, model_name, content_hash) for content_hash in found),
+                )
+        return found
+
+    def put_many(self, model_name: str, entries: Dict[bytes, np.ndarray]) -> None:
+        if not entries:
+            return
+        now = time.time()
+        rows = []
+        for content_hash, vector in entries.items():
+            data = np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+            rows.append((model_name, content_hash, data, len(data), now))
+        with self.conn:
+            # Entries already cached are kept, so their size is not counted twice
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (model, content_hash, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        # All vectors of one model have the same size
+        self._total_bytes += max(cursor.rowcount, 0) * rows[0][3]
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        target = int(self.max_bytes * self.evict_to)
+        with self.conn:
+            # Recount, other processes may share the cache file
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM embedding_cache").fetchone()[0]
+            cursor = self.conn.execute(
+                "SELECT model, content_hash, size FROM embedding_cache ORDER BY last_access"
+            )
+            evicted = []
+            for model, content_hash, size in cursor:
+                if total <= target:
+                    break
+                evicted.append((model, content_hash))
+                total -= size
+            self.conn.executemany(
+                "DELETE FROM embedding_cache WHERE model = ? AND content_hash = ?", evicted
+            )
+        self._total_bytes = total
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,136 @@
+# File: rag_project/adapters/chunker/sentence_chunker.py
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, List, Optional, Tuple
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.document import Document
+from rag_project.core.ports.chunker_port import ChunkerPort
+
+# A sentence ends at terminal punctuation followed by whitespace, or at a blank line
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+_WHITESPACE = re.compile(r'\s')
+
+
+class SentenceChunker(ChunkerPort):
+    """
+    Adapter for splitting a document into chunks of whole sentences that fit
+    the embedding model's token window.
+
+    The document is tokenized once with the model's fast tokenizer, cut into
+    blocks at whitespace so the blocks are encoded as one parallel batch. All
+    packing works on token and character offsets (see `spans`); the text is
+    copied only once, when each Chunk is built with its own content string,
+    so chunks hold their text eagerly like those of the other chunkers. The
+    offsets are kept in the chunk metadata; for documents loaded in parts,
+    ingestion shifts them to offsets into the concatenated parts. A sentence
+    longer than the budget is split at token boundaries.
+    """
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_tokens: int = 256,
+        overlap_tokens: int = 0,
+        tokenizer: Optional[Any] = None,
+        block_size: int = 64 * 1024,
+    ):
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.block_size = block_size
+        self._tokenizer = tokenizer
+
+    @property
+    def tokenizer(self) -> Any:
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+        return self._tokenizer
+
+    @property
+    def token_budget(self) -> int:
+        """
+        Tokens available for content once the model's special tokens are added.
+        """
+        return self.max_tokens - self.tokenizer.num_special_tokens_to_add()
+
+    def chunk(self, document: Document) -> List[Chunk]:
+        content = document.content
+        return [
+            Chunk(
+                filename=document.filename,
+                chunk_id=index,
+                content=content[start:end],
+                metadata={"start_offset": start, "end_offset": end},
+            )
+            for index, (start, end) in enumerate(self.spans(content))
+        ]
+
+    def spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Compute chunk boundaries as (start, end) character offsets into `text`.
+
+        Args:
+            text (str): The document content.
+
+        Returns:
+            List[Tuple[int, int]]: Character spans, in document order.
+        """
+        token_starts, token_ends = self._token_offsets(text)
+        num_tokens = len(token_starts)
+        if num_tokens == 0:
+            return []
+
+        # Index of the first token of every sentence after the first one
+        sentence_starts = sorted({
+            bisect_left(token_starts, match.end()) for match in _SENTENCE_BREAK.finditer(text)
+        } - {0, num_tokens})
+
+        budget = max(1, self.token_budget)
+        spans = []
+        first = 0
+        while first < num_tokens:
+            limit = min(first + budget, num_tokens)
+            # Last sentence start that still fits; cut mid-sentence only if none does
+            position = bisect_right(sentence_starts, limit) - 1
+            last = limit
+            if limit < num_tokens and position >= 0 and sentence_starts[position] > first:
+                last = sentence_starts[position]
+            spans.append((token_starts[first], token_ends[last - 1]))
+
+            if last >= num_tokens:
+                break
+            next_first = last
+            if self.overlap_tokens > 0:
+                # Restart at the first sentence inside the overlap window
+                position = bisect_left(sentence_starts, max(first + 1, last - self.overlap_tokens))
+                if position < len(sentence_starts) and sentence_starts[position] < last:
+                    next_first = sentence_starts[position]
+            first = next_first
+        return spans
+
+    def _token_offsets(self, text: str) -> Tuple[List[int], List[int]]:
+        """
+        Character offsets of every token of `text`, without special tokens.
+        """
+        bases = []
+        blocks = []
+        start = 0
+        while start < len(text):
+            end = start + self.block_size
+            if end < len(text):
+                # Extend to the next whitespace so no token straddles two blocks
+                match = _WHITESPACE.search(text, end)
+                end = match.start() if match else len(text)
+            bases.append(start)
+            blocks.append(text[start:end])
+            start = end
+
+        token_starts: List[int] = []
+        token_ends: List[int] = []
+        encodings = self.tokenizer.backend_tokenizer.encode_batch(blocks, add_special_tokens=False)
+        for base, encoding in zip(bases, encodings):
+            offsets = encoding.offsets
+            token_starts.extend([base + start for start, _ in offsets])
+            token_ends.extend([base + end for _, end in offsets])
+        return token_starts, token_ends
@@ -0,0 +1,143 @@
+# File: rag_project/adapters/cleaner/rule_cleaner.py
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from rag_project.core.ports.cleaner_port import CleanerPort
+
+
+@dataclass(frozen=True)
+class CleaningRule:
+    """
+    A named regex and the literal text that replaces each of its matches.
+
+    Patterns must not define named groups of their own. Segment-parallel
+    cleaning cuts documents right after a newline that precedes a
+    non-whitespace character, so a rule must not match or look across
+    such a position.
+    """
+    name: str
+    pattern: str
+    replacement: str
+
+
+PRESETS: Dict[str, List[CleaningRule]] = {
+    # Same output as SimpleCleaner: collapse whitespace, drop punctuation
+    "simple": [
+        CleaningRule("whitespace", r"\s+", " "),
+        CleaningRule("punctuation", r"[^\w\s]", ""),
+    ],
+    # Normalize layout but keep punctuation, so code, paths and versions like 0.3.20 survive
+    "code": [
+        CleaningRule("control", r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\u200b\ufeff]", ""),
+        CleaningRule("double_quote", r"[\u201c\u201d\u201e]", '"'),
+        CleaningRule("single_quote", r"[\u2018\u2019]", "'"),
+        CleaningRule("wide_space", r"[\u00a0\u2009\u202f]", " "),
+        CleaningRule("blank_lines", r"[ \t]*(?:\r\n?|\n)(?:[ \t]*(?:\r\n?|\n)){2,}", "\n\n"),
+        CleaningRule("line_end", r"[ \t]*\r\n?|[ \t]+\n", "\n"),
+        CleaningRule("inline_spaces", r"(?<=\S)[ \t]{2,}(?=\S)", " "),
+    ],
+}
+
+
+# Lookahead tried before the rules of a preset: no preset rule changes text at a
+# position where it fails (word characters, and single spaces before a
+# non-space), so those positions are skipped without entering the alternation.
+PRESET_GUARD = r"[^\w ]|  | \s"
+
+
+def _clean_segment(cleaner: "RuleCleaner", segment: str) -> str:
+    return cleaner.clean_segment(segment)
+
+
+class RuleCleaner(CleanerPort):
+    """
+    Adapter for text cleaning driven by a declarative rule set.
+
+    All rules are compiled into one alternation of named groups and applied
+    in a single `re.sub` pass, so the text is copied once whatever the
+    number of rules. At each position the earliest rule in the list wins.
+    An optional `guard` lookahead lets the regex engine skip positions where
+    no rule can change the text.
+    Documents larger than `segment_size` are split at line boundaries and
+    cleaned in a process pool when `num_workers` > 1.
+    """
+    def __init__(
+        self,
+        rules: Sequence[CleaningRule],
+        guard: Optional[str] = None,
+        strip: bool = True,
+        num_workers: int = 1,
+        segment_size: int = 4 * 1024 * 1024,
+    ):
+        self.rules = list(rules)
+        self.strip = strip
+        self.num_workers = num_workers
+        self.segment_size = segment_size
+        self._replacements = {rule.name: rule.replacement for rule in self.rules}
+        alternation = "|".join(f"(?P<{rule.name}>{rule.pattern})" for rule in self.rules)
+        if guard is not None:
+            alternation = f"(?={guard})(?:{alternation})"
+        self._pattern = re.compile(alternation)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_preset(cls, name: str, **kwargs) -> "RuleCleaner":
+        """
+        Build a cleaner from one of the named rule sets in `PRESETS`.
+        """
+        if name not in PRESETS:
+            raise ValueError(f"Unknown cleaning preset '{name}', expected one of {list(PRESETS)}")
+        kwargs.setdefault("guard", PRESET_GUARD)
+        return cls(PRESETS[name], **kwargs)
+
+    def clean(self, text: str) -> str:
+        if self.num_workers > 1 and len(text) > self.segment_size:
+            segments = self._split_segments(text)
+            executor = self._get_executor()
+            text = "".join(executor.map(_clean_segment, [self] * len(segments), segments))
+        else:
+            text = self.clean_segment(text)
+        return text.strip() if self.strip else text
+
+    def clean_segment(self, text: str) -> str:
+        """
+        Apply every rule to `text` in one pass, without the final strip.
+        """
+        replacements = self._replacements
+        return self._pattern.sub(lambda match: replacements[match.lastgroup], text)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self._executor
+
+    def _split_segments(self, text: str) -> List[str]:
+        """
+        Cut `text` into pieces of about `segment_size` characters. Every cut is
+        placed right after a newline and before a non-whitespace character,
+        so no word, line ending or whitespace run is split across two segments.
+        """
+        boundary = re.compile(r"(?<=\n)\S")
+        segments = []
+        start = 0
+        while len(text) - start > self.segment_size:
+            match = boundary.search(text, start + self.segment_size)
+            if match is None:
+                break
+            segments.append(text[start:match.start()])
+            start = match.start()
+        segments.append(text[start:])
+        return segments
+
+    def __getstate__(self):
+        # The pool cannot be pickled; workers get a pool-less copy
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import re
+import threading
+from typing import Any, Awaitable, Dict, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def asyncpg_dsn(database_url: Optional[str] = None) -> str:
+    """
+    The DATABASE_URL in the form asyncpg accepts: SQLAlchemy URLs name a
+    driver (postgresql+psycopg://...), asyncpg wants postgresql://...
+    """
+    database_url = database_url or os.getenv('DATABASE_URL')
+    if database_url is None:
+        raise ValueError(" DATABASE_URL environment variable is not set.")
+    return re.sub(r"^postgres(?:ql)?\+\w+://", "postgresql://", database_url)
+
+
+async def _init_connection(connection) -> None:
+    # Binary codecs for vector and halfvec: vectors are sent as packed
+    # float32/float16 and numpy arrays are accepted as parameters
+    from pgvector.asyncpg import register_vector
+    await register_vector(connection)
+
+
+class AsyncPgPool:
+    """
+    asyncpg connection pools for one database, with pgvector codecs
+    registered on every connection.
+
+    An asyncpg pool belongs to the event loop that created it, so one pool is
+    created per loop on first use. `run` executes a coroutine on a private
+    background loop and waits for it, which is how the async adapters serve
+    the synchronous port methods.
+    """
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: int = 2,
+        max_size: int = 10,
+        command_timeout: Optional[float] = 60.0,
+        statement_cache_size: int = 100,
+    ):
+        self.dsn = dsn or asyncpg_dsn()
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self._pools: Dict[asyncio.AbstractEventLoop, "asyncio.Future"] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    async def pool(self):
+        """
+        The pool of the running event loop, created on first use.
+        """
+        loop = asyncio.get_running_loop()
+        future = self._pools.get(loop)
+        if future is None:
+            import asyncpg
+            # Stored before awaiting, so concurrent callers share one creation
+            future = self._pools[loop] = asyncio.ensure_future(asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                command_timeout=self.command_timeout,
+                statement_cache_size=self.statement_cache_size,
+                init=_init_connection,
+            ))
+        return await future
+
+    def run(self, coroutine: Awaitable) -> Any:
+        """
+        Run `coroutine` on the background loop and return its result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._background_loop()).result()
+
+    async def aclose(self) -> None:
+        """
+        Close the pool of the running loop.
+        """
+        future = self._pools.pop(asyncio.get_running_loop(), None)
+        if future is not None:
+            await (await future).close()
+
+    def close(self) -> None:
+        """
+        Close the background loop's pool and stop the loop.
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="asyncpg-loop", daemon=True).start()
+            return self._loop
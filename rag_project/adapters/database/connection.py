@@ -1,18 +1,136 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from functools import lru_cache
+import threading
+from typing import Dict, Iterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-DATABASE_URL = os.getenv('DATABASE_URL')
-# Validate DATABASE_URL
-if DATABASE_URL is None:
-    raise ValueError(" DATABASE_URL environment variable is not set.")
 
-# Initialize database engine
-engine = create_engine(DATABASE_URL)
+class PoolMetrics:
+    """
+    Counters of a connection pool's activity, kept through pool events.
+    """
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "invalidate", self._on_invalidate)
 
-# Create session factory
-SessionLocal = sessionmaker(bind=engine)
+    def _on_connect(self, *_):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, *_):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_invalidate(self, *_):
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Current pool occupancy and lifetime counters. A high `connects`
+        relative to `checkouts` means connections are not being reused.
+        """
+        pool = self.engine.pool
+        stats = {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+        }
+        # QueuePool reports its occupancy; other pool classes may not
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        return stats
+
+
+@lru_cache(maxsize=None)
+def get_engine(
+    pool_size: int = 10,
+    max_overflow: int = 20,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+) -> Engine:
+    """
+    Create the database engine on first use, so importing this module does
+    not require DATABASE_URL. One engine, and so one pool, exists per set of
+    pool settings.
+
+    Args:
+        pool_size (int): Connections kept open in the pool.
+        max_overflow (int): Extra connections opened under load and closed
+            when returned.
+        pool_timeout (float): Seconds to wait for a free connection.
+        pool_recycle (int): Reconnect connections older than this many seconds,
+            before server or proxy idle timeouts close them.
+        pool_pre_ping (bool): Test each connection on checkout and replace it
+            if the server dropped it.
+    """
+    database_url = os.getenv('DATABASE_URL')
+    # Validate DATABASE_URL
+    if database_url is None:
+        raise ValueError(" DATABASE_URL environment variable is not set.")
+    engine = create_engine(
+        database_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+    )
+    engine.metrics = PoolMetrics(engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_session_factory(**pool_options) -> sessionmaker:
+    """
+    Session factory bound to the engine for `pool_options`. Objects stay
+    readable after their session commits and closes.
+    """
+    return sessionmaker(bind=get_engine(**pool_options), expire_on_commit=False)
+
+
+@contextmanager
+def session_scope(session_factory: sessionmaker) -> Iterator[Session]:
+    """
+    A session for one unit of work: committed if the block succeeds, rolled
+    back if it raises, and closed either way so its connection goes back to
+    the pool.
+    """
+    session = session_factory()
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def pool_stats(**pool_options) -> Dict[str, int]:
+    return get_engine(**pool_options).metrics.stats()
+
+
+def __getattr__(name: str):
+    # `engine` and `SessionLocal` are still importable, but built lazily
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 from typing import List
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, Integer, String, TIMESTAMP, Text
+from sqlalchemy import Column, Integer, JSON, String, TIMESTAMP, Text
 from pgvector.sqlalchemy import VECTOR
 from datetime import datetime
 
@@ -15,7 +15,7 @@ class Metadata(Base):
     __tablename__ = 'metadata'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    filename = Column(String, nullable=False)
+    filename = Column(String, nullable=False, index=True)
     source = Column(String)
     ingestion_timestamp = Column(TIMESTAMP, default=datetime.utcnow)
 
@@ -27,8 +27,20 @@ class Embedding(Base):
     __tablename__ = 'embeddings'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    filename = Column(String, nullable=False)
+    filename = Column(String, nullable=False, index=True)
     chunk_id = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
     embedding: List[float]  # Python type annotation for mypy
-    embedding = Column(VECTOR(384), nullable=False)  # SQLAlchemy column definition
\ No newline at end of file
+    embedding = Column(VECTOR(384), nullable=False)  # SQLAlchemy column definition
+    doc_metadata = Column(JSON)
+
+
+class FileManifest(Base):
+    """
+    Content hash of every ingested file, used for incremental re-ingestion.
+    """
+    __tablename__ = 'file_manifest'
+
+    filepath = Column(String, primary_key=True)
+    content_hash = Column(String, nullable=False)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
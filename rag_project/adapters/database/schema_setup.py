@@ -1,19 +1,34 @@
 from sqlalchemy import text
-from rag_project.adapters.database.connection import engine
+from rag_project.adapters.database.connection import get_engine
 from rag_project.adapters.database.models import Base
+
+# Columns and indexes added to existing tables since their first release.
+# create_all only creates missing tables, so databases created earlier are
+# brought up to date by these idempotent statements.
+MIGRATIONS = (
+    "ALTER TABLE embeddings ADD COLUMN IF NOT EXISTS doc_metadata JSON",
+    "CREATE INDEX IF NOT EXISTS ix_embeddings_filename ON embeddings (filename)",
+    "CREATE INDEX IF NOT EXISTS ix_metadata_filename ON metadata (filename)",
+)
+
+
 def init_db():
     """
-    Initialize the database schema by creating tables and extensions.
+    Initialize the database schema by creating tables and extensions, and
+    upgrade tables created by earlier versions. Safe to run repeatedly.
     """
     try:
-        with engine.connect() as connection:
+        engine = get_engine()
+        with engine.begin() as connection:
             # Enable pgvector extension
             connection.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
             print(" pgvector extension enabled or already exists.")
 
-        # Create all tables defined in models
-        Base.metadata.create_all(engine)
-        print(" Database schema created successfully.")
+            # Create all tables defined in models
+            Base.metadata.create_all(connection)
+            for statement in MIGRATIONS:
+                connection.execute(text(statement))
+        print(" Database schema created or upgraded successfully.")
 
     except Exception as e:
         print(f" Failed to initialize database schema: {e}")
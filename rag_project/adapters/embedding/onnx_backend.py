@@ -0,0 +1,162 @@
+# File: rag_project/adapters/embedding/onnx_backend.py
+
+import os
+from typing import Any, List, Optional
+import numpy as np
+from rag_project.core.ports.embedding_backend_port import EmbeddingBackendPort
+
+_FP32_FILE = "model.onnx"
+_INT8_FILE = "model.int8.onnx"
+
+
+class OnnxEmbeddingBackend(EmbeddingBackendPort):
+    """
+    Adapter for CPU inference of a sentence-transformers model with ONNX Runtime.
+
+    On first use the Hugging Face model is exported to ONNX (this step needs
+    torch and transformers) and, with `quantize`, its weights are converted
+    to int8 by dynamic quantization. The exported files and the tokenizer are
+    cached under `cache_dir`, so later runs only need onnxruntime and the
+    tokenizer. Token embeddings are mean-pooled over the attention mask and,
+    with `normalize`, scaled to unit length, matching all-MiniLM-L6-v2.
+    """
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        cache_dir: str = "~/.cache/rag_project/onnx",
+        quantize: bool = True,
+        max_seq_length: int = 256,
+        normalize: bool = True,
+        num_threads: Optional[int] = None,
+    ):
+        # Bare sentence-transformers names, as accepted by SentenceTransformer
+        self.model_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        self.model_dir = os.path.join(os.path.expanduser(cache_dir), self.model_name.replace("/", "__"))
+        self.quantize = quantize
+        self.max_seq_length = max_seq_length
+        self.normalize = normalize
+        self.num_threads = num_threads
+        self._session = None
+        self._tokenizer = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.model_name}:onnx-{'int8' if self.quantize else 'fp32'}"
+
+    @property
+    def model_path(self) -> str:
+        return os.path.join(self.model_dir, _INT8_FILE if self.quantize else _FP32_FILE)
+
+    @property
+    def session(self) -> Any:
+        if self._session is None:
+            import onnxruntime
+            if not os.path.exists(self.model_path):
+                self.export()
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.num_threads:
+                options.intra_op_num_threads = self.num_threads
+            self._session = onnxruntime.InferenceSession(
+                self.model_path, options, providers=["CPUExecutionProvider"],
+            )
+        return self._session
+
+    @property
+    def tokenizer(self) -> Any:
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            if not os.path.exists(self.model_path):
+                self.export()
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir, use_fast=True)
+        return self._tokenizer
+
+    @property
+    def dimension(self) -> int:
+        return self.session.get_outputs()[0].shape[-1]
+
+    def export(self) -> None:
+        """
+        Export the model to ONNX, quantize it if requested, and save the
+        tokenizer next to it. Files are renamed into place only once written.
+        """
+        os.makedirs(self.model_dir, exist_ok=True)
+        fp32_path = os.path.join(self.model_dir, _FP32_FILE)
+        if not os.path.exists(fp32_path):
+            import torch
+            from transformers import AutoModel, AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+            model = AutoModel.from_pretrained(self.model_name).eval()
+            sample = tokenizer(["An example sentence to trace the graph."], return_tensors="pt")
+            input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+            dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+
+            tmp_path = fp32_path + ".tmp"
+            with torch.no_grad():
+                torch.onnx.export(
+                    model,
+                    tuple(sample[name] for name in input_names),
+                    tmp_path,
+                    input_names=input_names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                )
+            os.replace(tmp_path, fp32_path)
+            tokenizer.save_pretrained(self.model_dir)
+
+        int8_path = os.path.join(self.model_dir, _INT8_FILE)
+        if self.quantize and not os.path.exists(int8_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            tmp_path = int8_path + ".tmp"
+            quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        session = self.session
+        input_names = {graph_input.name for graph_input in session.get_inputs()}
+        output = np.empty((len(texts), self.dimension), dtype=np.float32)
+
+        # Longest texts first, so each batch is padded to similar lengths
+        order = sorted(range(len(texts)), key=lambda position: len(texts[position]), reverse=True)
+        for start in range(0, len(order), batch_size):
+            positions = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[position] for position in positions],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {name: encoded[name].astype(np.int64) for name in input_names}
+            token_embeddings = session.run(None, feed)[0]
+
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            if self.normalize:
+                pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            output[positions] = pooled
+        return output
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def set_num_threads(self, num_threads: int) -> None:
+        self.num_threads = num_threads
+        self._session = None
+
+    def __getstate__(self):
+        # Worker processes open their own session
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state["_tokenizer"] = None
+        return state
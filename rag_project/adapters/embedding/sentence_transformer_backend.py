@@ -0,0 +1,58 @@
+# File: rag_project/adapters/embedding/sentence_transformer_backend.py
+
+from typing import Any, List
+import numpy as np
+from rag_project.core.ports.embedding_backend_port import EmbeddingBackendPort
+
+
+class SentenceTransformerBackend(EmbeddingBackendPort):
+    """
+    Adapter for full-precision PyTorch inference through SentenceTransformer.
+
+    The model is loaded on first use.
+    """
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        self.model_name = model_name
+        self._model = None
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    @property
+    def name(self) -> str:
+        return self.model_name
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        embeddings = self.model.encode(
+            texts, batch_size=batch_size, show_progress_bar=show_progress_bar, convert_to_numpy=True,
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        encoded = self.model.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.model.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def set_num_threads(self, num_threads: int) -> None:
+        import torch
+        torch.set_num_threads(num_threads)
+
+    def __getstate__(self):
+        # Worker processes load their own model
+        state = self.__dict__.copy()
+        state["_model"] = None
+        return state
@@ -1,16 +1,168 @@
-
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 import json
-from typing import Any
+import os
+from typing import Any, IO, Iterable, Iterator, List
+import ijson
+from rag_project.core.domain.document import Document
+from rag_project.core.ports.plugin_port import Plugin
+
+_BLOCK_SIZE = 64 * 1024
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects the text of an HTML stream the way BeautifulSoup's `get_text`
+    does: script and style contents, comments, doctypes and processing
+    instructions are dropped, CDATA sections are kept.
+    """
+    _SKIPPED = {"script", "style"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pieces: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.pieces.append(data)
+
+    def unknown_decl(self, data):
+        if data.startswith("CDATA["):
+            self.pieces.append(data[len("CDATA["):])
+
+
+def iter_html_text(file: IO[str], block_size: int = _BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield the text of an HTML document while it is read in blocks, without
+    building a document tree.
+    """
+    parser = _TextExtractor()
+    for block in iter(lambda: file.read(block_size), ""):
+        parser.feed(block)
+        yield from parser.pieces
+        parser.pieces.clear()
+    parser.close()
+    yield from parser.pieces
+
+
+def iter_json_text(file: IO[bytes], indent: int = 2) -> Iterator[str]:
+    """
+    Yield the same text as `json.dumps(json.load(file), indent=indent)`, one
+    token at a time, from an incremental parse of the file. Integers must
+    fit in 64 bits, a limit of the yajl parser behind ijson.
+    """
+    # One entry per open container: whether it already has an item
+    has_items: List[bool] = []
+    after_key = False
+    for _, event, value in ijson.parse(file, use_float=True):
+        if event in ("end_map", "end_array"):
+            closing = "}" if event == "end_map" else "]"
+            if has_items.pop():
+                yield "\n" + " " * (indent * len(has_items)) + closing
+            else:
+                yield closing
+            continue
+
+        # Separator and indentation before a key, or before a value outside a map
+        if after_key:
+            prefix = ""
+            after_key = False
+        elif has_items:
+            prefix = ("," if has_items[-1] else "") + "\n" + " " * (indent * len(has_items))
+            has_items[-1] = True
+        else:
+            prefix = ""
+
+        if event == "map_key":
+            yield prefix + json.dumps(value) + ": "
+            after_key = True
+        elif event in ("start_map", "start_array"):
+            yield prefix + ("{" if event == "start_map" else "[")
+            has_items.append(False)
+        else:
+            yield prefix + json.dumps(value)
+
+
+def _iter_parts(pieces: Iterable[str], part_size: int) -> Iterator[str]:
+    """
+    Regroup a stream of text pieces into strings of at least `part_size` characters.
+    """
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= part_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
 
 
 def extract_html_text(file_path: str) -> Any:
     with open(file_path, 'r', encoding='utf-8') as file:
-        soup = BeautifulSoup(file, "html.parser")
-    return soup.get_text()
+        return "".join(iter_html_text(file))
 
 
 def extract_json_text(file_path: str) -> str:
-    with open(file_path, 'r', encoding='utf-8') as file:
-        data: Any = json.load(file)
-    return json.dumps(data, indent=2)
+    with open(file_path, 'rb') as file:
+        return "".join(iter_json_text(file))
+
+
+class HtmlLoader(Plugin):
+    """
+    Adapter for loading the visible text of HTML files.
+
+    The file is parsed incrementally and its text is yielded in parts of
+    about `part_size` characters.
+    """
+    extensions = ('.html', '.htm')
+
+    def __init__(self, part_size: int = 1024 * 1024):
+        self.part_size = part_size
+
+    def supports(self, filename: str) -> bool:
+        return filename.lower().endswith(self.extensions)
+
+    def load(self, filepath: str) -> Document:
+        return Document(filename=os.path.basename(filepath), content=extract_html_text(filepath))
+
+    def load_parts(self, filepath: str) -> Iterator[Document]:
+        filename = os.path.basename(filepath)
+        with open(filepath, 'r', encoding='utf-8') as file:
+            for content in _iter_parts(iter_html_text(file), self.part_size):
+                yield Document(filename=filename, content=content)
+
+
+class JsonLoader(Plugin):
+    """
+    Adapter for loading JSON files as indented text.
+
+    The file is parsed incrementally and the indented text is yielded in
+    parts of about `part_size` characters.
+    """
+    extensions = ('.json',)
+
+    def __init__(self, part_size: int = 1024 * 1024):
+        self.part_size = part_size
+
+    def supports(self, filename: str) -> bool:
+        return filename.lower().endswith(self.extensions)
+
+    def load(self, filepath: str) -> Document:
+        return Document(filename=os.path.basename(filepath), content=extract_json_text(filepath))
+
+    def load_parts(self, filepath: str) -> Iterator[Document]:
+        filename = os.path.basename(filepath)
+        with open(filepath, 'rb') as file:
+            for content in _iter_parts(iter_json_text(file), self.part_size):
+                yield Document(filename=filename, content=content)
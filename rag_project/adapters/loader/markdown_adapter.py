@@ -1,7 +1,27 @@
-
-import markdown
+import io
+import os
+from rag_project.adapters.loader.html_json_adapter import iter_html_text
+from rag_project.core.domain.document import Document
+from rag_project.core.ports.plugin_port import Plugin
 
 def convert_markdown_to_text(file_path: str) -> str:
+    # Imported on use to keep pipeline start-up light
+    import markdown
     with open(file_path, 'r', encoding='utf-8') as file:
         md_content = file.read()
         return markdown.markdown(md_content)
+
+
+class MarkdownLoader(Plugin):
+    """
+    Adapter for loading Markdown files as plain text.
+    """
+    extensions = ('.md', '.markdown')
+
+    def supports(self, filename: str) -> bool:
+        return filename.lower().endswith(self.extensions)
+
+    def load(self, filepath: str) -> Document:
+        html = convert_markdown_to_text(filepath)
+        content = "".join(iter_html_text(io.StringIO(html)))
+        return Document(filename=os.path.basename(filepath), content=content)
@@ -1,21 +1,172 @@
-import os
 import json
+import mmap
+import os
+import re
+from typing import Iterator, List, Union
 from rag_project.core.domain.document import Document
 from rag_project.core.ports.plugin_port import Plugin
 
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+# A number, true, false or null
+_SCALAR = re.compile(rb'[^\s,:\[\]{}"]+')
+# Everything inside a container up to the next string or bracket
+_PLAIN = re.compile(rb'[^"\[\]{}]+')
+
+
+class _JsonScanner:
+    """
+    Walks a JSON buffer without decoding the values it is told to skip.
+
+    The end of a skipped string is found with `find` over the raw bytes, so
+    large values such as base64 cell outputs are never turned into Python
+    objects. On a memory-mapped buffer, pages already scanned are released
+    every `release_size` bytes so resident memory stays flat.
+    """
+    def __init__(self, buffer: Union[bytes, mmap.mmap], release_size: int = 8 * 1024 * 1024):
+        self.buffer = buffer
+        self.pos = 0
+        self.release_size = release_size
+        self._released = 0
+
+    def peek(self) -> bytes:
+        self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: bytes) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char.decode()!r} at byte {self.pos} of the notebook")
+        self.pos += 1
+
+    def string(self) -> str:
+        if self.peek() != b'"':
+            raise ValueError(f"Expected a string at byte {self.pos} of the notebook")
+        start = self.pos
+        self.pos = self._string_end(start)
+        return json.loads(self.buffer[start:self.pos])
+
+    def release(self) -> None:
+        """
+        Drop the mapped pages before the current position from memory.
+        """
+        if not isinstance(self.buffer, mmap.mmap) or self.pos - self._released < self.release_size:
+            return
+        end = self.pos - self.pos % mmap.PAGESIZE
+        self.buffer.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+        self._released = end
+
+    def keys(self) -> Iterator[str]:
+        """
+        Yield the keys of an object; the caller reads or skips each value.
+        """
+        self.expect(b'{')
+        if self.peek() == b'}':
+            self.pos += 1
+            return
+        while True:
+            key = self.string()
+            self.expect(b':')
+            yield key
+            if self.peek() != b',':
+                break
+            self.pos += 1
+        self.expect(b'}')
+
+    def items(self) -> Iterator[None]:
+        """
+        Yield once per array element; the caller reads or skips each element.
+        """
+        self.expect(b'[')
+        if self.peek() == b']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() != b',':
+                break
+            self.pos += 1
+        self.expect(b']')
+
+    def skip(self) -> None:
+        depth = 0
+        while True:
+            char = self.peek()
+            if char == b'"':
+                self.pos = self._string_end(self.pos)
+                match = None
+            elif char in (b'{', b'['):
+                depth += 1
+                self.pos += 1
+                continue
+            elif char in (b'}', b']'):
+                depth -= 1
+                self.pos += 1
+                match = None
+            elif not char:
+                raise ValueError("Unexpected end of the notebook")
+            else:
+                match = (_PLAIN if depth else _SCALAR).match(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.end()
+            if depth <= 0:
+                return
+
+    def _string_end(self, start: int) -> int:
+        """
+        Position just past the closing quote of the string opening at `start`.
+        """
+        end = start
+        while True:
+            end = self.buffer.find(b'"', end + 1)
+            if end < 0:
+                raise ValueError("Unterminated string in the notebook")
+            # The quote is escaped if an odd number of backslashes precede it
+            backslashes = 0
+            while self.buffer[end - 1 - backslashes] == 0x5C:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return end + 1
+
 
 class NotebookLoader(Plugin):
     """
     Adapter for loading Jupyter Notebook files.
+
+    The notebook is scanned in place (memory-mapped) and only the sources of
+    markdown cells are decoded; cell outputs and metadata are skipped over
+    as raw bytes, so base64 images and the like are never decoded or copied.
     """
+    extensions = ('.ipynb',)
+
     def supports(self, filename: str) -> bool:
         return filename.endswith('.ipynb')
 
     def load(self, filepath: str) -> Document:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            notebook = json.load(file)
-        extracted_content = []
-        for cell in notebook.get("cells", []):
-            if cell.get("cell_type") == "markdown":
-                extracted_content.append("".join(cell.get("source", [])))
-        return Document(filename=os.path.basename(filepath), content="\n".join(extracted_content))
+        with open(filepath, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError(f"Empty notebook: {filepath}")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                content = "\n".join(self._markdown_sources(_JsonScanner(buffer)))
+        return Document(filename=os.path.basename(filepath), content=content)
+
+    @staticmethod
+    def _markdown_sources(scanner: _JsonScanner) -> Iterator[str]:
+        for key in scanner.keys():
+            if key != "cells":
+                scanner.skip()
+                continue
+            for _ in scanner.items():
+                cell_type = None
+                source: List[str] = []
+                for cell_key in scanner.keys():
+                    if cell_key == "cell_type":
+                        cell_type = scanner.string()
+                    elif cell_key == "source":
+                        if scanner.peek() == b'"':
+                            source.append(scanner.string())
+                        else:
+                            source.extend(scanner.string() for _ in scanner.items())
+                    else:
+                        scanner.skip()
+                if cell_type == "markdown":
+                    yield "".join(source)
+                scanner.release()
@@ -7,6 +7,8 @@ class TextLoader(Plugin):
     """
     Adapter for loading text files.
     """
+    extensions = ('.txt',)
+
     def supports(self, filename: str) -> bool:
         return filename.endswith('.txt')
 
@@ -0,0 +1,126 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+from rag_project.adapters.database.async_connection import AsyncPgPool
+from rag_project.core.ports.metadata_repository_port import MetadataRepositoryPort
+
+
+def _timestamp(value: Union[str, datetime, None]) -> Optional[datetime]:
+    # asyncpg binds TIMESTAMP parameters from datetime objects only
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+class MetadataAsyncPG(MetadataRepositoryPort):
+    """
+    Handles metadata storage and querying in PostgreSQL on the asyncpg driver.
+
+    The `a*` methods are native coroutines on the pool of the running event
+    loop; the synchronous methods run them on the pool's background loop.
+    """
+    def __init__(self, pool: Optional[AsyncPgPool] = None):
+        self.pool = pool or AsyncPgPool()
+
+    async def ainsert_metadata(self, filename: str, source: str, ingestion_timestamp: str):
+        """
+        Insert metadata into the database.
+        """
+        pool = await self.pool.pool()
+        await pool.execute(
+            "INSERT INTO metadata (filename, source, ingestion_timestamp) VALUES ($1, $2, $3)",
+            filename, source, _timestamp(ingestion_timestamp),
+        )
+
+    async def ainsert_metadata_batch(self, entries: List[Dict[str, str]]):
+        """
+        Insert several metadata rows with one binary COPY.
+        """
+        if not entries:
+            return
+        pool = await self.pool.pool()
+        await pool.copy_records_to_table(
+            "metadata",
+            records=[
+                (entry['filename'], entry['source'], _timestamp(entry['ingestion_timestamp']))
+                for entry in entries
+            ],
+            columns=["filename", "source", "ingestion_timestamp"],
+        )
+
+    async def afetch_metadata(self):
+        """
+        Retrieve all metadata.
+        """
+        pool = await self.pool.pool()
+        return await pool.fetch("SELECT id, filename, source, ingestion_timestamp FROM metadata")
+
+    async def adelete_metadata(self, filenames: List[str]):
+        """
+        Remove the metadata rows of the given files.
+        """
+        if not filenames:
+            return
+        pool = await self.pool.pool()
+        await pool.execute("DELETE FROM metadata WHERE filename = ANY($1::text[])", list(filenames))
+
+    async def afetch_manifest(self) -> Dict[str, str]:
+        """
+        Retrieve the ingestion manifest as a path -> content hash mapping.
+        """
+        pool = await self.pool.pool()
+        rows = await pool.fetch("SELECT filepath, content_hash FROM file_manifest")
+        return {row['filepath']: row['content_hash'] for row in rows}
+
+    async def aupdate_manifest(self, entries: Dict[str, str]):
+        """
+        Upsert manifest entries in a single statement, the paths and hashes
+        bound as two arrays.
+        """
+        if not entries:
+            return
+        pool = await self.pool.pool()
+        await pool.execute(
+            """
+            INSERT INTO file_manifest (filepath, content_hash, updated_at)
+            SELECT filepath, content_hash, now()
+            FROM unnest($1::text[], $2::text[]) AS entries (filepath, content_hash)
+            ON CONFLICT (filepath) DO UPDATE
+            SET content_hash = EXCLUDED.content_hash, updated_at = now()
+            """,
+            list(entries.keys()), list(entries.values()),
+        )
+
+    async def adelete_manifest(self, filepaths: List[str]):
+        """
+        Remove manifest entries for the given paths.
+        """
+        if not filepaths:
+            return
+        pool = await self.pool.pool()
+        await pool.execute("DELETE FROM file_manifest WHERE filepath = ANY($1::text[])", list(filepaths))
+
+    def insert_metadata(self, filename: str, source: str, ingestion_timestamp: str):
+        self.pool.run(self.ainsert_metadata(filename, source, ingestion_timestamp))
+
+    def insert_metadata_batch(self, entries: List[Dict[str, str]]):
+        self.pool.run(self.ainsert_metadata_batch(entries))
+
+    def fetch_metadata(self):
+        return self.pool.run(self.afetch_metadata())
+
+    def delete_metadata(self, filenames: List[str]):
+        self.pool.run(self.adelete_metadata(filenames))
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        return self.pool.run(self.afetch_manifest())
+
+    def update_manifest(self, entries: Dict[str, str]):
+        self.pool.run(self.aupdate_manifest(entries))
+
+    def delete_manifest(self, filepaths: List[str]):
+        self.pool.run(self.adelete_manifest(filepaths))
+
+    def close(self):
+        """
+        Close the pool's background loop; pools owned by other event loops
+        are closed with `pool.aclose()` from that loop.
+        """
+        self.pool.close()
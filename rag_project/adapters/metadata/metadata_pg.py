@@ -1,16 +1,21 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from rag_project.adapters.database.models import Metadata
-from typing import Dict
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert as sa_insert, text
+from sqlalchemy.dialects.postgresql import insert
+from rag_project.adapters.database.connection import session_scope
+from rag_project.adapters.database.models import FileManifest, Metadata
+from typing import Dict, List
 from rag_project.core.ports.metadata_repository_port import MetadataRepositoryPort
 
 
 class MetadataPG(MetadataRepositoryPort):
     """
     Handles metadata storage and querying in PostgreSQL.
+
+    Each call runs in its own session from `session_factory`, committed and
+    closed before returning.
     """
-    def __init__(self, session: Session):
-        self.session = session
+    def __init__(self, session_factory: sessionmaker):
+        self.session_factory = session_factory
 
     def insert_metadata(self, filename: str, source: str, ingestion_timestamp: str):
         """
@@ -21,17 +26,74 @@ class MetadataPG(MetadataRepositoryPort):
             source=source,
             ingestion_timestamp=ingestion_timestamp
         )
-        self.session.add(metadata_entry)
-        self.session.commit()
+        with session_scope(self.session_factory) as session:
+            session.add(metadata_entry)
+
+    def insert_metadata_batch(self, entries: List[Dict[str, str]]):
+        """
+        Insert several metadata rows with one multi-row INSERT and one commit.
+        """
+        if not entries:
+            return
+        with session_scope(self.session_factory) as session:
+            session.execute(sa_insert(Metadata), entries)
 
     def fetch_metadata(self):
         """
         Retrieve all metadata.
         """
-        return self.session.query(Metadata).all()
+        with session_scope(self.session_factory) as session:
+            return session.query(Metadata).all()
+
+    def delete_metadata(self, filenames: List[str]):
+        """
+        Remove the metadata rows of the given files.
+        """
+        if not filenames:
+            return
+        with session_scope(self.session_factory) as session:
+            session.query(Metadata).filter(
+                Metadata.filename.in_(filenames)
+            ).delete(synchronize_session=False)
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        """
+        Retrieve the ingestion manifest as a path -> content hash mapping.
+        """
+        with session_scope(self.session_factory) as session:
+            rows = session.query(FileManifest.filepath, FileManifest.content_hash).all()
+        return {row.filepath: row.content_hash for row in rows}
+
+    def update_manifest(self, entries: Dict[str, str]):
+        """
+        Upsert manifest entries in a single statement.
+        """
+        if not entries:
+            return
+        statement = insert(FileManifest).values([
+            {"filepath": filepath, "content_hash": content_hash}
+            for filepath, content_hash in entries.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[FileManifest.filepath],
+            set_={"content_hash": statement.excluded.content_hash, "updated_at": text("now()")},
+        )
+        with session_scope(self.session_factory) as session:
+            session.execute(statement)
+
+    def delete_manifest(self, filepaths: List[str]):
+        """
+        Remove manifest entries for the given paths.
+        """
+        if not filepaths:
+            return
+        with session_scope(self.session_factory) as session:
+            session.query(FileManifest).filter(
+                FileManifest.filepath.in_(filepaths)
+            ).delete(synchronize_session=False)
 
     def close(self):
         """
-        Close the session.
+        Nothing to release: sessions are closed after every call and the
+        pool belongs to the engine.
         """
-        self.session.close()
@@ -1,13 +1,17 @@
 import sqlite3
-from typing import Dict
+from typing import Dict, List
+from rag_project.core.ports.metadata_repository_port import MetadataRepositoryPort
 
 
-class MetadataSQLite:
+class MetadataSQLite(MetadataRepositoryPort):
     """
     Handles metadata storage and querying in SQLite.
     """
     def __init__(self, db_path: str = "metadata.db"):
         self.conn = sqlite3.connect(db_path)
+        # WAL lets readers proceed during writes and avoids an fsync per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self._create_table()
 
     def _create_table(self):
@@ -20,6 +24,14 @@ class MetadataSQLite:
         )
         """
         self.conn.execute(query)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_metadata_filename ON metadata (filename)")
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS file_manifest (
+            filepath TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
         self.conn.commit()
 
     def insert_metadata(self, filename: str, source: str, ingestion_timestamp: str):
@@ -30,10 +42,44 @@ class MetadataSQLite:
         self.conn.execute(query, (filename, source, ingestion_timestamp))
         self.conn.commit()
 
+    def insert_metadata_batch(self, entries: List[Dict[str, str]]):
+        query = """
+        INSERT INTO metadata (filename, source, ingestion_timestamp)
+        VALUES (:filename, :source, :ingestion_timestamp)
+        """
+        with self.conn:
+            self.conn.executemany(query, entries)
+
     def fetch_metadata(self):
         query = "SELECT * FROM metadata"
         cursor = self.conn.execute(query)
         return cursor.fetchall()
 
+    def delete_metadata(self, filenames: List[str]):
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM metadata WHERE filename = ?",
+                ((filename,) for filename in filenames),
+            )
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        cursor = self.conn.execute("SELECT filepath, content_hash FROM file_manifest")
+        return dict(cursor.fetchall())
+
+    def update_manifest(self, entries: Dict[str, str]):
+        query = """
+        INSERT OR REPLACE INTO file_manifest (filepath, content_hash, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        """
+        with self.conn:
+            self.conn.executemany(query, entries.items())
+
+    def delete_manifest(self, filepaths: List[str]):
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM file_manifest WHERE filepath = ?",
+                ((filepath,) for filepath in filepaths),
+            )
+
     def close(self):
         self.conn.close()
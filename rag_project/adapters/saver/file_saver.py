@@ -1,6 +1,7 @@
 # File: rag_project/adapters/saver/file_saver.py
 
 import os
+import re
 from typing import List
 from rag_project.core.domain.chunk import Chunk
 from rag_project.core.ports.saver_port import SaverPort
@@ -16,5 +17,17 @@ class FileSaver(SaverPort):
     def save_chunks(self, chunks: List[Chunk]) -> None:
         for chunk in chunks:
             file_path = os.path.join(self.output_dir, f"{chunk.filename}_chunk_{chunk.chunk_id}.txt")
+            # Filenames are relative paths for documents in subdirectories
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
             with open(file_path, 'w', encoding='utf-8') as file:
                 file.write(chunk.content)
+
+    def delete_chunks(self, filenames: List[str]) -> None:
+        for filename in filenames:
+            directory, name = os.path.split(os.path.join(self.output_dir, filename))
+            if not os.path.isdir(directory):
+                continue
+            pattern = re.compile(re.escape(name) + r"_chunk_\d+\.txt")
+            for entry in os.listdir(directory):
+                if pattern.fullmatch(entry):
+                    os.remove(os.path.join(directory, entry))
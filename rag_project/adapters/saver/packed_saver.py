@@ -0,0 +1,332 @@
+# File: rag_project/adapters/saver/packed_saver.py
+
+import json
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+import numpy as np
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.ports.saver_port import SaverPort
+
+# shard, chunk_id, offset, length, filename length; followed by the UTF-8 filename
+_INDEX_ENTRY = struct.Struct("<IIQIH")
+# Shard id of a log record that deletes every chunk of its file
+_TOMBSTONE = 0xFFFFFFFF
+_INDEX_FILE = "index.bin"
+_TABLE_FILE = "table.npy"
+_FILENAMES_FILE = "filenames.json"
+_SHARD_FILE = "shard_{:05d}.bin"
+# One row per chunk, sorted by key = filename id << 32 | chunk_id
+_TABLE_DTYPE = np.dtype([("key", "<u8"), ("shard", "<u4"), ("length", "<u4"), ("offset", "<u8")])
+
+_Location = Tuple[int, int, int]
+
+
+def _key(filename_id: int, chunk_id: int) -> int:
+    return (filename_id << 32) | chunk_id
+
+
+class PackedChunkSaver(SaverPort):
+    """
+    Adapter for saving chunks into a few append-only shard files instead of
+    one file per chunk.
+
+    Chunk contents are appended as UTF-8 to `shard_NNNNN.bin`. A new shard is
+    started once the current one reaches `max_shard_bytes`.
+
+    The offset index has two parts:
+      - `table.npy`: a fixed-width table of (key, shard, length, offset) rows
+        sorted by key, where the key packs the id of the filename (interned
+        in `filenames.json`) with the chunk_id. It is memory-mapped on open
+        and searched by bisection, so opening the archive and looking up a
+        chunk do not depend on the number of chunks stored.
+      - `index.bin`: an append-only log of the writes since the table was
+        last built. Each record is a fixed-size header followed by the
+        filename; a record with shard `_TOMBSTONE` deletes every chunk of
+        its file. Only this tail is replayed into memory on open.
+
+    The log is merged into a new table on `close`, and whenever it grows
+    past `compact_log_bytes`. Re-saving a chunk appends a new record and the
+    latest one wins. Shard space of replaced or deleted chunks is not
+    reclaimed.
+    """
+    def __init__(
+        self,
+        output_dir: str,
+        max_shard_bytes: int = 256 * 1024 * 1024,
+        compact_log_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.output_dir = output_dir
+        self.max_shard_bytes = max_shard_bytes
+        self.compact_log_bytes = compact_log_bytes
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self._filenames: List[str] = []
+        self._filename_ids: Dict[str, int] = {}
+        self._table: np.ndarray = np.empty(0, dtype=_TABLE_DTYPE)
+        # Log tail: locations by (filename id, chunk_id), and the chunk ids of each file
+        self._tail: Dict[Tuple[int, int], _Location] = {}
+        self._tail_files: Dict[int, Set[int]] = {}
+        # Files whose table rows were deleted by a tombstone in the tail
+        self._dropped: Set[int] = set()
+        self._count = 0
+        self._mmaps: Dict[int, mmap.mmap] = {}
+        self._load_table()
+        self._replay_log()
+
+        self._shard_id = self._last_shard_id()
+        self._shard_file: Optional[BinaryIO] = None
+        self._index_file: BinaryIO = open(self._index_path(), "ab")
+
+    def save_chunks(self, chunks: List[Chunk]) -> None:
+        shard_file = self._writable_shard()
+        offset = shard_file.tell()
+        entries = bytearray()
+        for chunk in chunks:
+            data = chunk.content.encode("utf-8")
+            if offset > 0 and offset + len(data) > self.max_shard_bytes:
+                shard_file = self._roll_shard()
+                offset = 0
+            shard_file.write(data)
+
+            name = chunk.filename.encode("utf-8")
+            entries += _INDEX_ENTRY.pack(self._shard_id, chunk.chunk_id, offset, len(data), len(name))
+            entries += name
+            self._put(self._intern(chunk.filename), chunk.chunk_id, (self._shard_id, offset, len(data)))
+            offset += len(data)
+
+        # Contents reach disk before the index records that point to them
+        shard_file.flush()
+        self._append_log(entries)
+
+    def delete_chunks(self, filenames: List[str]) -> None:
+        """
+        Remove every chunk of the given files by appending one tombstone
+        record per file to the log.
+        """
+        entries = bytearray()
+        for filename in filenames:
+            filename_id = self._filename_ids.get(filename)
+            if filename_id is None:
+                continue
+            name = filename.encode("utf-8")
+            entries += _INDEX_ENTRY.pack(_TOMBSTONE, 0, 0, 0, len(name)) + name
+            self._drop(filename_id)
+        if entries:
+            self._append_log(entries)
+
+    def get_chunk(self, filename: str, chunk_id: int) -> Chunk:
+        """
+        Read a single chunk back from its shard.
+
+        Raises:
+            KeyError: If the chunk was never saved, or was deleted.
+        """
+        location = self._find(self._filename_ids.get(filename), chunk_id)
+        if location is None:
+            raise KeyError((filename, chunk_id))
+        shard_id, offset, length = location
+        if length == 0:
+            return Chunk(filename=filename, chunk_id=chunk_id, content="")
+        data = self._shard_view(shard_id, offset + length)[offset:offset + length]
+        return Chunk(filename=filename, chunk_id=chunk_id, content=data.decode("utf-8"))
+
+    def keys(self) -> Iterator[Tuple[str, int]]:
+        """
+        Iterate over the (filename, chunk_id) pairs stored in the archive.
+        """
+        for start in range(0, len(self._table), 1 << 20):
+            for key in self._table["key"][start:start + (1 << 20)].tolist():
+                filename_id, chunk_id = key >> 32, key & 0xFFFFFFFF
+                if filename_id not in self._dropped and (filename_id, chunk_id) not in self._tail:
+                    yield self._filenames[filename_id], chunk_id
+        for filename_id, chunk_id in list(self._tail):
+            yield self._filenames[filename_id], chunk_id
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        filename, chunk_id = key
+        return self._find(self._filename_ids.get(filename), chunk_id) is not None
+
+    def compact(self) -> None:
+        """
+        Merge the log into a new table and empty the log. The filenames and
+        the table are replaced atomically before the log is truncated, so a
+        crash in between only replays records the table already holds.
+        """
+        if not self._tail and not self._dropped and os.path.getsize(self._index_path()) == 0:
+            return
+        table = np.asarray(self._table)
+        keep = np.ones(len(table), dtype=bool)
+        if self._dropped:
+            keep &= ~np.isin(table["key"] >> np.uint64(32), np.fromiter(self._dropped, dtype=np.uint64))
+        tail = np.empty(len(self._tail), dtype=_TABLE_DTYPE)
+        tail["key"] = np.fromiter((_key(*key) for key in self._tail), dtype=np.uint64, count=len(tail))
+        locations = np.array(list(self._tail.values()), dtype=np.uint64).reshape(-1, 3)
+        tail["shard"], tail["offset"], tail["length"] = locations[:, 0], locations[:, 1], locations[:, 2]
+        tail = tail[np.argsort(tail["key"])]
+        if len(tail) and len(table):
+            # Table rows replaced by a tail entry
+            positions = np.minimum(np.searchsorted(tail["key"], table["key"]), len(tail) - 1)
+            keep &= tail["key"][positions] != table["key"]
+        merged = np.concatenate([table[keep], tail])
+        merged = merged[np.argsort(merged["key"], kind="stable")]
+
+        filenames = json.dumps(self._filenames).encode("utf-8")
+        self._write_replace(self._path(_FILENAMES_FILE), lambda file: file.write(filenames))
+        self._write_replace(self._path(_TABLE_FILE), lambda file: np.save(file, merged))
+        self._index_file.truncate(0)
+        # Appends go to the end regardless; this keeps tell() at the log size
+        self._index_file.seek(0)
+        self._tail.clear()
+        self._tail_files.clear()
+        self._dropped.clear()
+        self._load_table()
+
+    def close(self) -> None:
+        self.compact()
+        for view in self._mmaps.values():
+            view.close()
+        self._mmaps.clear()
+        if self._shard_file is not None:
+            self._shard_file.close()
+            self._shard_file = None
+        self._index_file.close()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, name)
+
+    def _index_path(self) -> str:
+        return self._path(_INDEX_FILE)
+
+    def _shard_path(self, shard_id: int) -> str:
+        return self._path(_SHARD_FILE.format(shard_id))
+
+    @staticmethod
+    def _write_replace(path: str, write) -> None:
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def _intern(self, filename: str) -> int:
+        filename_id = self._filename_ids.get(filename)
+        if filename_id is None:
+            filename_id = self._filename_ids[filename] = len(self._filenames)
+            self._filenames.append(filename)
+        return filename_id
+
+    def _table_range(self, filename_id: int) -> Tuple[int, int]:
+        keys = self._table["key"]
+        return (
+            int(np.searchsorted(keys, np.uint64(_key(filename_id, 0)))),
+            int(np.searchsorted(keys, np.uint64(_key(filename_id + 1, 0)))),
+        )
+
+    def _find(self, filename_id: Optional[int], chunk_id: int) -> Optional[_Location]:
+        if filename_id is None:
+            return None
+        location = self._tail.get((filename_id, chunk_id))
+        if location is not None or filename_id in self._dropped:
+            return location
+        key = np.uint64(_key(filename_id, chunk_id))
+        row = int(np.searchsorted(self._table["key"], key))
+        if row < len(self._table) and self._table["key"][row] == key:
+            entry = self._table[row]
+            return int(entry["shard"]), int(entry["offset"]), int(entry["length"])
+        return None
+
+    def _put(self, filename_id: int, chunk_id: int, location: _Location) -> None:
+        if self._find(filename_id, chunk_id) is None:
+            self._count += 1
+        self._tail[(filename_id, chunk_id)] = location
+        self._tail_files.setdefault(filename_id, set()).add(chunk_id)
+
+    def _drop(self, filename_id: int) -> None:
+        chunk_ids = self._tail_files.pop(filename_id, set())
+        for chunk_id in chunk_ids:
+            del self._tail[(filename_id, chunk_id)]
+        live = len(chunk_ids)
+        if filename_id not in self._dropped:
+            start, end = self._table_range(filename_id)
+            table_chunk_ids = (self._table["key"][start:end] & np.uint64(0xFFFFFFFF)).astype(np.int64)
+            # Chunks both in the table and in the tail were counted once
+            live += end - start - int(np.isin(table_chunk_ids, list(chunk_ids)).sum())
+            self._dropped.add(filename_id)
+        self._count -= live
+
+    def _append_log(self, entries: bytes) -> None:
+        self._index_file.write(entries)
+        self._index_file.flush()
+        if self._index_file.tell() >= self.compact_log_bytes:
+            self.compact()
+
+    def _load_table(self) -> None:
+        if os.path.exists(self._path(_FILENAMES_FILE)):
+            with open(self._path(_FILENAMES_FILE), "rb") as file:
+                self._filenames = json.loads(file.read())
+            self._filename_ids = {name: index for index, name in enumerate(self._filenames)}
+        self._table = np.empty(0, dtype=_TABLE_DTYPE)
+        if os.path.exists(self._path(_TABLE_FILE)):
+            table = np.load(self._path(_TABLE_FILE), mmap_mode="r")
+            # np.load cannot map an empty array
+            self._table = table if len(table) else np.empty(0, dtype=_TABLE_DTYPE)
+        self._count = len(self._table)
+
+    def _replay_log(self) -> None:
+        if not os.path.exists(self._index_path()):
+            return
+        with open(self._index_path(), "rb") as file:
+            data = file.read()
+
+        position = 0
+        while position + _INDEX_ENTRY.size <= len(data):
+            shard_id, chunk_id, offset, length, name_length = _INDEX_ENTRY.unpack_from(data, position)
+            name_end = position + _INDEX_ENTRY.size + name_length
+            if name_end > len(data):
+                break  # record torn by an interrupted write
+            filename_id = self._intern(data[position + _INDEX_ENTRY.size:name_end].decode("utf-8"))
+            if shard_id == _TOMBSTONE:
+                self._drop(filename_id)
+            else:
+                self._put(filename_id, chunk_id, (shard_id, offset, length))
+            position = name_end
+
+        if position != len(data):
+            with open(self._index_path(), "r+b") as file:
+                file.truncate(position)
+
+    def _last_shard_id(self) -> int:
+        shard_id = 0
+        while os.path.exists(self._shard_path(shard_id + 1)):
+            shard_id += 1
+        return shard_id
+
+    def _writable_shard(self) -> BinaryIO:
+        if self._shard_file is None:
+            self._shard_file = open(self._shard_path(self._shard_id), "ab")
+            if self._shard_file.tell() >= self.max_shard_bytes:
+                self._roll_shard()
+        return self._shard_file
+
+    def _roll_shard(self) -> BinaryIO:
+        self._shard_file.close()
+        self._shard_id += 1
+        self._shard_file = open(self._shard_path(self._shard_id), "ab")
+        return self._shard_file
+
+    def _shard_view(self, shard_id: int, min_size: int) -> mmap.mmap:
+        view = self._mmaps.get(shard_id)
+        if view is None or len(view) < min_size:
+            # The active shard grows after being mapped: remap to see new data
+            if view is not None:
+                view.close()
+            with open(self._shard_path(shard_id), "rb") as file:
+                view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmaps[shard_id] = view
+        return view
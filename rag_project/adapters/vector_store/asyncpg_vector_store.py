@@ -0,0 +1,276 @@
+# File: rag_project/adapters/vector_store/asyncpg_vector_store.py
+
+import asyncio
+import json
+import re
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Union
+from rag_project.adapters.database.async_connection import AsyncPgPool
+from rag_project.adapters.vector_store.pg_vector_store import (
+    INDEX_TYPES, QUANTIZATIONS, batch_query_statement, index_statement, query_statement,
+)
+from rag_project.core.ports.vector_store_port import VectorStorePort
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+_COLUMNS = ["filename", "chunk_id", "content", "embedding", "doc_metadata"]
+
+
+def positional(sql: str, names: Sequence[str]) -> str:
+    """
+    Rewrite the `:name` parameters of `sql` as asyncpg's `$n` placeholders,
+    numbered in the order of `names`.
+    """
+    for position, name in enumerate(names, start=1):
+        sql = re.sub(rf"(?<!:):{name}\b", f"${position}", sql)
+    return sql
+
+
+class AsyncPgVectorStore(VectorStorePort):
+    """
+    Adapter for PostgreSQL with pgvector on the asyncpg driver.
+
+    Same table, index and query semantics as `PgVectorStore`, but vectors
+    travel in pgvector's binary format (packed float32, no text parsing on
+    either side) and the `a*` methods are native coroutines, so one event
+    loop can keep many queries in flight on the pool's connections.
+
+    `ainsert_batch` writes with binary COPY, `batch_size` rows per COPY, and
+    keeps up to `insert_concurrency` COPYs in flight on separate connections:
+    the next slice is encoded and sent while the server is still writing the
+    previous ones. Each slice commits on its own, as in "copy" mode of
+    `PgVectorStore`.
+
+    The synchronous methods run the coroutines on the pool's background
+    loop, so the store can stand in for `PgVectorStore` in synchronous code.
+    """
+    def __init__(
+        self,
+        pool: Optional[AsyncPgPool] = None,
+        batch_size: int = 1000,
+        insert_concurrency: int = 4,
+        vector_dim: int = 384,
+        index_type: str = "none",
+        quantization: str = "none",
+        hnsw_m: int = 16,
+        ef_construction: int = 64,
+        ivf_lists: int = 1000,
+        ef_search: int = 40,
+        probes: int = 10,
+        rescore_factor: int = 0,
+        maintenance_work_mem: Optional[str] = None,
+    ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATIONS}")
+        super().__init__()
+        self.pool = pool or AsyncPgPool()
+        self.batch_size = batch_size
+        self.insert_concurrency = insert_concurrency
+        self.vector_dim = vector_dim
+        self.index_type = index_type
+        self.quantization = quantization
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ivf_lists = ivf_lists
+        self.ef_search = ef_search
+        self.probes = probes
+        self.rescore_factor = rescore_factor if quantization != "none" else 0
+        self.maintenance_work_mem = maintenance_work_mem
+        # asyncpg rejects arguments the statement does not use
+        self._query_params = ["embedding", "top_k"] + (["candidates"] if self.rescore_factor > 0 else [])
+        self._query_sql = positional(
+            query_statement(vector_dim, quantization, self.rescore_factor), self._query_params,
+        )
+        self._batch_query_params = ["embeddings"] + self._query_params[1:]
+        self._batch_query_sql = positional(
+            batch_query_statement(vector_dim, quantization, self.rescore_factor), self._batch_query_params,
+        )
+
+    async def ainsert(self, chunks: List[Chunk]) -> None:
+        for chunk in chunks:
+            if chunk.embedding is None:
+                raise ValueError("Chunk embedding cannot be None")
+        await self.ainsert_batch(ChunkBatch.from_chunks(chunks))
+
+    async def ainsert_batch(self, batch: ChunkBatch) -> None:
+        if len(batch) == 0:
+            return
+        pool = await self.pool.pool()
+        in_flight = asyncio.Semaphore(self.insert_concurrency)
+
+        async def copy_slice(start: int) -> None:
+            async with in_flight:
+                rows = batch.slice(start, start + self.batch_size)
+                records = [
+                    (chunk.filename, chunk.chunk_id, chunk.content, rows.embeddings[row], json.dumps(chunk.metadata))
+                    for row, chunk in enumerate(rows.chunks)
+                ]
+                async with pool.acquire() as connection:
+                    await connection.copy_records_to_table("embeddings", records=records, columns=_COLUMNS)
+
+        await asyncio.gather(*(copy_slice(start) for start in range(0, len(batch), self.batch_size)))
+        self._notify_write()
+
+    async def adelete(self, filenames: List[str]) -> None:
+        if not filenames:
+            return
+        pool = await self.pool.pool()
+        await pool.execute("DELETE FROM embeddings WHERE filename = ANY($1::text[])", list(filenames))
+        self._notify_write()
+
+    async def aquery(
+        self,
+        embedding: Union[Sequence[float], np.ndarray],
+        top_k: int,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        **search_params: Any,
+    ) -> List[Dict]:
+        candidates = top_k * self.rescore_factor if self.rescore_factor > 0 else top_k
+        values = {"embedding": np.asarray(embedding, dtype=np.float32), "top_k": top_k, "candidates": candidates}
+        rows = await self._fetch(
+            self._query_sql, [values[name] for name in self._query_params], candidates, ef_search, probes,
+        )
+        return [self._record(row) for row in rows]
+
+    async def aquery_batch(
+        self,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        top_k: int,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        **search_params: Any,
+    ) -> List[List[Dict]]:
+        """
+        Run every query in one statement, the vectors bound as one binary
+        vector[] array and searched through a LATERAL join.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.vector_dim)
+        results: List[List[Dict]] = [[] for _ in range(len(embeddings))]
+        if not len(embeddings):
+            return results
+        candidates = top_k * self.rescore_factor if self.rescore_factor > 0 else top_k
+        values = {"embeddings": list(embeddings), "top_k": top_k, "candidates": candidates}
+        rows = await self._fetch(
+            self._batch_query_sql, [values[name] for name in self._batch_query_params], candidates, ef_search, probes,
+        )
+        for row in rows:
+            results[row['query_index']].append(self._record(row))
+        return results
+
+    def insert(self, chunks: List[Chunk]) -> None:
+        self.pool.run(self.ainsert(chunks))
+
+    def insert_batch(self, batch: ChunkBatch) -> None:
+        self.pool.run(self.ainsert_batch(batch))
+
+    def delete(self, filenames: List[str]) -> None:
+        self.pool.run(self.adelete(filenames))
+
+    def query(
+        self,
+        embedding: Union[Sequence[float], np.ndarray],
+        top_k: int,
+        **search_params: Any,
+    ) -> List[Dict]:
+        return self.pool.run(self.aquery(embedding, top_k, **search_params))
+
+    def query_batch(
+        self,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        top_k: int,
+        **search_params: Any,
+    ) -> List[List[Dict]]:
+        return self.pool.run(self.aquery_batch(embeddings, top_k, **search_params))
+
+    @property
+    def index_name(self) -> str:
+        suffix = "" if self.quantization == "none" else f"_{self.quantization}"
+        return f"embeddings_embedding_{self.index_type}{suffix}"
+
+    def create_index(self, concurrently: bool = False) -> None:
+        """
+        Create the configured ANN index unless it already exists; see
+        `PgVectorStore.create_index`.
+        """
+        if self.index_type == "none":
+            return
+        self.pool.run(self._execute_ddl([self._index_ddl(self.index_name, concurrently)]))
+
+    def rebuild_index(self) -> None:
+        """
+        Rebuild the ANN index under a staging name and swap it in; see
+        `PgVectorStore.rebuild_index`.
+        """
+        if self.index_type == "none":
+            return
+        staging = f"{self.index_name}_rebuild"
+        self.pool.run(self._execute_ddl([
+            f"DROP INDEX CONCURRENTLY IF EXISTS {staging}",
+            self._index_ddl(staging, concurrently=True),
+            f"DROP INDEX CONCURRENTLY IF EXISTS {self.index_name}",
+            f"ALTER INDEX {staging} RENAME TO {self.index_name}",
+        ]))
+
+    def drop_index(self) -> None:
+        if self.index_type == "none":
+            return
+        self.pool.run(self._execute_ddl([f"DROP INDEX IF EXISTS {self.index_name}"]))
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _index_ddl(self, name: str, concurrently: bool) -> str:
+        return index_statement(
+            name, self.index_type, self.vector_dim, self.quantization,
+            self.hnsw_m, self.ef_construction, self.ivf_lists, concurrently,
+        )
+
+    async def _fetch(
+        self, sql: str, arguments: List[Any], candidates: int, ef_search: Optional[int], probes: Optional[int],
+    ):
+        pool = await self.pool.pool()
+        async with pool.acquire() as connection:
+            async with connection.transaction():
+                if self.index_type == "hnsw":
+                    # HNSW returns at most ef_search rows
+                    await self._set_local(connection, "hnsw.ef_search", max(ef_search or self.ef_search, candidates))
+                elif self.index_type == "ivfflat":
+                    await self._set_local(connection, "ivfflat.probes", probes or self.probes)
+                return await connection.fetch(sql, *arguments)
+
+    @staticmethod
+    def _record(row) -> Dict[str, Any]:
+        return {
+            'id': row['id'],
+            'filename': row['filename'],
+            'chunk_id': row['chunk_id'],
+            'content': row['content'],
+            # asyncpg returns json columns undecoded
+            'metadata': json.loads(row['doc_metadata']) if row['doc_metadata'] is not None else None,
+            'distance': row['distance'],
+        }
+
+    @staticmethod
+    async def _set_local(connection, name: str, value: int) -> None:
+        await connection.execute("SELECT set_config($1, $2, true)", name, str(value))
+
+    async def _execute_ddl(self, statements: List[str]) -> None:
+        """
+        Run index DDL statement by statement outside a transaction block, as
+        CONCURRENTLY requires. asyncpg resets session settings such as
+        maintenance_work_mem when the connection is released to the pool.
+        """
+        pool = await self.pool.pool()
+        async with pool.acquire() as connection:
+            if self.maintenance_work_mem:
+                await connection.execute(
+                    "SELECT set_config('maintenance_work_mem', $1, false)", self.maintenance_work_mem,
+                )
+            for statement in statements:
+                await connection.execute(statement)
@@ -0,0 +1,214 @@
+# File: rag_project/adapters/vector_store/chunk_table.py
+
+import json
+import mmap
+import os
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Sequence, Union
+import numpy as np
+from rag_project.core.domain.chunk import Chunk
+
+_FILENAMES = "filenames.json"
+_FILENAME_IDS = "filename_ids.npy"
+_CHUNK_IDS = "chunk_ids.npy"
+_CONTENT = "content.bin"
+_CONTENT_OFFSETS = "content_offsets.npy"
+_METADATA = "metadata.bin"
+_METADATA_OFFSETS = "metadata_offsets.npy"
+
+
+def write_atomic(path: str, data: Union[bytes, Iterable[bytes]]) -> None:
+    """
+    Write `data`, bytes or an iterable of bytes consumed piece by piece,
+    next to `path` and rename it into place. Processes that have the old
+    file memory-mapped keep reading the old inode.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            file.write(data)
+        else:
+            for piece in data:
+                file.write(piece)
+    os.replace(temporary, path)
+
+
+def save_npy_atomic(path: str, array: np.ndarray) -> None:
+    """
+    `np.save` counterpart of `write_atomic`.
+    """
+    temporary = path + ".tmp.npy"
+    np.save(temporary, array)
+    os.replace(temporary, path)
+
+
+def _iter_slices(blob: Union[mmap.mmap, bytes], end: int, size: int = 64 * 1024 * 1024) -> Iterable[bytes]:
+    for start in range(0, end, size):
+        yield blob[start:min(start + size, end)]
+
+
+def _map_bytes(path: str) -> Union[mmap.mmap, bytes]:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ChunkTable:
+    """
+    Column store for the chunk records of a vector index: row i holds the
+    filename, chunk_id, content and metadata of index row i.
+
+    On disk, filenames are interned in `filenames.json` and referenced by id,
+    chunk ids are an int64 column, and contents (UTF-8) and metadata (JSON)
+    are two blobs addressed by int64 offset columns. `load` with `mmap=True`
+    maps every file instead of reading it, so opening a table takes constant
+    time, records are only decoded when a search returns them, and processes
+    that open the same directory share one page-cached copy.
+
+    Rows appended after loading stay in Python lists until the next `save`.
+    """
+    def __init__(self):
+        self._filenames: List[str] = []
+        self._filename_index: Dict[str, int] = {}
+        # Loaded columns
+        self._base_rows = 0
+        self._base_filename_ids = np.empty(0, dtype=np.int32)
+        self._base_chunk_ids = np.empty(0, dtype=np.int64)
+        self._base_content: Union[mmap.mmap, bytes] = b""
+        self._base_content_offsets = np.zeros(1, dtype=np.int64)
+        self._base_metadata: Union[mmap.mmap, bytes] = b""
+        self._base_metadata_offsets = np.zeros(1, dtype=np.int64)
+        # Appended rows
+        self._filename_ids: List[int] = []
+        self._chunk_ids: List[int] = []
+        self._contents: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return self._base_rows + len(self._chunk_ids)
+
+    def extend(self, chunks: Sequence[Chunk]) -> None:
+        for chunk in chunks:
+            filename_id = self._filename_index.get(chunk.filename)
+            if filename_id is None:
+                filename_id = self._filename_index[chunk.filename] = len(self._filenames)
+                self._filenames.append(chunk.filename)
+            self._filename_ids.append(filename_id)
+            self._chunk_ids.append(chunk.chunk_id)
+            self._contents.append(chunk.content)
+            self._metadata.append(chunk.metadata)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """
+        The record of row `row`: chunk_id, filename, content and metadata.
+        """
+        if row < self._base_rows:
+            start, end = self._base_content_offsets[row:row + 2]
+            content = self._base_content[start:end].decode("utf-8")
+            start, end = self._base_metadata_offsets[row:row + 2]
+            metadata = json.loads(self._base_metadata[start:end]) if end > start else {}
+            return {
+                "chunk_id": int(self._base_chunk_ids[row]),
+                "filename": self._filenames[self._base_filename_ids[row]],
+                "content": content,
+                "metadata": metadata,
+            }
+        row -= self._base_rows
+        return {
+            "chunk_id": self._chunk_ids[row],
+            "filename": self._filenames[self._filename_ids[row]],
+            "content": self._contents[row],
+            "metadata": self._metadata[row],
+        }
+
+    def rows_for_filenames(self, filenames: Iterable[str]) -> np.ndarray:
+        """
+        Row numbers of every chunk belonging to one of `filenames`.
+        """
+        ids = [self._filename_index[name] for name in filenames if name in self._filename_index]
+        if not ids:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(np.isin(self._column_filename_ids(), ids))
+
+    def take(self, rows: np.ndarray) -> "ChunkTable":
+        """
+        A table of the given rows, in the given order, held in memory. Row
+        i of the result is row `rows[i]` of this table.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        table = ChunkTable()
+        table._filenames = list(self._filenames)
+        table._filename_index = dict(self._filename_index)
+        table._base_rows = len(rows)
+        table._base_filename_ids = self._column_filename_ids()[rows]
+        table._base_chunk_ids = self._column_chunk_ids()[rows]
+        for blob, offsets, pieces in (
+            ("_base_content", "_base_content_offsets", self._appended_content()),
+            ("_base_metadata", "_base_metadata_offsets", self._appended_metadata()),
+        ):
+            base_blob, base_offsets = getattr(self, blob), getattr(self, offsets)
+            selected = [
+                base_blob[base_offsets[row]:base_offsets[row + 1]] if row < self._base_rows
+                else pieces[row - self._base_rows]
+                for row in rows.tolist()
+            ]
+            lengths = np.fromiter(map(len, selected), dtype=np.int64, count=len(selected))
+            setattr(table, offsets, np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(lengths)]))
+            setattr(table, blob, b"".join(selected))
+        return table
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        appended_content = self._appended_content()
+        appended_metadata = self._appended_metadata()
+
+        write_atomic(os.path.join(directory, _FILENAMES), json.dumps(self._filenames).encode("utf-8"))
+        save_npy_atomic(os.path.join(directory, _FILENAME_IDS), self._column_filename_ids())
+        save_npy_atomic(os.path.join(directory, _CHUNK_IDS), self._column_chunk_ids())
+        for blob, offsets, base_blob, base_offsets, pieces in (
+            (_CONTENT, _CONTENT_OFFSETS, self._base_content, self._base_content_offsets, appended_content),
+            (_METADATA, _METADATA_OFFSETS, self._base_metadata, self._base_metadata_offsets, appended_metadata),
+        ):
+            lengths = np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces))
+            save_npy_atomic(os.path.join(directory, offsets), np.concatenate([
+                base_offsets, base_offsets[-1] + np.cumsum(lengths),
+            ]))
+            write_atomic(os.path.join(directory, blob), chain(_iter_slices(base_blob, int(base_offsets[-1])), pieces))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "ChunkTable":
+        """
+        Open a table written by `save`, memory-mapped unless `mmap` is False.
+        """
+        table = cls()
+        with open(os.path.join(directory, _FILENAMES), "rb") as file:
+            table._filenames = json.loads(file.read())
+        table._filename_index = {name: index for index, name in enumerate(table._filenames)}
+
+        mmap_mode = "r" if mmap else None
+        table._base_filename_ids = np.load(os.path.join(directory, _FILENAME_IDS), mmap_mode=mmap_mode)
+        table._base_chunk_ids = np.load(os.path.join(directory, _CHUNK_IDS), mmap_mode=mmap_mode)
+        table._base_content_offsets = np.load(os.path.join(directory, _CONTENT_OFFSETS), mmap_mode=mmap_mode)
+        table._base_metadata_offsets = np.load(os.path.join(directory, _METADATA_OFFSETS), mmap_mode=mmap_mode)
+        for attribute, name in (("_base_content", _CONTENT), ("_base_metadata", _METADATA)):
+            path = os.path.join(directory, name)
+            if mmap:
+                setattr(table, attribute, _map_bytes(path))
+            else:
+                with open(path, "rb") as file:
+                    setattr(table, attribute, file.read())
+        table._base_rows = len(table._base_chunk_ids)
+        return table
+
+    def _column_filename_ids(self) -> np.ndarray:
+        return np.concatenate([self._base_filename_ids, np.asarray(self._filename_ids, dtype=np.int32)])
+
+    def _column_chunk_ids(self) -> np.ndarray:
+        return np.concatenate([self._base_chunk_ids, np.asarray(self._chunk_ids, dtype=np.int64)])
+
+    def _appended_content(self) -> List[bytes]:
+        return [content.encode("utf-8") for content in self._contents]
+
+    def _appended_metadata(self) -> List[bytes]:
+        return [json.dumps(metadata).encode("utf-8") if metadata else b"" for metadata in self._metadata]
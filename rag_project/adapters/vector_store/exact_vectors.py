@@ -0,0 +1,78 @@
+# File: rag_project/adapters/vector_store/exact_vectors.py
+
+import os
+from typing import List, Optional
+import numpy as np
+
+
+class ExactVectors:
+    """
+    Full-precision float32 copy of the vectors of a compressed index, used
+    to re-score its candidates exactly.
+
+    Vectors appended in this process are kept in memory; `save` writes all
+    rows to one `.npy` file and `load` maps it, so only the rows gathered by
+    `take` are read from disk.
+    """
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._base: np.ndarray = np.empty((0, dim), dtype=np.float32)
+        self._appended: List[np.ndarray] = []
+        self._appended_matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(len(block) for block in self._appended)
+
+    def append(self, vectors: np.ndarray) -> None:
+        self._appended.append(np.ascontiguousarray(vectors, dtype=np.float32))
+        self._appended_matrix = None
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """
+        The vectors of `rows`, in the given order.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        in_base = rows < len(self._base)
+        if in_base.all():
+            return np.asarray(self._base[rows])
+        result = np.empty((len(rows), self.dim), dtype=np.float32)
+        result[in_base] = self._base[rows[in_base]]
+        result[~in_base] = self._appended_rows()[rows[~in_base] - len(self._base)]
+        return result
+
+    def select(self, rows: np.ndarray) -> "ExactVectors":
+        """
+        A copy holding the vectors of `rows`, in the given order, in memory.
+        """
+        vectors = ExactVectors(self.dim)
+        vectors._base = self.take(rows)
+        return vectors
+
+    def save(self, path: str) -> None:
+        """
+        Write every row to `path`, block by block, then rename it into place.
+        """
+        temporary = path + ".tmp.npy"
+        output = np.lib.format.open_memmap(temporary, mode="w+", dtype=np.float32, shape=(len(self), self.dim))
+        position = 0
+        for block in [self._base, *self._appended]:
+            for start in range(0, len(block), 65536):
+                rows = block[start:start + 65536]
+                output[position:position + len(rows)] = rows
+                position += len(rows)
+        output.flush()
+        del output
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ExactVectors":
+        base = np.load(path, mmap_mode="r" if mmap else None)
+        vectors = cls(base.shape[1])
+        vectors._base = base
+        return vectors
+
+    def _appended_rows(self) -> np.ndarray:
+        if self._appended_matrix is None:
+            self._appended = [np.concatenate(self._appended)] if len(self._appended) > 1 else self._appended
+            self._appended_matrix = self._appended[0]
+        return self._appended_matrix
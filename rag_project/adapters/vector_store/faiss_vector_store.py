@@ -1,47 +1,513 @@
 # File: rag_project/adapters/vector_store_adapter.py
 
+import json
+import os
+import shutil
+import time
 import numpy as np
 import faiss
+from rag_project.adapters.vector_store.chunk_table import ChunkTable, save_npy_atomic, write_atomic
+from rag_project.adapters.vector_store.exact_vectors import ExactVectors
 from rag_project.core.ports.vector_store_port import VectorStorePort
 from rag_project.core.domain.chunk import Chunk
-from typing import List, Dict
+from rag_project.core.domain.chunk_batch import ChunkBatch
+from typing import Any, List, Dict, Optional, Sequence, Set, Tuple, Union
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq", "sq8", "pq", "ivf_sq8")
+# Index types whose search rejects an ID selector: deleted rows are
+# filtered out of their results instead
+_NO_SELECTOR = ("pq",)
+
+_CURRENT = "CURRENT"
+_VERSION_PREFIX = "version-"
+_MANIFEST = "store.json"
+_INDEX_FILE = "index.faiss"
+_DELETED_FILE = "deleted.npy"
+_VECTORS_FILE = "vectors.npy"
 
 
 class FaissVectorStore(VectorStorePort):
     """
     Adapter for FAISS vector store operations.
+
+    `index_type` selects the index:
+      - "flat": exact brute-force search (IndexFlatL2).
+      - "hnsw": graph index with `hnsw_m` links per node; no training.
+      - "ivf_flat": `nlist` k-means cells, full vectors in each cell.
+      - "ivf_pq": `nlist` cells, vectors compressed to `pq_m` codes of `pq_bits`.
+      - "sq8": brute-force search over int8 scalar-quantized vectors (4x smaller).
+      - "pq": brute-force search over `pq_m` codes of `pq_bits`.
+      - "ivf_sq8": `nlist` cells of int8 scalar-quantized vectors.
+
+    IVF and quantized indexes must be trained before vectors can be added.
+    Inserted vectors are buffered until `train_size` of them are available,
+    then a random sample of them trains the index and the buffer is added.
+    `train` can also
+    be called explicitly, with a sample or with whatever has been buffered;
+    a query against an untrained index trains it on the buffer, reducing
+    `nlist` if there are too few vectors for it.
+
+    `nprobe` and `ef_search` are the default search parameters; `query` and
+    `query_batch` accept them per call.
+
+    With `rescore_factor` > 0, a query fetches `top_k * rescore_factor`
+    candidates from the (compressed) index and re-ranks them by exact L2
+    distance against a full-precision copy of the vectors. That copy is
+    saved with the store and memory-mapped on load, so it stays on disk
+    except for the candidate rows.
+
+    Chunk records live in a columnar ChunkTable. `save` writes the index,
+    the table and the deleted rows to a new version of a directory, and
+    `load` reopens the current version memory-mapped, so start-up does not
+    depend on corpus size. A mapped index is copied into memory before the
+    first insert.
+
+    Deleted rows stay in the index, excluded from searches, until `save`
+    finds that they make up at least `compact_threshold` of it; `compact`
+    then drops them and renumbers the remaining rows.
     """
-    def __init__(self, vector_dim: int):
+    def __init__(
+        self,
+        vector_dim: int,
+        index_type: str = "flat",
+        nlist: int = 1024,
+        pq_m: int = 16,
+        pq_bits: int = 8,
+        hnsw_m: int = 32,
+        ef_construction: int = 200,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        train_size: Optional[int] = None,
+        seed: int = 0,
+        rescore_factor: int = 0,
+        compact_threshold: float = 0.2,
+    ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown FAISS index type '{index_type}', expected one of {list(INDEX_TYPES)}")
+        super().__init__()
         self.vector_dim = vector_dim
-        self.index = faiss.IndexFlatL2(self.vector_dim)
-        self.chunk_data: List[Dict] = []
+        self.index_type = index_type
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.pq_bits = pq_bits
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.train_size = train_size or self._min_train_size(nlist)
+        self.seed = seed
+        self.rescore_factor = rescore_factor
+        self.compact_threshold = compact_threshold
+        self.index = self._build_index(nlist)
+        # Row i of the index belongs to row i of the chunk table; deleted rows
+        # are excluded from searches through an ID selector.
+        self.chunk_table = ChunkTable()
+        self._deleted: Set[int] = set()
+        self.exact_vectors = ExactVectors(vector_dim) if rescore_factor > 0 else None
+        # Whether the index data is memory-mapped, and so read-only
+        self._index_mapped = False
+        self._selector: Optional[faiss.IDSelector] = None
+        self._deleted_ids: Optional[np.ndarray] = None
+        self._search_params: Optional[faiss.SearchParameters] = None
+        # Vectors waiting for the index to be trained, in chunk table order
+        self._pending: List[np.ndarray] = []
+        self._pending_rows = 0
+
+        print(f"Initialized FAISS {index_type} index with dimension: {self.vector_dim}")
 
-        print(f"Initialized FAISS Index with dimension: {self.vector_dim}")
+    @property
+    def is_trained(self) -> bool:
+        return self.index.is_trained
 
     def insert(self, chunks: List[Chunk]):
-        embeddings_to_add = []
-        for chunk in chunks:
-            if chunk.embedding is not None:
-                embedding_np = np.array(chunk.embedding, dtype=np.float32)
-                embeddings_to_add.append(embedding_np)
-                self.chunk_data.append({
-                    "chunk_id": chunk.chunk_id,
-                    "filename": chunk.filename,
-                    "content": chunk.content,
-                    "embedding": chunk.embedding,
-                })
-
-        if embeddings_to_add:
-            embeddings_matrix = np.vstack(embeddings_to_add)
-            self.index.add(embeddings_matrix)
-
-    def query(self, embedding: List[float], top_k: int) -> List[Dict]:
-        if self.index.ntotal == 0:
-            return []
-
-        query_vector = np.array(embedding, dtype=np.float32).reshape(1, -1)
-        distances, indices = self.index.search(query_vector, top_k)
-
-        return [
-            self.chunk_data[idx] for idx in indices[0] if idx != -1
-        ]
+        chunks = [chunk for chunk in chunks if chunk.embedding is not None]
+        if chunks:
+            self.insert_batch(ChunkBatch.from_chunks(chunks))
+
+    def insert_batch(self, batch: ChunkBatch) -> None:
+        """
+        Add the embedding matrix to the index as is: FAISS reads the
+        C-contiguous float32 buffer directly, with no per-vector conversion.
+        Records keep only the chunk fields, since the vectors live in the index.
+        """
+        if len(batch) == 0:
+            return
+        if self._index_mapped:
+            self._copy_index_to_memory()
+        self.chunk_table.extend(batch.chunks)
+        if self.exact_vectors is not None:
+            self.exact_vectors.append(batch.embeddings)
+        if self.index.is_trained:
+            self.index.add(batch.embeddings)
+        else:
+            self._pending.append(batch.embeddings)
+            self._pending_rows += len(batch)
+            if self._pending_rows >= self.train_size:
+                self.train()
+        self._notify_write()
+
+    def train(self, sample: Optional[np.ndarray] = None) -> None:
+        """
+        Train an IVF or quantized index, then add the buffered vectors.
+
+        Args:
+            sample (Optional[np.ndarray]): Float32 training vectors. Defaults to
+                up to `train_size` vectors sampled from the buffer.
+        """
+        if self.index.is_trained:
+            return
+        pending = np.concatenate(self._pending) if self._pending else np.empty((0, self.vector_dim), np.float32)
+        if sample is None:
+            sample = pending
+            if len(sample) > self.train_size:
+                rows = np.random.default_rng(self.seed).choice(len(sample), self.train_size, replace=False)
+                sample = sample[np.sort(rows)]
+        sample = np.ascontiguousarray(sample, dtype=np.float32)
+        if len(sample) == 0:
+            return
+        # A PQ codebook needs at least one training point per centroid
+        pq_bits = min(self.pq_bits, max(1, int(np.log2(len(sample)))))
+        if self.index_type.startswith("ivf") and len(sample) < self._min_train_size(self.nlist):
+            # Too few points for the configured cells: shrink nlist to what the sample supports
+            self.index = self._build_index(max(1, len(sample) // 39), pq_bits=pq_bits)
+        elif self.index_type == "pq" and pq_bits < self.pq_bits:
+            self.index = self._build_index(self.nlist, pq_bits=pq_bits)
+        self.index.train(sample)
+        if len(pending):
+            self.index.add(pending)
+        self._pending = []
+        self._pending_rows = 0
+        self._search_params = None
+
+    def delete(self, filenames: List[str]) -> None:
+        self._deleted.update(self.chunk_table.rows_for_filenames(set(filenames)).tolist())
+        self._reset_selector()
+        self._notify_write()
+
+    def compact(self) -> None:
+        """
+        Remove the deleted rows from the index, the chunk table and the
+        exact vectors. The remaining rows keep their order and are
+        renumbered from 0; search results are unchanged.
+
+        Flat and quantized indexes drop the rows in place, IVF indexes
+        rebuild their inverted lists from the kept codes, and HNSW, which
+        cannot remove nodes, is rebuilt from its stored vectors.
+        """
+        self.train()
+        if not self._deleted or not self.index.is_trained:
+            return
+        if self._index_mapped:
+            self._copy_index_to_memory()
+        deleted = np.sort(self._get_deleted_ids())
+        keep = np.ones(self.index.ntotal, dtype=bool)
+        keep[deleted] = False
+        kept_rows = np.flatnonzero(keep)
+
+        if self.index_type.startswith("ivf"):
+            self._compact_invlists(deleted)
+        elif self.index_type == "hnsw":
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)[kept_rows]
+            self.index = self._build_index(self.nlist)
+            self.index.add(vectors)
+        else:
+            # Flat codes shift the rows after each removed one down
+            self.index.remove_ids(faiss.IDSelectorBatch(deleted))
+
+        self.chunk_table = self.chunk_table.take(kept_rows)
+        if self.exact_vectors is not None:
+            self.exact_vectors = self.exact_vectors.select(kept_rows)
+        self._deleted = set()
+        self._reset_selector()
+
+    def query(self, embedding: Union[Sequence[float], np.ndarray], top_k: int, **search_params: Any) -> List[Dict]:
+        """
+        Search the index. For IVF indexes `nprobe`, and for HNSW `ef_search`,
+        override the store defaults for this call.
+        """
+        return self.query_batch(np.asarray(embedding, dtype=np.float32).reshape(1, -1), top_k, **search_params)[0]
+
+    def query_batch(
+        self, embeddings: Union[Sequence[Sequence[float]], np.ndarray], top_k: int, **search_params: Any
+    ) -> List[List[Dict]]:
+        """
+        Search every row of `embeddings` with one FAISS call, which spreads
+        the queries over its threads. Distances are squared L2 (exact after
+        re-scoring, approximate for compressed indexes without it).
+        """
+        query_vectors = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1, self.vector_dim)
+        if not self.index.is_trained:
+            self.train()
+        if not len(query_vectors) or self.index.ntotal == len(self._deleted):
+            return [[] for _ in range(len(query_vectors))]
+
+        candidates = top_k * self.rescore_factor if self.exact_vectors is not None else top_k
+        search_k = candidates
+        filter_deleted = self.index_type in _NO_SELECTOR and bool(self._deleted)
+        if filter_deleted:
+            # Enough extra rows that `candidates` remain even if every deleted row ranks first
+            search_k = min(candidates + len(self._deleted), self.index.ntotal)
+        distances, indices = self.index.search(query_vectors, search_k, params=self._get_search_params(**search_params))
+        if filter_deleted:
+            indices[np.isin(indices, self._get_deleted_ids())] = -1
+        results = []
+        for query_vector, row_distances, rows in zip(query_vectors, distances, indices):
+            found = rows != -1
+            rows, row_distances = rows[found][:candidates], row_distances[found][:candidates]
+            if self.exact_vectors is not None and len(rows):
+                rows, row_distances = self._rescore(query_vector, rows)
+                rows, row_distances = rows[:top_k], row_distances[:top_k]
+            results.append([
+                {**self.chunk_table.record(idx), "distance": float(distance)}
+                for idx, distance in zip(rows, row_distances)
+            ])
+        return results
+
+    def _rescore(self, query_vector: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Order candidate rows by exact squared L2 distance to the query.
+        """
+        # Gathering in row order keeps reads of a mapped file sequential
+        rows = np.sort(rows)
+        differences = self.exact_vectors.take(rows) - query_vector
+        distances = np.einsum("ij,ij->i", differences, differences)
+        order = np.argsort(distances, kind="stable")
+        return rows[order], distances[order]
+
+    def save(self, directory: str) -> None:
+        """
+        Write the index, chunk table and deleted rows to a new version
+        subdirectory of `directory`, then point `directory/CURRENT` at it with
+        an atomic rename. A concurrent `load`, or a save cut short by a crash,
+        therefore sees either the previous version or this one, never a mix
+        of the two. The previous version is kept for readers that resolved it
+        just before the switch; older ones are removed. An IVF index that is
+        still buffering vectors is trained first.
+
+        Deleted rows are compacted away first once they reach
+        `compact_threshold` of the index.
+
+        Only one process may save to a directory at a time.
+        """
+        self.train()
+        if self._deleted and len(self._deleted) >= self.compact_threshold * self.index.ntotal:
+            self.compact()
+        os.makedirs(directory, exist_ok=True)
+        previous = self._current_version(directory)
+        version = f"{_VERSION_PREFIX}{time.time_ns():020d}-{os.getpid()}"
+        path = os.path.join(directory, version)
+        os.makedirs(path)
+
+        self.chunk_table.save(path)
+        if self.exact_vectors is not None:
+            self.exact_vectors.save(os.path.join(path, _VECTORS_FILE))
+        save_npy_atomic(
+            os.path.join(path, _DELETED_FILE),
+            np.fromiter(sorted(self._deleted), dtype=np.int64, count=len(self._deleted)),
+        )
+        faiss.write_index(self.index, os.path.join(path, _INDEX_FILE))
+        write_atomic(os.path.join(path, _MANIFEST), json.dumps({
+            "vector_dim": self.vector_dim,
+            "index_type": self.index_type,
+            # As configured; the index file records the cells actually trained
+            "nlist": self.nlist,
+            "pq_m": self.pq_m,
+            "pq_bits": self.pq_bits,
+            "hnsw_m": self.hnsw_m,
+            "ef_construction": self.ef_construction,
+            "nprobe": self.nprobe,
+            "ef_search": self.ef_search,
+            "train_size": self.train_size,
+            "seed": self.seed,
+            "rescore_factor": self.rescore_factor,
+            "compact_threshold": self.compact_threshold,
+        }).encode("utf-8"))
+
+        write_atomic(os.path.join(directory, _CURRENT), version.encode("utf-8"))
+        for name in os.listdir(directory):
+            if name.startswith(_VERSION_PREFIX) and name not in (version, previous):
+                # Processes that still map these files keep them until they unmap
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    @classmethod
+    def is_saved(cls, directory: str) -> bool:
+        return os.path.exists(os.path.join(cls._version_path(directory), _MANIFEST))
+
+    @classmethod
+    def saved_settings(cls, directory: str) -> Dict[str, Any]:
+        """
+        The constructor settings of the store saved in `directory`.
+        """
+        return cls._read_manifest(cls._version_path(directory))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True, **options: Any) -> "FaissVectorStore":
+        """
+        Open a store written by `save`.
+
+        Args:
+            directory (str): The directory passed to `save`.
+            mmap (bool): Map the index and chunk table instead of reading them.
+                Inverted lists (IVF) or flat codes (flat, HNSW) stay on disk
+                and are shared through the page cache.
+            **options: Constructor arguments overriding the saved ones, such
+                as `nprobe` or `ef_search`.
+        """
+        # Resolved once: every file below comes from the same version
+        path = cls._version_path(directory)
+        store = cls(**{**cls._read_manifest(path), **options})
+
+        flags = 0
+        if mmap:
+            # IVF maps its inverted lists; flat and HNSW map their flat codes
+            flags = faiss.IO_FLAG_MMAP if store.index_type.startswith("ivf") else faiss.IO_FLAG_MMAP_IFC
+            flags |= faiss.IO_FLAG_READ_ONLY
+            store._index_mapped = True
+        store.index = faiss.read_index(os.path.join(path, _INDEX_FILE), flags)
+        store.chunk_table = ChunkTable.load(path, mmap=mmap)
+        vectors_path = os.path.join(path, _VECTORS_FILE)
+        if store.rescore_factor > 0:
+            if not os.path.exists(vectors_path):
+                raise ValueError(
+                    f"rescore_factor={store.rescore_factor} needs the float32 vectors, but the store in "
+                    f"{directory} was saved without them; load it with rescore_factor=0 or rebuild it"
+                )
+            store.exact_vectors = ExactVectors.load(vectors_path, mmap=mmap)
+        store._deleted = set(np.load(os.path.join(path, _DELETED_FILE)).tolist())
+        return store
+
+    @staticmethod
+    def _read_manifest(path: str) -> Dict[str, Any]:
+        with open(os.path.join(path, _MANIFEST), "rb") as file:
+            return json.loads(file.read())
+
+    @staticmethod
+    def _current_version(directory: str) -> Optional[str]:
+        try:
+            with open(os.path.join(directory, _CURRENT), "rb") as file:
+                return file.read().decode("utf-8").strip()
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def _version_path(cls, directory: str) -> str:
+        version = cls._current_version(directory)
+        # Stores saved before versioning keep their files in `directory` itself
+        return os.path.join(directory, version) if version else directory
+
+    def _copy_index_to_memory(self) -> None:
+        """
+        Replace the memory-mapped index by an in-memory copy of itself, which
+        can be added to. Reopening the file instead could pick up a newer
+        version than the mapped chunk table.
+        """
+        if self.index_type.startswith("ivf"):
+            # Only the inverted lists are mapped: copy them into array lists
+            mapped = self.index.invlists
+            lists = faiss.ArrayInvertedLists(self.index.nlist, self.index.code_size)
+            for cell in range(self.index.nlist):
+                size = mapped.list_size(cell)
+                if size:
+                    lists.add_entries(cell, size, mapped.get_ids(cell), mapped.get_codes(cell))
+            self.index.replace_invlists(lists, True)
+            lists.this.disown()
+        else:
+            # Serializing reads the mapped codes into an index that owns them
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+        self._index_mapped = False
+
+    def _compact_invlists(self, deleted: np.ndarray) -> None:
+        """
+        Rebuild the inverted lists without the `deleted` ids (sorted), giving
+        every kept entry its row number among the kept rows. The trained
+        quantizer and the codes are reused as they are.
+        """
+        old = self.index.invlists
+        code_size = self.index.code_size
+        lists = faiss.ArrayInvertedLists(self.index.nlist, code_size)
+        for cell in range(self.index.nlist):
+            size = old.list_size(cell)
+            if not size:
+                continue
+            ids = faiss.rev_swig_ptr(old.get_ids(cell), size)
+            codes = faiss.rev_swig_ptr(old.get_codes(cell), size * code_size).reshape(size, code_size)
+            position = np.searchsorted(deleted, ids)
+            kept = (position == len(deleted)) | (deleted[np.minimum(position, len(deleted) - 1)] != ids)
+            if kept.any():
+                new_ids = np.ascontiguousarray(ids[kept] - position[kept])
+                new_codes = np.ascontiguousarray(codes[kept])
+                lists.add_entries(cell, len(new_ids), faiss.swig_ptr(new_ids), faiss.swig_ptr(new_codes))
+        self.index.replace_invlists(lists, True)
+        lists.this.disown()
+        self.index.ntotal = sum(lists.list_size(cell) for cell in range(self.index.nlist))
+
+    def _build_index(self, nlist: int, pq_bits: Optional[int] = None) -> faiss.Index:
+        pq_bits = pq_bits or self.pq_bits
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.vector_dim, self.hnsw_m)
+            index.hnsw.efConstruction = self.ef_construction
+            return index
+        if self.index_type == "sq8":
+            return faiss.IndexScalarQuantizer(self.vector_dim, faiss.ScalarQuantizer.QT_8bit)
+        if self.index_type == "pq":
+            return faiss.IndexPQ(self.vector_dim, self.pq_m, pq_bits)
+        if self.index_type.startswith("ivf"):
+            # The coarse quantizer must outlive the IVF index, which does not own it
+            self._quantizer = faiss.IndexFlatL2(self.vector_dim)
+            if self.index_type == "ivf_flat":
+                return faiss.IndexIVFFlat(self._quantizer, self.vector_dim, nlist)
+            if self.index_type == "ivf_sq8":
+                return faiss.IndexIVFScalarQuantizer(
+                    self._quantizer, self.vector_dim, nlist, faiss.ScalarQuantizer.QT_8bit,
+                )
+            return faiss.IndexIVFPQ(self._quantizer, self.vector_dim, nlist, self.pq_m, pq_bits)
+        return faiss.IndexFlatL2(self.vector_dim)
+
+    def _min_train_size(self, nlist: int) -> int:
+        # FAISS wants about 39 points per k-means centroid; the int8 ranges
+        # are estimated from as many points as a 256-centroid codebook
+        codebook = 2 ** self.pq_bits if self.index_type in ("pq", "ivf_pq") else 256
+        if self.index_type in ("sq8", "pq"):
+            return 39 * codebook
+        if self.index_type in ("ivf_pq", "ivf_sq8"):
+            return 39 * max(nlist, codebook)
+        return 39 * nlist
+
+    def _reset_selector(self) -> None:
+        self._selector = None
+        self._deleted_ids = None
+        self._search_params = None
+
+    def _get_deleted_ids(self) -> np.ndarray:
+        if self._deleted_ids is None:
+            self._deleted_ids = np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))
+        return self._deleted_ids
+
+    def _get_search_params(
+        self, nprobe: Optional[int] = None, ef_search: Optional[int] = None, **ignored: Any,
+    ) -> Optional[faiss.SearchParameters]:
+        # Parameters of other stores, such as pgvector's `probes`, are ignored
+        nprobe = nprobe or self.nprobe
+        ef_search = ef_search or self.ef_search
+        overridden = nprobe != self.nprobe or ef_search != self.ef_search
+        if self._search_params is not None and not overridden:
+            return self._search_params
+
+        if self._deleted and self._selector is None and self.index_type not in _NO_SELECTOR:
+            # Keep the selectors referenced: SearchParameters does not own them.
+            self._deleted_selector = faiss.IDSelectorBatch(self._get_deleted_ids())
+            self._selector = faiss.IDSelectorNot(self._deleted_selector)
+        kwargs = {"sel": self._selector} if self._selector is not None else {}
+
+        if self.index_type == "hnsw":
+            params = faiss.SearchParametersHNSW(efSearch=ef_search, **kwargs)
+        elif self.index_type.startswith("ivf"):
+            params = faiss.SearchParametersIVF(nprobe=nprobe, **kwargs)
+        elif kwargs:
+            params = faiss.SearchParameters(**kwargs)
+        else:
+            params = None
+
+        if not overridden:
+            self._search_params = params
+        return params
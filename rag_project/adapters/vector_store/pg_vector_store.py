@@ -1,52 +1,491 @@
 # File: rag_project/adapters/vector_store_adapter.py
 
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+import io
+import json
+import struct
+import numpy as np
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import bindparam, insert, text
+from rag_project.adapters.database.connection import session_scope
 from rag_project.core.ports.vector_store_port import VectorStorePort
 from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
 from rag_project.adapters.database.models import Embedding
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+INSERT_MODES = ("orm", "executemany", "copy")
+INDEX_TYPES = ("none", "hnsw", "ivfflat")
+QUANTIZATIONS = ("none", "halfvec", "binary")
+
+# Characters that must be escaped in PostgreSQL COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_text(value: str) -> str:
+    return value.translate(_COPY_ESCAPES)
+
+
+# COPY BINARY framing: signature, flags and header extension length, then the trailer
+_COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_BINARY_TRAILER = struct.pack("!h", -1)
+_COPY_FIELD_COUNT = struct.pack("!h", 5)
+_INT4_FIELD = struct.Struct("!ii")
+
+
+def _copy_binary(batch: ChunkBatch) -> bytes:
+    """
+    Encode a batch as PostgreSQL COPY BINARY rows of
+    (filename, chunk_id, content, embedding, doc_metadata).
+
+    pgvector's binary form of a vector is (int16 dim, int16 unused) followed by
+    big-endian float32 values, so the whole matrix is byte-swapped in one
+    vectorized step and every row is a slice of the result.
+    """
+    num_rows, dim = batch.embeddings.shape
+    vector_prefix = struct.pack("!ihh", 4 + 4 * dim, dim, 0)
+    vectors = batch.embeddings.astype(">f4", copy=False).tobytes()
+    row_bytes = 4 * dim
+
+    parts = [_COPY_BINARY_HEADER]
+    for row, chunk in enumerate(batch.chunks):
+        filename = chunk.filename.encode("utf-8")
+        content = chunk.content.encode("utf-8")
+        metadata = json.dumps(chunk.metadata).encode("utf-8")
+        parts.append(_COPY_FIELD_COUNT)
+        parts.append(struct.pack("!i", len(filename)))
+        parts.append(filename)
+        parts.append(_INT4_FIELD.pack(4, chunk.chunk_id))
+        parts.append(struct.pack("!i", len(content)))
+        parts.append(content)
+        parts.append(vector_prefix)
+        parts.append(vectors[row * row_bytes:(row + 1) * row_bytes])
+        parts.append(struct.pack("!i", len(metadata)))
+        parts.append(metadata)
+    parts.append(_COPY_BINARY_TRAILER)
+    return b"".join(parts)
+
+
+_QUERY_VECTOR = "CAST(:embedding AS vector)"
+
+
+def index_expression(vector_dim: int, quantization: str, vector: str = _QUERY_VECTOR) -> Tuple[str, str, str]:
+    """
+    The indexed expression for `quantization`, its operator class, and the
+    same expression applied to the query vector `vector`.
+    """
+    if quantization == "halfvec":
+        return (
+            f"embedding::halfvec({vector_dim})",
+            "halfvec_l2_ops",
+            f"{vector}::halfvec({vector_dim})",
+        )
+    if quantization == "binary":
+        return (
+            f"binary_quantize(embedding)::bit({vector_dim})",
+            "bit_hamming_ops",
+            f"binary_quantize({vector})::bit({vector_dim})",
+        )
+    return "embedding", "vector_l2_ops", vector
+
+
+def index_statement(
+    name: str,
+    index_type: str,
+    vector_dim: int,
+    quantization: str,
+    hnsw_m: int,
+    ef_construction: int,
+    ivf_lists: int,
+    concurrently: bool,
+) -> str:
+    """
+    CREATE INDEX statement for an "hnsw" or "ivfflat" index named `name`.
+    """
+    expression, operator_class, _ = index_expression(vector_dim, quantization)
+    if quantization != "none":
+        expression = f"({expression})"
+    if index_type == "hnsw":
+        options = f"m = {hnsw_m}, ef_construction = {ef_construction}"
+    else:
+        options = f"lists = {ivf_lists}"
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON embeddings USING {index_type} ({expression} {operator_class}) WITH ({options})"
+    )
+
+
+def query_statement(vector_dim: int, quantization: str, rescore_factor: int, vector: str = _QUERY_VECTOR) -> str:
+    """
+    Top-k query with `:embedding`, `:top_k` and, when re-scoring quantized
+    candidates, `:candidates` parameters. `vector` replaces the
+    `:embedding` parameter with another vector expression.
+    """
+    expression, _, query_expression = index_expression(vector_dim, quantization, vector)
+    operator = "<~>" if quantization == "binary" else "<->"
+    columns = "id, filename, chunk_id, content, doc_metadata"
+    exact_distance = f"embedding <-> {vector}"
+    if quantization == "none":
+        return f"""
+            SELECT {columns}, {exact_distance} AS distance
+            FROM embeddings
+            ORDER BY distance ASC
+            LIMIT :top_k
+        """
+    if rescore_factor > 0:
+        return f"""
+            SELECT {columns}, {exact_distance} AS distance
+            FROM (
+                SELECT {columns}, embedding
+                FROM embeddings
+                ORDER BY {expression} {operator} {query_expression}
+                LIMIT :candidates
+            ) AS candidates
+            ORDER BY distance ASC
+            LIMIT :top_k
+        """
+    return f"""
+        SELECT {columns}, {expression} {operator} {query_expression} AS distance
+        FROM embeddings
+        ORDER BY distance ASC
+        LIMIT :top_k
+    """
+
+
+def batch_query_statement(vector_dim: int, quantization: str, rescore_factor: int) -> str:
+    """
+    Top-k query for every vector of the `:embeddings` array in one statement:
+    the single-query statement runs once per element through a LATERAL join,
+    so each query can still use the ANN index. Rows come back grouped by the
+    0-based `query_index` of their query.
+    """
+    per_query = query_statement(vector_dim, quantization, rescore_factor, vector="queries.embedding")
+    return f"""
+        SELECT queries.position - 1 AS query_index, results.*
+        FROM unnest(CAST(:embeddings AS vector[])) WITH ORDINALITY AS queries (embedding, position)
+        CROSS JOIN LATERAL ({per_query}) AS results
+        ORDER BY query_index, results.distance
+    """
+
+
+def _vector_text(vector: np.ndarray) -> str:
+    return "[" + ",".join(map(str, vector.tolist())) + "]"
+
+
+def _batches(chunks: List[Chunk], batch_size: int) -> Iterator[List[Chunk]]:
+    for start in range(0, len(chunks), batch_size):
+        yield chunks[start:start + batch_size]
 
 
 class PgVectorStore(VectorStorePort):
     """
     Adapter for PostgreSQL with pgvector extension.
+
+    `insert_mode` selects how chunks are written:
+      - "orm": one `Embedding` object per chunk and a single commit.
+      - "executemany": multi-row INSERTs through SQLAlchemy Core, one commit per batch.
+      - "copy": PostgreSQL `COPY ... FROM STDIN`, one commit per batch.
+
+    In "copy" mode `insert_batch` uses COPY BINARY and reads the vectors
+    straight from the batch's float32 matrix.
+
+    `index_type` ("hnsw" or "ivfflat") selects the ANN index managed by
+    `create_index`, `rebuild_index` and `drop_index`, built with `hnsw_m` and
+    `ef_construction`, or `ivf_lists`. `quantization` indexes a compressed
+    expression of the column instead of the column itself: "halfvec"
+    (float16, half the size) or "binary" (one bit per dimension, Hamming
+    distance). Queries then rank by that expression, and with
+    `rescore_factor` > 0 re-rank `top_k * rescore_factor` candidates by exact
+    distance to the stored vectors.
+
+    Queries are one constant statement with the vector bound as a parameter;
+    `query_batch` sends all its vectors as one array in one statement.
+    `ef_search` (HNSW) and `probes` (IVFFlat) are set for the query's
+    transaction only, and can be overridden per call.
+
+    Every operation opens its own session from `session_factory` and closes
+    it when done, so the store can be shared by concurrent threads and
+    connections return to the pool between requests.
     """
-    def __init__(self, session: Session):
-        self.session = session
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        insert_mode: str = "orm",
+        batch_size: int = 1000,
+        vector_dim: int = 384,
+        index_type: str = "none",
+        quantization: str = "none",
+        hnsw_m: int = 16,
+        ef_construction: int = 64,
+        ivf_lists: int = 1000,
+        ef_search: int = 40,
+        probes: int = 10,
+        rescore_factor: int = 0,
+        maintenance_work_mem: Optional[str] = None,
+    ):
+        if insert_mode not in INSERT_MODES:
+            raise ValueError(f"Unknown insert mode '{insert_mode}', expected one of {INSERT_MODES}")
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATIONS}")
+        super().__init__()
+        self.session_factory = session_factory
+        self.insert_mode = insert_mode
+        self.batch_size = batch_size
+        self.vector_dim = vector_dim
+        self.index_type = index_type
+        self.quantization = quantization
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ivf_lists = ivf_lists
+        self.ef_search = ef_search
+        self.probes = probes
+        self.rescore_factor = rescore_factor if quantization != "none" else 0
+        self.maintenance_work_mem = maintenance_work_mem
+        self._query_sql = self._build_query_sql()
+        self._batch_query_sql = text(batch_query_statement(vector_dim, quantization, self.rescore_factor))
 
     def insert(self, chunks: List[Chunk]) -> None:
         for chunk in chunks:
-            embedding = chunk.embedding
-            if embedding is None:
+            if chunk.embedding is None:
                 raise ValueError("Chunk embedding cannot be None")
 
+        with session_scope(self.session_factory) as session:
+            if self.insert_mode == "executemany":
+                for batch in _batches(chunks, self.batch_size):
+                    self._insert_executemany(session, batch)
+                    session.commit()
+            elif self.insert_mode == "copy":
+                for batch in _batches(chunks, self.batch_size):
+                    self._insert_copy(session, batch)
+                    session.commit()
+            else:
+                self._insert_orm(session, chunks)
+        self._notify_write()
+
+    def insert_batch(self, batch: ChunkBatch) -> None:
+        if self.insert_mode != "copy":
+            super().insert_batch(batch)
+            return
+        with session_scope(self.session_factory) as session:
+            for start in range(0, len(batch), self.batch_size):
+                self._copy_expert(
+                    session,
+                    "COPY embeddings (filename, chunk_id, content, embedding, doc_metadata) "
+                    "FROM STDIN WITH (FORMAT binary)",
+                    io.BytesIO(_copy_binary(batch.slice(start, start + self.batch_size))),
+                )
+                session.commit()
+        self._notify_write()
+
+    def _insert_orm(self, session: Session, chunks: List[Chunk]) -> None:
+        for chunk in chunks:
             embedding_entry = Embedding(
                 filename=chunk.filename,
                 chunk_id=chunk.chunk_id,
                 content=chunk.content,
-                embedding=embedding,
+                embedding=chunk.embedding,
+                doc_metadata=chunk.metadata,
             )
-            self.session.add(embedding_entry)
-        self.session.commit()
+            session.add(embedding_entry)
 
-    def query(self, embedding: List[float], top_k: int) -> List[Dict]:
-        embedding_str = f"[{','.join(map(str, embedding))}]"
-        query = text(f"""
-            SELECT id, filename, chunk_id, content, doc_metadata, embedding <-> '{embedding_str}' AS distance
-            FROM embeddings
-            ORDER BY distance ASC
-            LIMIT :top_k
-        """)
-        result = self.session.execute(query, {'top_k': top_k}).fetchall()
-
-        return [
-            {
-                'id': row.id,
-                'filename': row.filename,
-                'chunk_id': row.chunk_id,
-                'content': row.content,
-                'metadata': row.doc_metadata
-            }
-            for row in result
-        ]
+    def _insert_executemany(self, session: Session, chunks: List[Chunk]) -> None:
+        session.execute(
+            insert(Embedding.__table__),
+            [
+                {
+                    "filename": chunk.filename,
+                    "chunk_id": chunk.chunk_id,
+                    "content": chunk.content,
+                    "embedding": chunk.embedding,
+                    "doc_metadata": chunk.metadata,
+                }
+                for chunk in chunks
+            ],
+        )
+
+    def _insert_copy(self, session: Session, chunks: List[Chunk]) -> None:
+        buffer = io.StringIO()
+        for chunk in chunks:
+            buffer.write(_copy_text(chunk.filename))
+            buffer.write("\t")
+            buffer.write(str(chunk.chunk_id))
+            buffer.write("\t")
+            buffer.write(_copy_text(chunk.content))
+            buffer.write("\t[")
+            buffer.write(",".join(map(str, chunk.embedding)))
+            buffer.write("]\t")
+            buffer.write(_copy_text(json.dumps(chunk.metadata)))
+            buffer.write("\n")
+        buffer.seek(0)
+        self._copy_expert(
+            session, "COPY embeddings (filename, chunk_id, content, embedding, doc_metadata) FROM STDIN", buffer,
+        )
+
+    def _copy_expert(self, session: Session, sql: str, buffer) -> None:
+        driver_connection = session.connection().connection.driver_connection
+        with driver_connection.cursor() as cursor:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def delete(self, filenames: List[str]) -> None:
+        if not filenames:
+            return
+        with session_scope(self.session_factory) as session:
+            session.query(Embedding).filter(
+                Embedding.filename.in_(filenames)
+            ).delete(synchronize_session=False)
+        self._notify_write()
+
+    def query(
+        self,
+        embedding: Union[Sequence[float], np.ndarray],
+        top_k: int,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        **search_params: Any,
+    ) -> List[Dict]:
+        candidates = top_k * self.rescore_factor if self.rescore_factor > 0 else top_k
+        with session_scope(self.session_factory) as session:
+            self._set_search_settings(session, candidates, ef_search, probes)
+            result = session.execute(
+                self._query_sql,
+                {"embedding": np.asarray(embedding, dtype=np.float32), "top_k": top_k, "candidates": candidates},
+            ).fetchall()
+
+        return [self._record(row) for row in result]
+
+    def query_batch(
+        self,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        top_k: int,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        **search_params: Any,
+    ) -> List[List[Dict]]:
+        """
+        Run every query in one statement and one round-trip, the vectors
+        bound as a single array and searched through a LATERAL join.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.vector_dim)
+        results: List[List[Dict]] = [[] for _ in range(len(embeddings))]
+        if not len(embeddings):
+            return results
+        candidates = top_k * self.rescore_factor if self.rescore_factor > 0 else top_k
+        with session_scope(self.session_factory) as session:
+            self._set_search_settings(session, candidates, ef_search, probes)
+            rows = session.execute(
+                self._batch_query_sql,
+                {
+                    "embeddings": [_vector_text(embedding) for embedding in embeddings],
+                    "top_k": top_k,
+                    "candidates": candidates,
+                },
+            ).fetchall()
+
+        for row in rows:
+            results[row.query_index].append(self._record(row))
+        return results
+
+    @staticmethod
+    def _record(row) -> Dict[str, Any]:
+        return {
+            'id': row.id,
+            'filename': row.filename,
+            'chunk_id': row.chunk_id,
+            'content': row.content,
+            'metadata': row.doc_metadata,
+            'distance': row.distance,
+        }
+
+    @property
+    def index_name(self) -> str:
+        suffix = "" if self.quantization == "none" else f"_{self.quantization}"
+        return f"embeddings_embedding_{self.index_type}{suffix}"
+
+    def create_index(self, concurrently: bool = False) -> None:
+        """
+        Create the configured ANN index unless it already exists. IVFFlat
+        computes its lists from the rows present, so build it after loading
+        data. With `concurrently`, writes are not blocked during the build.
+        """
+        if self.index_type == "none":
+            return
+        self._execute_ddl([self._index_ddl(self.index_name, concurrently)], autocommit=concurrently)
+
+    def rebuild_index(self) -> None:
+        """
+        Rebuild the ANN index with the current build parameters. The new index
+        is built concurrently under a staging name and then swapped in, so
+        queries and writes continue during the build.
+        """
+        if self.index_type == "none":
+            return
+        staging = f"{self.index_name}_rebuild"
+        self._execute_ddl(
+            [
+                f"DROP INDEX CONCURRENTLY IF EXISTS {staging}",
+                self._index_ddl(staging, concurrently=True),
+                f"DROP INDEX CONCURRENTLY IF EXISTS {self.index_name}",
+                f"ALTER INDEX {staging} RENAME TO {self.index_name}",
+            ],
+            autocommit=True,
+        )
+
+    def drop_index(self) -> None:
+        if self.index_type == "none":
+            return
+        self._execute_ddl([f"DROP INDEX IF EXISTS {self.index_name}"], autocommit=False)
+
+    def _index_ddl(self, name: str, concurrently: bool) -> str:
+        return index_statement(
+            name, self.index_type, self.vector_dim, self.quantization,
+            self.hnsw_m, self.ef_construction, self.ivf_lists, concurrently,
+        )
+
+    def _build_query_sql(self):
+        sql = query_statement(self.vector_dim, self.quantization, self.rescore_factor)
+        return text(sql).bindparams(bindparam("embedding", type_=VECTOR(self.vector_dim)))
+
+    def _set_search_settings(
+        self, session: Session, candidates: int, ef_search: Optional[int], probes: Optional[int],
+    ) -> None:
+        if self.index_type == "hnsw":
+            # HNSW returns at most ef_search rows
+            self._set_local(session, "hnsw.ef_search", max(ef_search or self.ef_search, candidates))
+        elif self.index_type == "ivfflat":
+            self._set_local(session, "ivfflat.probes", probes or self.probes)
+
+    @staticmethod
+    def _set_local(session: Session, name: str, value: int) -> None:
+        # SET LOCAL does not take parameters; set_config(..., true) is its bindable form
+        session.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": str(value)})
+
+    def _execute_ddl(self, statements: List[str], autocommit: bool) -> None:
+        """
+        Run index DDL on its own connection. CONCURRENTLY statements cannot
+        run inside a transaction block, so they use autocommit.
+        """
+        with self.session_factory() as session:
+            engine = session.get_bind()
+        with engine.connect() as connection:
+            if autocommit:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            if self.maintenance_work_mem:
+                connection.execute(
+                    text("SELECT set_config('maintenance_work_mem', :value, false)"),
+                    {"value": self.maintenance_work_mem},
+                )
+            try:
+                for statement in statements:
+                    connection.execute(text(statement))
+                connection.commit()
+            finally:
+                if self.maintenance_work_mem:
+                    # The connection goes back to the pool: do not leak the setting
+                    connection.execute(text("RESET maintenance_work_mem"))
+                    connection.commit()
@@ -12,6 +12,7 @@ class Chunk(BaseModel):
     content: str
     # embedding can be List[float] or None. If you want it always as List[float], remove Optional.
     embedding: Optional[List[float]] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
     @validator('chunk_id')
     def check_chunk_id(cls, v):
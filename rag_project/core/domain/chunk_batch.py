@@ -0,0 +1,57 @@
+# File: ./rag_project/core/domain/chunk_batch.py
+
+from typing import List
+import numpy as np
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from rag_project.core.domain.chunk import Chunk
+
+class ChunkBatch(BaseModel):
+    """
+    A batch of chunks with their embeddings held as one contiguous float32
+    matrix, row i belonging to chunks[i]. The chunks' own `embedding` fields
+    are left unset, so vectors are never boxed into Python floats.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    chunks: List[Chunk]
+    embeddings: np.ndarray
+
+    @field_validator('embeddings', mode='before')
+    def as_float32_matrix(cls, v):
+        # No copy when the array is already C-contiguous float32
+        v = np.ascontiguousarray(v, dtype=np.float32)
+        if v.ndim != 2:
+            raise ValueError("embeddings must be a 2-D matrix")
+        return v
+
+    @model_validator(mode='after')
+    def check_rows(self):
+        if len(self.chunks) != self.embeddings.shape[0]:
+            raise ValueError("embeddings must have one row per chunk")
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Chunk]) -> "ChunkBatch":
+        """
+        Build a batch from chunks that carry list embeddings.
+        """
+        if not chunks:
+            return cls(chunks=[], embeddings=np.empty((0, 0), dtype=np.float32))
+        return cls(chunks=chunks, embeddings=np.array([chunk.embedding for chunk in chunks], dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def slice(self, start: int, stop: int) -> "ChunkBatch":
+        """
+        Sub-batch of rows [start, stop); the embeddings are a view, not a copy.
+        """
+        return ChunkBatch.model_construct(chunks=self.chunks[start:stop], embeddings=self.embeddings[start:stop])
+
+    def to_chunks(self) -> List[Chunk]:
+        """
+        Copy the rows into the chunks' list embeddings, for consumers that need them.
+        """
+        for chunk, row in zip(self.chunks, self.embeddings):
+            chunk.embedding = row.tolist()
+        return self.chunks
@@ -0,0 +1,31 @@
+# File: ./rag_project/core/domain/sync_plan.py
+
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+class SyncPlan(BaseModel):
+    """
+    Difference between the files of a raw directory and the ingestion manifest.
+
+    Paths are relative to the raw directory.
+    """
+    new: List[str] = Field(default_factory=list)
+    changed: List[str] = Field(default_factory=list)
+    deleted: List[str] = Field(default_factory=list)
+    unchanged: List[str] = Field(default_factory=list)
+    hashes: Dict[str, str] = Field(default_factory=dict)
+
+    def to_ingest(self) -> List[str]:
+        """
+        Files whose chunks must be (re-)embedded and inserted.
+        """
+        return self.new + self.changed
+
+    def stale(self) -> List[str]:
+        """
+        Files whose existing chunks must be removed from the vector store.
+
+        New files are included so that chunks left behind by an interrupted
+        run are not duplicated.
+        """
+        return self.new + self.changed + self.deleted
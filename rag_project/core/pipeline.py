@@ -1,27 +1,20 @@
 # rag_project/core/pipeline.py
 
+from functools import cached_property
 from typing import Any
 import yaml
-
-from rag_project.adapters.loader.notebook_adapter import NotebookLoader
-from rag_project.adapters.loader.text_loader import TextLoader
-from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
-from rag_project.adapters.chunker.basic_chunker import BasicChunker
-from rag_project.adapters.metadata.metadata_pg import MetadataPG
-from rag_project.adapters.saver.file_saver import FileSaver
-from rag_project.adapters.llm.ollama_llm_adapter import OllamaLLMAdapter
-from rag_project.core.services.data_service import DataService
-from rag_project.core.services.embedding_service import EmbeddingService
-from rag_project.core.services.retrieval_service import RetrievalService
-from rag_project.core.services.query_service import QueryService
-from rag_project.adapters.vector_store.pg_vector_store import PgVectorStore
-from rag_project.adapters.database.connection import SessionLocal
 import os
 
 
 class PipelineSingleton:
     """
     Singleton for centralizing pipeline initialization and sharing across code and tests.
+
+    Only the configuration is read up front. Every component is built on
+    first access, and the adapter modules are imported at that point, so an
+    ingestion-only process never loads the LLM client and a retrieval-only
+    process never imports the loaders. The vector store and metadata backends
+    are chosen by `vector_store.type` and `metadata.type` in settings.yaml.
     """
     _instance = None
 
@@ -35,34 +28,250 @@ class PipelineSingleton:
 
             cls.raw_dir = config['pipeline']['data']['raw_directory']
             cls.processed_dir = config['pipeline']['data']['processed_directory']
+            cls.saver_type = config['pipeline']['saver']['type']
+            cls.max_shard_mb = config['pipeline']['saver']['max_shard_mb']
+            cls.cleaner_preset = config['pipeline']['cleaner']['preset']
+            cls.cleaner_workers = config['pipeline']['cleaner']['num_workers']
+            cls.cleaner_segment_mb = config['pipeline']['cleaner']['segment_mb']
+            cls.chunker_type = config['pipeline']['chunker']['type']
             cls.chunk_size = config['pipeline']['chunker']['chunk_size']
             cls.overlap = config['pipeline']['chunker']['overlap']
+            cls.max_tokens = config['pipeline']['chunker']['max_tokens']
+            cls.overlap_tokens = config['pipeline']['chunker']['overlap_tokens']
+            cls.num_workers = config['pipeline']['ingestion']['num_workers']
+            cls.streaming = config['pipeline']['ingestion']['streaming']
+            cls.batch_size = config['pipeline']['ingestion']['batch_size']
+            cls.incremental = config['pipeline']['ingestion']['incremental']
+            cls.metadata_batch_size = config['pipeline']['ingestion']['metadata_batch_size']
+            cls.include = config['pipeline']['ingestion']['include']
+            cls.exclude = config['pipeline']['ingestion']['exclude']
+            cls.max_file_size_mb = config['pipeline']['ingestion']['max_file_size_mb']
+            cls.recursive = config['pipeline']['ingestion']['recursive']
+            cls.pdf_workers = config['pipeline']['ingestion']['pdf_workers']
+            cls.embedding_model = config['pipeline']['embedding']['model_name']
+            cls.embedding_cache = config['pipeline']['embedding']['cache']
+            cls.embedding_cache_path = config['pipeline']['embedding']['cache_path']
+            cls.embedding_cache_mb = config['pipeline']['embedding']['cache_max_mb']
+            cls.embedding_backend = config['pipeline']['embedding']['backend']
+            cls.onnx_quantize = config['pipeline']['embedding']['onnx_quantize']
+            cls.onnx_cache_dir = config['pipeline']['embedding']['onnx_cache_dir']
+            cls.embedding_engine = config['pipeline']['embedding']['engine']
+            cls.embedding_workers = config['pipeline']['embedding']['num_workers']
+            cls.tokens_per_batch = config['pipeline']['embedding']['tokens_per_batch']
+            cls.max_batch_size = config['pipeline']['embedding']['max_batch_size']
             cls.vector_dim = config['pipeline']['vector_store']['vector_dim']
+            cls.insert_mode = config['pipeline']['vector_store']['insert_mode']
+            cls.insert_batch_size = config['pipeline']['vector_store']['insert_batch_size']
+            cls.insert_concurrency = config['pipeline']['vector_store']['insert_concurrency']
+            cls.vector_store_type = config['pipeline']['vector_store']['type'].lower()
+            cls.faiss_options = config['pipeline']['vector_store']['faiss']
+            cls.faiss_directory = config['pipeline']['vector_store']['faiss_directory']
+            cls.faiss_mmap = config['pipeline']['vector_store']['faiss_mmap']
+            cls.search_params = config['pipeline']['vector_store']['search']
+            cls.pgvector_options = config['pipeline']['vector_store']['pgvector']
+            database = dict(config['pipeline']['database'])
+            cls.use_asyncpg = database.pop('asyncpg')
+            cls.asyncpg_pool_options = database.pop('asyncpg_pool')
+            cls.pool_options = database
+            cls.metadata_type = config['pipeline']['metadata']['type'].lower()
+            cls.metadata_sqlite_path = config['pipeline']['metadata']['sqlite_path']
+            cls.llm_model = config['pipeline']['llm']['model_name']
             cls.query_text = config['pipeline']['query']['text']
             cls.top_k = config['pipeline']['query']['top_k']
+            cls.query_cache_size = config['pipeline']['query']['embedding_cache_size']
+            cls.result_cache_size = config['pipeline']['query']['result_cache_size']
+            cls.result_ttl_seconds = config['pipeline']['query']['result_ttl_seconds']
+            cls.query_batch_size = config['pipeline']['query']['batch_size']
+            cls.query_batch_delay_ms = config['pipeline']['query']['batch_delay_ms']
 
+        return cls._instance
 
-            session = SessionLocal()
-            metadata_repo = MetadataPG(session=session)
+    @cached_property
+    def session_factory(self):
+        from rag_project.adapters.database.connection import get_session_factory
+        return get_session_factory(**self.pool_options)
 
-            # Initialize pipeline components
-            cls.plugins = [TextLoader(), NotebookLoader()]
-            cls.cleaner = SimpleCleaner()
-            cls.chunker = BasicChunker(chunk_size=cls.chunk_size, overlap=cls.overlap)
-            cls.saver = FileSaver(output_dir=cls.processed_dir)
-            cls.data_service = DataService(cls.plugins, cls.cleaner, cls.chunker, cls.saver, metadata_repo)
+    @cached_property
+    def async_pool(self):
+        from rag_project.adapters.database.async_connection import AsyncPgPool
+        return AsyncPgPool(**self.asyncpg_pool_options)
 
-            cls.embedding_service = EmbeddingService(model_name="all-MiniLM-L6-v2")
+    @cached_property
+    def metadata_repo(self):
+        if self.metadata_type == "sqlite":
+            from rag_project.adapters.metadata.metadata_sqlite import MetadataSQLite
+            return MetadataSQLite(db_path=self.metadata_sqlite_path)
+        if self.use_asyncpg:
+            from rag_project.adapters.metadata.metadata_asyncpg import MetadataAsyncPG
+            return MetadataAsyncPG(pool=self.async_pool)
+        from rag_project.adapters.metadata.metadata_pg import MetadataPG
+        return MetadataPG(session_factory=self.session_factory)
 
-            # Choose the vector store based on configuration
-            # cls.vector_store = FaissVectorStore(vector_dim=384)
-            cls.vector_store = PgVectorStore(session=SessionLocal())  # Uncomment for PgVectorStore
+    @cached_property
+    def plugins(self):
+        from rag_project.adapters.loader.html_json_adapter import HtmlLoader, JsonLoader
+        from rag_project.adapters.loader.markdown_adapter import MarkdownLoader
+        from rag_project.adapters.loader.notebook_adapter import NotebookLoader
+        from rag_project.adapters.loader.pdf_adapter import PdfLoader
+        from rag_project.adapters.loader.text_loader import TextLoader
+        return [TextLoader(), NotebookLoader(), MarkdownLoader(), HtmlLoader(), JsonLoader(),
+                PdfLoader(num_workers=self.pdf_workers)]
 
-            cls.retrieval_service = RetrievalService(cls.vector_store, cls.embedding_service)
-            cls.llm_adapter = OllamaLLMAdapter(model_name="mistral")
-            cls.query_service = QueryService(cls.llm_adapter)
+    @cached_property
+    def registry(self):
+        from rag_project.core.services.loader_registry import LoaderRegistry
+        return LoaderRegistry(
+            self.plugins,
+            include=self.include,
+            exclude=self.exclude,
+            max_file_size=self.max_file_size_mb * 1024 * 1024 if self.max_file_size_mb else None,
+            recursive=self.recursive,
+        )
 
-        return cls._instance
+    @cached_property
+    def cleaner(self):
+        from rag_project.adapters.cleaner.rule_cleaner import RuleCleaner
+        return RuleCleaner.from_preset(
+            self.cleaner_preset,
+            num_workers=self.cleaner_workers,
+            segment_size=self.cleaner_segment_mb * 1024 * 1024,
+        )
+
+    @cached_property
+    def chunker(self):
+        if self.chunker_type == "sentence":
+            from rag_project.adapters.chunker.sentence_chunker import SentenceChunker
+            return SentenceChunker(
+                model_name="sentence-transformers/all-MiniLM-L6-v2",
+                max_tokens=self.max_tokens,
+                overlap_tokens=self.overlap_tokens,
+            )
+        from rag_project.adapters.chunker.basic_chunker import BasicChunker
+        return BasicChunker(chunk_size=self.chunk_size, overlap=self.overlap)
+
+    @cached_property
+    def saver(self):
+        if self.saver_type == "packed":
+            from rag_project.adapters.saver.packed_saver import PackedChunkSaver
+            return PackedChunkSaver(
+                output_dir=self.processed_dir,
+                max_shard_bytes=self.max_shard_mb * 1024 * 1024,
+            )
+        from rag_project.adapters.saver.file_saver import FileSaver
+        return FileSaver(output_dir=self.processed_dir)
+
+    @cached_property
+    def data_service(self):
+        from rag_project.core.services.data_service import DataService
+        return DataService(
+            self.plugins, self.cleaner, self.chunker, self.saver, self.metadata_repo,
+            num_workers=self.num_workers,
+            metadata_batch_size=self.metadata_batch_size,
+            registry=self.registry,
+        )
+
+    @cached_property
+    def embedding_service(self):
+        from rag_project.core.services.embedding_service import EmbeddingService
+
+        embedding_cache = None
+        if self.embedding_cache:
+            from rag_project.adapters.cache.sqlite_embedding_cache import SqliteEmbeddingCache
+            embedding_cache = SqliteEmbeddingCache(
+                db_path=self.embedding_cache_path,
+                max_bytes=self.embedding_cache_mb * 1024 * 1024,
+            )
+        if self.embedding_backend == "onnx":
+            from rag_project.adapters.embedding.onnx_backend import OnnxEmbeddingBackend
+            backend = OnnxEmbeddingBackend(
+                model_name=self.embedding_model,
+                cache_dir=self.onnx_cache_dir,
+                quantize=self.onnx_quantize,
+            )
+        else:
+            from rag_project.adapters.embedding.sentence_transformer_backend import SentenceTransformerBackend
+            backend = SentenceTransformerBackend(model_name=self.embedding_model)
+        return EmbeddingService(
+            model_name=self.embedding_model,
+            cache=embedding_cache,
+            backend=backend,
+            engine=self.embedding_engine,
+            num_workers=self.embedding_workers,
+            tokens_per_batch=self.tokens_per_batch,
+            max_batch_size=self.max_batch_size,
+            query_batch_size=self.query_batch_size,
+            query_batch_delay_ms=self.query_batch_delay_ms,
+        )
+
+    @cached_property
+    def vector_store(self):
+        if self.vector_store_type == "faiss":
+            from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+            if self.faiss_directory and FaissVectorStore.is_saved(self.faiss_directory):
+                saved = FaissVectorStore.saved_settings(self.faiss_directory)
+                changed = sorted(key for key, value in self.faiss_options.items() if saved.get(key) != value)
+                if changed:
+                    # The saved index was built with its own settings and cannot be rebuilt without the vectors
+                    print(f"⚠️ vector_store.faiss {', '.join(changed)} differ from the store saved in "
+                          f"{self.faiss_directory}; using the saved settings. Delete the directory and "
+                          f"re-ingest to apply the new ones.")
+                return FaissVectorStore.load(
+                    self.faiss_directory,
+                    mmap=self.faiss_mmap,
+                    nprobe=self.search_params['nprobe'],
+                    ef_search=self.search_params['ef_search'],
+                )
+            return FaissVectorStore(
+                vector_dim=self.vector_dim,
+                nprobe=self.search_params['nprobe'],
+                ef_search=self.search_params['ef_search'],
+                **self.faiss_options,
+            )
+        if self.vector_store_type == "pgvector" and self.use_asyncpg:
+            from rag_project.adapters.vector_store.asyncpg_vector_store import AsyncPgVectorStore
+            return AsyncPgVectorStore(
+                pool=self.async_pool,
+                batch_size=self.insert_batch_size,
+                insert_concurrency=self.insert_concurrency,
+                vector_dim=self.vector_dim,
+                ef_search=self.search_params['ef_search'],
+                probes=self.search_params['probes'],
+                **self.pgvector_options,
+            )
+        if self.vector_store_type == "pgvector":
+            from rag_project.adapters.vector_store.pg_vector_store import PgVectorStore
+            return PgVectorStore(
+                session_factory=self.session_factory,
+                insert_mode=self.insert_mode,
+                batch_size=self.insert_batch_size,
+                vector_dim=self.vector_dim,
+                ef_search=self.search_params['ef_search'],
+                probes=self.search_params['probes'],
+                **self.pgvector_options,
+            )
+        raise ValueError(f"Unknown vector store type '{self.vector_store_type}', expected 'pgvector' or 'faiss'")
+
+    @cached_property
+    def retrieval_service(self):
+        from rag_project.core.services.retrieval_service import RetrievalService
+        return RetrievalService(
+            self.vector_store,
+            self.embedding_service,
+            query_cache_size=self.query_cache_size,
+            result_cache_size=self.result_cache_size,
+            result_ttl_seconds=self.result_ttl_seconds,
+            search_params=self.search_params,
+        )
+
+    @cached_property
+    def llm_adapter(self):
+        from rag_project.adapters.llm.ollama_llm_adapter import OllamaLLMAdapter
+        return OllamaLLMAdapter(model_name=self.llm_model)
+
+    @cached_property
+    def query_service(self):
+        from rag_project.core.services.query_service import QueryService
+        return QueryService(self.llm_adapter)
 
     @staticmethod
     def _load_config(config_path: str) -> Any:
@@ -73,12 +282,78 @@ class PipelineSingleton:
         """
         Run the ingestion pipeline: process files, generate embeddings, and store data.
         """
+        if self.incremental:
+            return self.run_incremental_ingestion()
+        if self.streaming:
+            return self.run_streaming_ingestion()
+
         print("🚀 Starting ingestion workflow...")
         documents = self.data_service.process_files(self.raw_dir)
         chunks = self.embedding_service.generate_embeddings(documents)
         self.vector_store.insert(chunks)
+        self._finish_vector_store_writes()
         print("✅ Data ingestion completed successfully!")
 
+    def run_streaming_ingestion(self):
+        """
+        Run the ingestion pipeline in fixed-size batches: each batch of chunks is
+        embedded and inserted before the next one is produced, so memory stays
+        flat with corpus size and a crash loses at most one batch.
+        """
+        print(f"🚀 Starting streaming ingestion workflow (batch size {self.batch_size})...")
+        total = 0
+        for batch in self.data_service.iter_chunk_batches(self.raw_dir, self.batch_size):
+            self.vector_store.insert_batch(self.embedding_service.embed_batch(batch))
+            total += len(batch)
+            print(f"   Inserted {total} chunks")
+        self._finish_vector_store_writes()
+        self._report_embedding_cache()
+        print("✅ Data ingestion completed successfully!")
+
+    def run_incremental_ingestion(self):
+        """
+        Re-sync the vector store with the raw directory: only new and changed
+        files are embedded, and the chunks, saved copies and metadata records
+        of changed or deleted files are removed first.
+        The manifest is updated last, so an interrupted run is redone next time.
+        """
+        print("🚀 Starting incremental ingestion workflow...")
+        plan = self.data_service.plan_sync(self.raw_dir)
+        print(f"   new: {len(plan.new)}, changed: {len(plan.changed)}, "
+              f"deleted: {len(plan.deleted)}, unchanged: {len(plan.unchanged)}")
+
+        stale = plan.stale()
+        if stale:
+            self.vector_store.delete(stale)
+            self.data_service.remove_files(stale)
+
+        to_ingest = plan.to_ingest()
+        if to_ingest:
+            for batch in self.data_service.iter_chunk_batches(self.raw_dir, self.batch_size, files=to_ingest):
+                self.vector_store.insert_batch(self.embedding_service.embed_batch(batch))
+
+        self._finish_vector_store_writes()
+        self.data_service.commit_sync(plan)
+        self._report_embedding_cache()
+        print("✅ Incremental ingestion completed successfully!")
+
+    def _finish_vector_store_writes(self):
+        # PgVector persists on insert but builds its ANN index once data is
+        # there; FAISS is written out once per run
+        if self.vector_store_type == "faiss" and self.faiss_directory:
+            self.vector_store.save(self.faiss_directory)
+            print(f"   Saved FAISS index to {self.faiss_directory}")
+        elif self.vector_store_type == "pgvector" and self.vector_store.index_type != "none":
+            self.vector_store.create_index()
+            print(f"   Vector index {self.vector_store.index_name} is in place")
+
+    def _report_embedding_cache(self):
+        if self.embedding_service.cache is None:
+            return
+        stats = self.embedding_service.cache_stats()
+        print(f"   Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%}), ~{stats['time_saved_seconds']:.1f}s saved")
+
     def run_retrieval(self):
         """
         Run the retrieval pipeline: query embeddings and return results.
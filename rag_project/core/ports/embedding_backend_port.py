@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from typing import List
+import numpy as np
+
+
+class EmbeddingBackendPort(ABC):
+    """
+    Interface for the inference backend that turns texts into embeddings.
+
+    Backends must be picklable before their model is loaded, so that worker
+    processes can build their own copy.
+    """
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """
+        Identifies the model and the numerics of the backend. Embeddings are
+        cached under this name, so backends whose outputs differ must not share it.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """
+        Size of the embedding vectors.
+        """
+        pass
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Encode texts into embeddings.
+
+        Args:
+            texts (List[str]): Texts to encode.
+            batch_size (int): Texts per forward pass.
+            show_progress_bar (bool): Display the encoding progress bar.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text.
+        """
+        pass
+
+    @abstractmethod
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """
+        Number of tokens of every text, including special tokens and
+        truncated to the model's maximum sequence length.
+        """
+        pass
+
+    def set_num_threads(self, num_threads: int) -> None:
+        """
+        Limit the threads used for inference, e.g. when several processes share the CPU.
+        """
+        pass
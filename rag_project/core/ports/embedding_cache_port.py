@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+import numpy as np
+
+
+class EmbeddingCachePort(ABC):
+    """
+    Interface for caching embeddings by model and content hash.
+    """
+    @abstractmethod
+    def get_many(self, model_name: str, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            model_name (str): The model that produced the embeddings.
+            keys (List[bytes]): Content hashes of the texts.
+
+        Returns:
+            Dict[bytes, np.ndarray]: The float32 vectors of the keys found in the cache.
+        """
+        pass
+
+    @abstractmethod
+    def put_many(self, model_name: str, entries: Dict[bytes, np.ndarray]) -> None:
+        """
+        Store embeddings, evicting the least recently used ones if the cache is full.
+
+        Args:
+            model_name (str): The model that produced the embeddings.
+            entries (Dict[bytes, np.ndarray]): Content hashes mapped to their vectors.
+        """
+        pass
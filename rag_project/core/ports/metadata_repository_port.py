@@ -1,10 +1,14 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List
 
 
 class MetadataRepositoryPort(ABC):
     """
     Interface for metadata repository.
+
+    The `a*` methods are asyncio forms of the operations that default to
+    running the synchronous method in a worker thread.
     """
 
     @abstractmethod
@@ -19,9 +23,81 @@ class MetadataRepositoryPort(ABC):
         """
         pass
 
+    @abstractmethod
+    def insert_metadata_batch(self, entries: List[Dict[str, str]]):
+        """
+        Insert several metadata records in a single transaction.
+
+        Args:
+            entries (List[Dict[str, str]]): Records with `filename`, `source`
+                and `ingestion_timestamp` keys.
+        """
+        pass
+
     @abstractmethod
     def fetch_metadata(self):
         """
         Retrieve all metadata from storage.
         """
         pass
+
+    @abstractmethod
+    def delete_metadata(self, filenames: List[str]):
+        """
+        Remove every metadata record of the given files.
+
+        Args:
+            filenames (List[str]): Document filenames to forget.
+        """
+        pass
+
+    @abstractmethod
+    def fetch_manifest(self) -> Dict[str, str]:
+        """
+        Retrieve the ingestion manifest.
+
+        Returns:
+            Dict[str, str]: Mapping of file path to content hash.
+        """
+        pass
+
+    @abstractmethod
+    def update_manifest(self, entries: Dict[str, str]):
+        """
+        Insert or update manifest entries.
+
+        Args:
+            entries (Dict[str, str]): Mapping of file path to content hash.
+        """
+        pass
+
+    @abstractmethod
+    def delete_manifest(self, filepaths: List[str]):
+        """
+        Remove manifest entries.
+
+        Args:
+            filepaths (List[str]): File paths to forget.
+        """
+        pass
+
+    async def ainsert_metadata(self, filename: str, source: str, ingestion_timestamp: str):
+        await asyncio.to_thread(self.insert_metadata, filename, source, ingestion_timestamp)
+
+    async def ainsert_metadata_batch(self, entries: List[Dict[str, str]]):
+        await asyncio.to_thread(self.insert_metadata_batch, entries)
+
+    async def afetch_metadata(self):
+        return await asyncio.to_thread(self.fetch_metadata)
+
+    async def adelete_metadata(self, filenames: List[str]):
+        await asyncio.to_thread(self.delete_metadata, filenames)
+
+    async def afetch_manifest(self) -> Dict[str, str]:
+        return await asyncio.to_thread(self.fetch_manifest)
+
+    async def aupdate_manifest(self, entries: Dict[str, str]):
+        await asyncio.to_thread(self.update_manifest, entries)
+
+    async def adelete_manifest(self, filepaths: List[str]):
+        await asyncio.to_thread(self.delete_manifest, filepaths)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Tuple
 from rag_project.core.domain.document import Document
 
 
@@ -7,6 +7,10 @@ class Plugin(ABC):
     """
     Base class for all plugins.
     """
+    # Lower-case file extensions (with the dot) handled by the plugin, used by
+    # the loader registry for direct lookup. Leave empty to rely on `supports`.
+    extensions: Tuple[str, ...] = ()
+
     @abstractmethod
     def supports(self, filename: str) -> bool:
         """
@@ -32,3 +36,17 @@ class Plugin(ABC):
             Document: Processed document object.
         """
         pass
+
+    def load_parts(self, filepath: str) -> Iterator[Document]:
+        """
+        Load a file as a sequence of consecutive parts, such as the pages of a
+        PDF, so that large files can be cleaned and chunked piece by piece.
+        Metadata of each part is copied onto the chunks built from it.
+
+        Args:
+            filepath (str): Path to the file.
+
+        Yields:
+            Document: The parts of the document, in order.
+        """
+        yield self.load(filepath)
@@ -15,3 +15,13 @@ class SaverPort(ABC):
             chunks (List[Chunk]): List of chunks to be saved.
         """
         pass
+
+    @abstractmethod
+    def delete_chunks(self, filenames: List[str]) -> None:
+        """
+        Remove every saved chunk of the given files.
+
+        Args:
+            filenames (List[str]): Document filenames whose chunks are removed.
+        """
+        pass
@@ -1,14 +1,111 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Sequence, Union
+import numpy as np
 
 from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
 
 
 class VectorStorePort(ABC):
+    """
+    Interface for vector stores.
+
+    Adapters call `_notify_write` after every insert or delete so that
+    listeners, such as retrieval result caches, can drop stale state. Each
+    write also bumps `write_generation`, so a reader can tell whether the
+    store changed while it was searching.
+
+    The `a*` methods are the asyncio forms of the operations. By default they
+    run the synchronous method in a worker thread; adapters backed by an
+    asyncio driver override them, and serve the synchronous methods from it.
+    """
+    def __init__(self):
+        self.write_generation = 0
+        self._write_listeners: List[Callable[[], None]] = []
+
     @abstractmethod
     def insert(self, chunks: List[Chunk]) -> None:
         pass
 
     @abstractmethod
-    def query(self, embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
+    def query(self, embedding: Union[Sequence[float], np.ndarray], top_k: int, **search_params: Any) -> List[Dict[str, Any]]:
+        """
+        Return the records of the `top_k` chunks nearest to `embedding`.
+
+        Args:
+            embedding (Union[Sequence[float], np.ndarray]): The query vector.
+            top_k (int): Number of results.
+            **search_params: Index-specific search settings for this call,
+                such as `nprobe` or `ef_search`. Stores ignore those that do
+                not apply to them.
+        """
+        pass
+
+    def query_batch(
+        self, embeddings: Union[Sequence[Sequence[float]], np.ndarray], top_k: int, **search_params: Any
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Return the records of the `top_k` chunks nearest to each row of `embeddings`.
+
+        The default calls `query` once per row; adapters override it to search
+        all rows in one index call or database round-trip.
+
+        Args:
+            embeddings (Union[Sequence[Sequence[float]], np.ndarray]): One query
+                vector per row.
+            top_k (int): Number of results per query.
+            **search_params: As for `query`.
+
+        Returns:
+            List[List[Dict[str, Any]]]: One result list per query, in query
+                order. Records carry a `distance` (smaller is nearer) in the
+                store's own metric.
+        """
+        return [self.query(embedding, top_k, **search_params) for embedding in embeddings]
+
+    def insert_batch(self, batch: ChunkBatch) -> None:
+        """
+        Insert chunks whose embeddings are held in a float32 matrix.
+
+        The default copies the rows into the chunks' list embeddings and calls
+        `insert`; adapters override it to consume the matrix directly.
+        """
+        self.insert(batch.to_chunks())
+
+    @abstractmethod
+    def delete(self, filenames: List[str]) -> None:
+        """
+        Remove every chunk belonging to the given files.
+        """
         pass
+
+    async def ainsert(self, chunks: List[Chunk]) -> None:
+        await asyncio.to_thread(self.insert, chunks)
+
+    async def ainsert_batch(self, batch: ChunkBatch) -> None:
+        await asyncio.to_thread(self.insert_batch, batch)
+
+    async def aquery(
+        self, embedding: Union[Sequence[float], np.ndarray], top_k: int, **search_params: Any
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.query, embedding, top_k, **search_params)
+
+    async def aquery_batch(
+        self, embeddings: Union[Sequence[Sequence[float]], np.ndarray], top_k: int, **search_params: Any
+    ) -> List[List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.query_batch, embeddings, top_k, **search_params)
+
+    async def adelete(self, filenames: List[str]) -> None:
+        await asyncio.to_thread(self.delete, filenames)
+
+    def add_write_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback invoked after each write to the store.
+        """
+        self._write_listeners.append(listener)
+
+    def _notify_write(self) -> None:
+        self.write_generation += 1
+        for listener in self._write_listeners:
+            listener()
@@ -0,0 +1,95 @@
+# File: rag_project/core/services/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe mapping bounded to `max_size` entries; the least recently
+    used entry is dropped first. Hits and misses are counted.
+    """
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TTLCache(LRUCache):
+    """
+    LRU cache whose entries also expire `ttl_seconds` after they were stored.
+    """
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        super().__init__(max_size)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry: Optional[Tuple[float, Any]] = super().get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if self.clock() >= expires_at:
+            with self._lock:
+                # Count the lookup as a miss and drop the stale entry
+                self.hits -= 1
+                self.misses += 1
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return default
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        super().put(key, (self.clock() + self.ttl_seconds, value))
+
+    def invalidate(self) -> None:
+        """
+        Drop every entry, e.g. because the data the values were computed from changed.
+        """
+        self.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        stats = super().stats()
+        stats["invalidations"] = self.invalidations
+        return stats
@@ -1,14 +1,96 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import Callable, Collection, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.sync_plan import SyncPlan
 from rag_project.core.ports.chunker_port import ChunkerPort
 from rag_project.core.ports.cleaner_port import CleanerPort
 from rag_project.core.ports.plugin_port import Plugin
 from rag_project.core.ports.saver_port import SaverPort
 from rag_project.core.ports.metadata_repository_port import MetadataRepositoryPort
+from rag_project.core.services.loader_registry import LoaderRegistry
+import hashlib
 import os
 
 
+# Per-process pipeline components, set once by _init_worker so they are not
+# pickled again for every file submitted to the pool.
+_worker_cleaner: Optional[CleanerPort] = None
+_worker_chunker: Optional[ChunkerPort] = None
+
+# Chunk metadata holding character offsets into the chunked text
+_OFFSET_KEYS = ("start_offset", "end_offset")
+
+
+def _init_worker(cleaner: CleanerPort, chunker: ChunkerPort) -> None:
+    global _worker_cleaner, _worker_chunker
+    _worker_cleaner = cleaner
+    _worker_chunker = chunker
+
+
+def _load_clean_chunk(
+    plugin: Plugin, cleaner: CleanerPort, chunker: ChunkerPort, filepath: str, relpath: str
+) -> Tuple[str, List[Chunk]]:
+    """
+    Load a single file, clean its content and split it into chunks. The
+    document is named after its path relative to the ingested directory, so
+    files with the same name in different subdirectories stay distinct.
+
+    Files that the plugin loads in parts (e.g. PDF pages) are cleaned and
+    chunked one part at a time. Chunk ids stay consecutive across parts and
+    each chunk carries the metadata of its part. Character offsets set by
+    the chunker are shifted by the length of the preceding parts, so they
+    index the concatenation of the document's cleaned parts rather than
+    restarting at 0 in every part.
+
+    Returns:
+        Tuple[str, List[Chunk]]: The document filename and its chunks.
+    """
+    chunks: List[Chunk] = []
+    part_start = 0
+    for part in plugin.load_parts(filepath):
+        part.filename = relpath
+        part.content = cleaner.clean(part.content)
+        for chunk in chunker.chunk(part):
+            chunk.chunk_id = len(chunks)
+            chunk.metadata = {**part.metadata, **chunk.metadata}
+            if part_start:
+                for key in _OFFSET_KEYS:
+                    if key in chunk.metadata:
+                        chunk.metadata[key] += part_start
+            chunks.append(chunk)
+        part_start += len(part.content)
+    return relpath, chunks
+
+
+def _ordered_imap(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like `executor.map`, but keeps at most `window` tasks in flight so that
+    results are never buffered faster than the caller consumes them.
+    """
+    pending: Deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _hash_file(filepath: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _worker_load_clean_chunk(task: Tuple[Plugin, str, str]) -> Tuple[str, List[Chunk]]:
+    plugin, filepath, relpath = task
+    return _load_clean_chunk(plugin, _worker_cleaner, _worker_chunker, filepath, relpath)
+
+
 class DataService:
     """
     Handles data processing workflows.
@@ -19,34 +101,185 @@ class DataService:
         cleaner: CleanerPort,
         chunker: ChunkerPort,
         saver: SaverPort,
-        metadata_repo: MetadataRepositoryPort
+        metadata_repo: MetadataRepositoryPort,
+        num_workers: int = 1,
+        metadata_batch_size: int = 100,
+        registry: Optional[LoaderRegistry] = None,
     ):
         self.plugins = plugins
+        self.registry = registry if registry is not None else LoaderRegistry(plugins)
         self.cleaner = cleaner
         self.chunker = chunker
         self.saver = saver
         self.metadata_repo = metadata_repo
+        self.num_workers = num_workers
+        self.metadata_batch_size = metadata_batch_size
+
+    def process_files(self, directory: str, num_workers: Optional[int] = None) -> List[Chunk]:
+        """
+        Load, clean and chunk every supported file in a directory tree.
+
+        With more than one worker, loading, cleaning and chunking run in a
+        process pool. Metadata and chunk saving stay in this process, and
+        results are consumed in listing order, so the returned chunks are
+        identical to the serial path.
 
-    def process_files(self, directory: str) -> List[Chunk]:
+        Args:
+            directory (str): Path to the directory containing raw files.
+            num_workers (Optional[int]): Overrides the configured worker count.
+
+        Returns:
+            List[Chunk]: All chunks, in file order.
+        """
         all_chunks = []
-        for filename in os.listdir(directory):
-            filepath = os.path.join(directory, filename)
-            for plugin in self.plugins:
-                if plugin.supports(filename):
-                    document = plugin.load(filepath)
-                    document.content = self.cleaner.clean(document.content)
-
-                    document.add_metadata('source', filename.split('.')[-1].upper())
-                    document.add_metadata('ingestion_timestamp', datetime.now().isoformat())
-
-                    self.metadata_repo.insert_metadata(
-                        filename=document.filename,
-                        source=document.get_metadata('source'),
-                        ingestion_timestamp=document.get_metadata('ingestion_timestamp'),
-                    )
-
-                    chunks = self.chunker.chunk(document)
-                    self.saver.save_chunks(chunks)
-                    all_chunks.extend(chunks)
-                    break
+        for chunks in self.iter_document_chunks(directory, num_workers):
+            all_chunks.extend(chunks)
         return all_chunks
+
+    def iter_document_chunks(
+        self,
+        directory: str,
+        num_workers: Optional[int] = None,
+        files: Optional[Collection[str]] = None,
+    ) -> Iterator[List[Chunk]]:
+        """
+        Lazily process a directory, yielding the chunks of one document at a time.
+
+        The chunks of a document are saved before it is yielded. Its metadata
+        record is written in batches of `metadata_batch_size`, so the records
+        of up to `metadata_batch_size - 1` documents already yielded may
+        still be pending; they are flushed when iteration ends, is stopped
+        early or fails, and are lost only if the process dies. In parallel
+        mode at most a few files per worker are in flight, so memory stays
+        bounded by the window rather than by the corpus.
+
+        Args:
+            directory (str): Path to the directory containing raw files.
+            num_workers (Optional[int]): Overrides the configured worker count.
+            files (Optional[Collection[str]]): Restrict processing to these paths,
+                relative to `directory` (see `plan_sync`).
+
+        Yields:
+            List[Chunk]: The chunks of each document, in file order.
+        """
+        workers = num_workers if num_workers is not None else self.num_workers
+        tasks = self._collect_tasks(directory)
+        if files is not None:
+            wanted = set(files)
+            tasks = [task for task in tasks if task[2] in wanted]
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.cleaner, self.chunker),
+            ) as executor:
+                results = _ordered_imap(executor, _worker_load_clean_chunk, tasks, window=workers * 4)
+                yield from self._store_results(tasks, results)
+            return
+
+        results = (
+            _load_clean_chunk(plugin, self.cleaner, self.chunker, filepath, relpath)
+            for plugin, filepath, relpath in tasks
+        )
+        yield from self._store_results(tasks, results)
+
+    def iter_chunk_batches(
+        self,
+        directory: str,
+        batch_size: int,
+        num_workers: Optional[int] = None,
+        files: Optional[Collection[str]] = None,
+    ) -> Iterator[List[Chunk]]:
+        """
+        Regroup the chunks of a directory into fixed-size batches.
+
+        Args:
+            directory (str): Path to the directory containing raw files.
+            batch_size (int): Number of chunks per batch (the last one may be smaller).
+            num_workers (Optional[int]): Overrides the configured worker count.
+            files (Optional[Collection[str]]): Restrict processing to these relative paths.
+
+        Yields:
+            List[Chunk]: Batches of at most `batch_size` chunks.
+        """
+        batch: List[Chunk] = []
+        for chunks in self.iter_document_chunks(directory, num_workers, files):
+            for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def plan_sync(self, directory: str) -> SyncPlan:
+        """
+        Compare the supported files of a directory with the ingestion manifest.
+
+        Args:
+            directory (str): Path to the directory containing raw files.
+
+        Returns:
+            SyncPlan: New, changed, deleted and unchanged files, plus the
+            content hashes to record once the new and changed files are ingested.
+        """
+        manifest = self.metadata_repo.fetch_manifest()
+        plan = SyncPlan()
+        seen = set()
+        for _, filepath, relpath in self._collect_tasks(directory):
+            seen.add(relpath)
+            content_hash = _hash_file(filepath)
+            previous = manifest.get(relpath)
+            if previous == content_hash:
+                plan.unchanged.append(relpath)
+                continue
+            (plan.new if previous is None else plan.changed).append(relpath)
+            plan.hashes[relpath] = content_hash
+        plan.deleted = [relpath for relpath in manifest if relpath not in seen]
+        return plan
+
+    def remove_files(self, filenames: List[str]) -> None:
+        """
+        Forget the saved chunks and metadata records of the given files, so
+        that re-ingesting them does not leave the previous version behind.
+
+        Args:
+            filenames (List[str]): Paths relative to the ingested directory
+                (see `SyncPlan.stale`).
+        """
+        self.saver.delete_chunks(filenames)
+        self.metadata_repo.delete_metadata(filenames)
+
+    def commit_sync(self, plan: SyncPlan) -> None:
+        """
+        Record a completed sync in the manifest. Call this only after the
+        chunks of every new and changed file have been stored, so that an
+        interrupted run is simply redone by the next one.
+        """
+        self.metadata_repo.update_manifest(plan.hashes)
+        self.metadata_repo.delete_manifest(plan.deleted)
+
+    def _collect_tasks(self, directory: str) -> List[Tuple[Plugin, str, str]]:
+        return list(self.registry.iter_files(directory))
+
+    def _store_results(self, tasks, results) -> Iterator[List[Chunk]]:
+        # Metadata records are buffered across yields; see iter_document_chunks
+        pending_metadata: List[Dict[str, str]] = []
+        try:
+            for (_, filepath, _), (document_filename, chunks) in zip(tasks, results):
+                filename = os.path.basename(filepath)
+                pending_metadata.append({
+                    'filename': document_filename,
+                    'source': filename.split('.')[-1].upper(),
+                    'ingestion_timestamp': datetime.now().isoformat(),
+                })
+                if len(pending_metadata) >= self.metadata_batch_size:
+                    self.metadata_repo.insert_metadata_batch(pending_metadata)
+                    pending_metadata = []
+                self.saver.save_chunks(chunks)
+                yield chunks
+        finally:
+            # Also flush when the consumer stops early or an error propagates
+            if pending_metadata:
+                self.metadata_repo.insert_metadata_batch(pending_metadata)
@@ -0,0 +1,52 @@
+# File: rag_project/core/services/embedding_engine.py
+
+from typing import List, Optional, Sequence
+import numpy as np
+from rag_project.core.ports.embedding_backend_port import EmbeddingBackendPort
+
+# Per-process backend of the encoding pool, set once by init_encoder_worker
+_worker_backend: Optional[EmbeddingBackendPort] = None
+
+
+def init_encoder_worker(backend: EmbeddingBackendPort, num_threads: int) -> None:
+    global _worker_backend
+    backend.set_num_threads(num_threads)
+    _worker_backend = backend
+
+
+def encode_batch_worker(texts: List[str]) -> np.ndarray:
+    return _worker_backend.encode(texts, batch_size=len(texts))
+
+
+def plan_batches(lengths: Sequence[int], tokens_per_batch: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group input positions into batches of similar token length.
+
+    Positions are sorted by length, longest first, and a batch is closed once
+    adding the next input would make (batch size x longest length), the
+    padded size of the batch, exceed `tokens_per_batch`.
+
+    Args:
+        lengths (Sequence[int]): Token length of every input.
+        tokens_per_batch (int): Padded token budget of a batch.
+        max_batch_size (int): Upper bound on the number of inputs per batch.
+
+    Returns:
+        List[List[int]]: Input positions of each batch.
+    """
+    order = sorted(range(len(lengths)), key=lambda position: lengths[position], reverse=True)
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    longest = 0
+    for position in order:
+        if not batch:
+            # Sorted longest first, so the first input sets the padded length
+            longest = max(lengths[position], 1)
+        elif len(batch) >= max_batch_size or (len(batch) + 1) * longest > tokens_per_batch:
+            batches.append(batch)
+            batch = []
+            longest = max(lengths[position], 1)
+        batch.append(position)
+    if batch:
+        batches.append(batch)
+    return batches
@@ -1,35 +1,110 @@
 # File: ./rag_project/core/services/embedding_service.py
 
-from typing import List
-from sentence_transformers import SentenceTransformer
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import numpy as np
 from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+from rag_project.core.ports.embedding_backend_port import EmbeddingBackendPort
+from rag_project.core.ports.embedding_cache_port import EmbeddingCachePort
+from rag_project.core.services.embedding_engine import encode_batch_worker, init_encoder_worker, plan_batches
+from rag_project.core.services.query_batcher import MicroBatchingQueryEncoder
+
+ENGINES = ("default", "bucketed")
 
 
 class EmbeddingService:
     """
-    Generates embeddings for document chunks and queries using SentenceTransformer.
+    Generates embeddings for document chunks and queries.
+
+    Inference is delegated to an EmbeddingBackendPort, SentenceTransformer
+    by default. With a cache, chunk texts are looked up by (backend name,
+    SHA-256 of the text) and only the misses are sent to the model.
+
+    The "bucketed" engine tokenizes the inputs first and packs texts of
+    similar length into batches of about `tokens_per_batch` padded tokens,
+    so short chunks are not padded to the length of long ones. With
+    `num_workers` > 1 the batches are encoded by a pool of processes that
+    each load the model and share the CPU cores; results are written back
+    in input order.
+
+    With `query_batch_size` > 1, concurrent query embeddings are coalesced
+    by a MicroBatchingQueryEncoder that waits at most `query_batch_delay_ms`.
     """
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache: Optional[EmbeddingCachePort] = None,
+        backend: Optional[EmbeddingBackendPort] = None,
+        engine: str = "default",
+        num_workers: int = 1,
+        tokens_per_batch: int = 8192,
+        max_batch_size: int = 128,
+        query_batch_size: int = 1,
+        query_batch_delay_ms: float = 2.0,
+    ) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown embedding engine '{engine}', expected one of {ENGINES}")
+        if backend is None:
+            from rag_project.adapters.embedding.sentence_transformer_backend import SentenceTransformerBackend
+            backend = SentenceTransformerBackend(model_name)
+        self.backend = backend
+        self.model_name = backend.name
+        self.cache = cache
+        self.engine = engine
+        self.num_workers = num_workers
+        self.tokens_per_batch = tokens_per_batch
+        self.max_batch_size = max_batch_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.query_batcher: Optional[MicroBatchingQueryEncoder] = None
+        if query_batch_size > 1:
+            self.query_batcher = MicroBatchingQueryEncoder(
+                lambda queries: self.backend.encode(queries, batch_size=len(queries)),
+                max_batch_size=query_batch_size,
+                max_delay_ms=query_batch_delay_ms,
+            )
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._encode_seconds = 0.0
 
-    def generate_embeddings(self, chunks: List[Chunk]) -> List[Chunk]:
+    def generate_embeddings(self, chunks: List[Chunk], show_progress_bar: bool = True) -> List[Chunk]:
         """
         Generates embeddings for a list of chunks.
 
         Args:
             chunks (List[Chunk]): List of chunks to embed.
+            show_progress_bar (bool): Display the encoding progress bar.
 
         Returns:
             List[Chunk]: List of chunks with embeddings.
         """
         contents = [chunk.content for chunk in chunks]
-        embeddings = self.model.encode(contents, show_progress_bar=True)
+        embeddings = self._encode_texts(contents, show_progress_bar=show_progress_bar)
 
         for chunk, embedding in zip(chunks, embeddings):
             chunk.embedding = embedding.tolist()
 
         return chunks
 
+    def embed_batch(self, chunks: List[Chunk], show_progress_bar: bool = False) -> ChunkBatch:
+        """
+        Embed chunks into a ChunkBatch, keeping the vectors as one float32 matrix.
+
+        Args:
+            chunks (List[Chunk]): List of chunks to embed.
+            show_progress_bar (bool): Display the encoding progress bar.
+
+        Returns:
+            ChunkBatch: The chunks and their embedding matrix.
+        """
+        embeddings = self._encode_texts([chunk.content for chunk in chunks], show_progress_bar=show_progress_bar)
+        if not chunks:
+            embeddings = np.empty((0, self.backend.dimension), dtype=np.float32)
+        return ChunkBatch(chunks=chunks, embeddings=embeddings)
+
     def generate_query_embedding(self, query: str) -> List[float]:
         """
         Generate embedding for a text query.
@@ -40,5 +115,116 @@ class EmbeddingService:
         Returns:
             List[float]: Embedding vector for the query.
         """
-        embedding = self.model.encode(query)
-        return embedding.tolist()
+        return self.generate_query_vector(query).tolist()
+
+    def generate_query_vector(self, query: str) -> np.ndarray:
+        """
+        Generate the embedding of a text query as a float32 vector.
+        """
+        if self.query_batcher is not None:
+            return self.query_batcher.encode(query)
+        return self.backend.encode([query])[0]
+
+    def generate_query_vectors(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed several text queries with one encode call; row i belongs to
+        queries[i]. The query batcher is bypassed, the batch being already
+        formed.
+        """
+        if not queries:
+            return np.empty((0, self.backend.dimension), dtype=np.float32)
+        return np.asarray(self.backend.encode(queries, batch_size=len(queries)), dtype=np.float32)
+
+    async def agenerate_query_vector(self, query: str) -> np.ndarray:
+        """
+        Generate the embedding of a text query from asyncio code. Without a
+        query batcher the encoding runs in the default thread pool.
+        """
+        if self.query_batcher is not None:
+            return await self.query_batcher.aencode(query)
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, self.generate_query_vector, query)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """
+        Cache counters since the service was created. The time saved is the
+        number of hits times the average encoding time of a miss.
+        """
+        lookups = self.cache_hits + self.cache_misses
+        seconds_per_text = self._encode_seconds / self.cache_misses if self.cache_misses else 0.0
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "encode_seconds": self._encode_seconds,
+            "time_saved_seconds": self.cache_hits * seconds_per_text,
+        }
+
+    def _encode_texts(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Encode texts into a float32 matrix with one row per text, going
+        through the cache when one is configured.
+        """
+        if self.cache is None:
+            return self._encode_with_model(texts, show_progress_bar)
+
+        keys = [hashlib.sha256(text.encode("utf-8")).digest() for text in texts]
+        cached = self.cache.get_many(self.model_name, keys)
+
+        # Repeated texts within the batch are encoded once
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self.cache_hits += len(texts) - len(missing)
+        self.cache_misses += len(missing)
+
+        if missing:
+            vectors = self._encode_with_model(list(missing.values()), show_progress_bar)
+            computed = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.model_name, computed)
+            cached.update(computed)
+
+        return np.stack([cached[key] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+
+    def close(self) -> None:
+        if self.query_batcher is not None:
+            self.query_batcher.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _encode_with_model(self, texts: List[str], show_progress_bar: bool) -> np.ndarray:
+        start = time.perf_counter()
+        if self.engine == "bucketed":
+            embeddings = self._encode_bucketed(texts)
+        else:
+            embeddings = self.backend.encode(texts, show_progress_bar=show_progress_bar)
+        self._encode_seconds += time.perf_counter() - start
+        return embeddings
+
+    def _encode_bucketed(self, texts: List[str]) -> np.ndarray:
+        lengths = self.backend.token_lengths(texts)
+        batches = plan_batches(lengths, self.tokens_per_batch, self.max_batch_size)
+        batch_texts = [[texts[position] for position in batch] for batch in batches]
+
+        if self.num_workers > 1 and len(batches) > 1:
+            results = self._get_executor().map(encode_batch_worker, batch_texts)
+        else:
+            results = (self.backend.encode(chunk, batch_size=len(chunk)) for chunk in batch_texts)
+
+        output = np.empty((len(texts), self.backend.dimension), dtype=np.float32)
+        for batch, embeddings in zip(batches, results):
+            output[batch] = embeddings
+        return output
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Split the cores between workers instead of letting each use all of them
+            threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                initializer=init_encoder_worker,
+                initargs=(self.backend, threads),
+            )
+        return self._executor
@@ -0,0 +1,105 @@
+# File: rag_project/core/services/loader_registry.py
+
+import fnmatch
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from rag_project.core.ports.plugin_port import Plugin
+
+
+class LoaderRegistry:
+    """
+    Maps files to loader plugins and walks directory trees.
+
+    Plugins that declare `extensions` are found with a single dict lookup on
+    the lower-cased file extension. Plugins without extensions are still
+    probed through `supports`, after the lookup fails.
+    """
+    def __init__(
+        self,
+        plugins: List[Plugin],
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        max_file_size: Optional[int] = None,
+        recursive: bool = True,
+    ):
+        """
+        Args:
+            plugins (List[Plugin]): Loaders, earlier ones win on conflicts.
+            include (Optional[Sequence[str]]): Glob patterns on the relative path;
+                when given, only matching files are loaded.
+            exclude (Optional[Sequence[str]]): Glob patterns on the relative path
+                of files or directories to skip.
+            max_file_size (Optional[int]): Skip files larger than this many bytes.
+            recursive (bool): Descend into subdirectories.
+        """
+        self.plugins = plugins
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.max_file_size = max_file_size
+        self.recursive = recursive
+
+        self._by_extension: Dict[str, Plugin] = {}
+        self._probed: List[Plugin] = []
+        for plugin in plugins:
+            if not plugin.extensions:
+                self._probed.append(plugin)
+            for extension in plugin.extensions:
+                self._by_extension.setdefault(extension.lower(), plugin)
+
+    def find(self, filename: str) -> Optional[Plugin]:
+        """
+        Return the plugin that loads `filename`, or None if no plugin supports it.
+        """
+        plugin = self._by_extension.get(os.path.splitext(filename)[1].lower())
+        if plugin is not None:
+            return plugin
+        for plugin in self._probed:
+            if plugin.supports(filename):
+                return plugin
+        return None
+
+    def iter_files(self, directory: str) -> Iterator[Tuple[Plugin, str, str]]:
+        """
+        Walk `directory` in name order and yield every loadable file.
+
+        Like `os.walk`, symbolic links to directories are not followed, so a
+        link pointing back up the tree cannot loop; links to files are
+        loaded like the files themselves.
+
+        Yields:
+            Tuple[Plugin, str, str]: The plugin, the file path and the path
+            relative to `directory` with '/' separators.
+        """
+        stack = [(directory, "")]
+        while stack:
+            path, prefix = stack.pop()
+            with os.scandir(path) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+
+            subdirectories = []
+            for entry in entries:
+                relpath = prefix + entry.name
+                if self._excluded(relpath):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        subdirectories.append((entry.path, relpath + "/"))
+                    continue
+                if not entry.is_file() or not self._included(relpath):
+                    continue
+                plugin = self.find(entry.name)
+                if plugin is None:
+                    continue
+                if self.max_file_size is not None and entry.stat().st_size > self.max_file_size:
+                    print(f"Skipping {relpath}: larger than {self.max_file_size} bytes")
+                    continue
+                yield plugin, entry.path, relpath
+
+            # Reversed so that subdirectories are popped in name order
+            stack.extend(reversed(subdirectories))
+
+    def _included(self, relpath: str) -> bool:
+        return not self.include or any(fnmatch.fnmatch(relpath, pattern) for pattern in self.include)
+
+    def _excluded(self, relpath: str) -> bool:
+        return any(fnmatch.fnmatch(relpath, pattern) for pattern in self.exclude)
@@ -0,0 +1,120 @@
+# File: rag_project/core/services/query_batcher.py
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+_STOP = object()
+
+
+class MicroBatchingQueryEncoder:
+    """
+    Collects queries submitted concurrently and encodes them in one call.
+
+    A background thread waits for the first pending query, then keeps
+    collecting until `max_batch_size` queries are pending or `max_delay_ms`
+    has passed since the first one arrived, and hands the whole batch to
+    `encode_fn`. Every caller gets a future completed with its own row, or
+    with the exception raised by `encode_fn`. Identical queries in a batch
+    are encoded once.
+
+    Use `encode` from threads and `aencode` from asyncio code.
+    """
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_delay_ms: float = 2.0,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.queries = 0
+        self._pending: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, query: str) -> Future:
+        """
+        Queue a query and return a future resolving to its float32 embedding.
+        """
+        future: Future = Future()
+        self._ensure_started()
+        self._pending.put((query, future))
+        return future
+
+    def encode(self, query: str, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(query).result(timeout)
+
+    async def aencode(self, query: str) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(query))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "mean_batch_size": self.queries / self.batches if self.batches else 0.0,
+        }
+
+    def close(self) -> None:
+        """
+        Encode what is still pending, then stop the background thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._pending.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._pending.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._encode_batch(batch)
+            if stop:
+                return
+
+    def _encode_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        # Callers that gave up (cancelled futures) are dropped before encoding
+        batch = [(query, future) for query, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        rows: Dict[str, int] = {}
+        for query, _ in batch:
+            rows.setdefault(query, len(rows))
+        try:
+            embeddings = self.encode_fn(list(rows))
+        except BaseException as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        self.batches += 1
+        self.queries += len(batch)
+        for query, future in batch:
+            future.set_result(embeddings[rows[query]])
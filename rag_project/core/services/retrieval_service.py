@@ -1,31 +1,195 @@
 # File: rag_project/core/services/retriever_service.py
 
 from rag_project.core.ports.retrieval_port import RetrievalPort
+from rag_project.core.services.cache import LRUCache, TTLCache
 from rag_project.core.services.embedding_service import EmbeddingService
 from rag_project.core.domain.chunk import Chunk
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    """
+    Collapse whitespace so that trivially different spellings of a query share cache entries.
+    """
+    return " ".join(query.split())
 
 
 class RetrievalService(RetrievalPort):
     """
     Handles chunk retrieval using vector stores and embeddings.
+
+    Query embeddings are kept in an LRU cache of `query_cache_size` entries.
+    With `result_ttl_seconds` > 0, top-k results are also cached for that
+    long, keyed by (normalized query, top_k, filters). The result cache is
+    cleared whenever this process writes to the vector store, and results
+    of a search that overlapped such a write are not cached; writes made by
+    other processes only show up once entries expire.
+
+    `search_params` (e.g. `nprobe`, `ef_search`) are passed to every vector
+    store query; `retrieve` can override them per call.
+
+    `retrieve_batch` serves many queries with one encode call and one
+    vector store search, and returns each chunk's distance. It does not go
+    through the result cache.
     """
-    def __init__(self, vector_store, embedding_service: EmbeddingService):
+    def __init__(
+        self,
+        vector_store,
+        embedding_service: EmbeddingService,
+        query_cache_size: int = 1024,
+        result_cache_size: int = 1024,
+        result_ttl_seconds: float = 0.0,
+        filter_overfetch: int = 4,
+        search_params: Optional[Dict[str, Any]] = None,
+    ):
         self.vector_store = vector_store
         self.embedding_service = embedding_service
+        self.filter_overfetch = filter_overfetch
+        self.search_params = dict(search_params or {})
+        self.query_cache = LRUCache(query_cache_size) if query_cache_size > 0 else None
+        self.result_cache = None
+        if result_ttl_seconds > 0 and result_cache_size > 0:
+            self.result_cache = TTLCache(result_cache_size, result_ttl_seconds)
+            self.vector_store.add_write_listener(self.result_cache.invalidate)
 
-    def retrieve(self, query: str, top_k: int) -> List[Chunk]:
+    def retrieve(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Chunk]:
         """
         Retrieve chunks using the vector store.
+
+        Args:
+            query (str): The search query text.
+            top_k (int): Number of top chunks to retrieve.
+            filters (Optional[Dict[str, Any]]): Keep only chunks whose filename or
+                metadata values equal these. The store is asked for
+                `filter_overfetch` times more candidates, so fewer than `top_k`
+                chunks may be returned.
+            search_params (Optional[Dict[str, Any]]): Vector store search
+                settings for this query, on top of the service defaults.
         """
-        embedding = self.embedding_service.generate_query_embedding(query)
-        results = self.vector_store.query(embedding, top_k)
-        return [
-            Chunk(
-                filename=result['filename'],
-                chunk_id=result['chunk_id'],
-                content=result['content'],
-                embedding=result.get('embedding'),
+        normalized = normalize_query(query)
+        params = {**self.search_params, **(search_params or {})}
+        result_key = None
+        if self.result_cache is not None:
+            result_key = (
+                normalized, top_k, tuple(sorted((filters or {}).items())), tuple(sorted(params.items())),
+            )
+            cached = self.result_cache.get(result_key)
+            if cached is not None:
+                return [chunk.model_copy() for chunk in cached]
+
+        embedding = self._query_embedding(normalized)
+        # Results of a search that overlaps a write may be stale; they are not cached
+        generation = self.vector_store.write_generation
+        results = self.vector_store.query(embedding, top_k * self.filter_overfetch if filters else top_k, **params)
+        chunks = [chunk for chunk, _ in self._to_chunks(results, top_k, filters)]
+
+        if result_key is not None and generation == self.vector_store.write_generation:
+            self.result_cache.put(result_key, [chunk.model_copy() for chunk in chunks])
+        return chunks
+
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[Chunk, float]]]:
+        """
+        Retrieve chunks for many queries at once: the queries missing from the
+        embedding cache are encoded in one call and all queries are searched
+        with one `query_batch` call to the vector store.
+
+        Args:
+            queries (List[str]): The search query texts.
+            top_k (int): Number of top chunks to retrieve per query.
+            filters (Optional[Dict[str, Any]]): As for `retrieve`, applied to
+                every query.
+            search_params (Optional[Dict[str, Any]]): As for `retrieve`.
+
+        Returns:
+            List[List[Tuple[Chunk, float]]]: For each query, in order, its
+                chunks paired with their distance to the query.
+        """
+        if not queries:
+            return []
+        normalized = [normalize_query(query) for query in queries]
+        params = {**self.search_params, **(search_params or {})}
+        embeddings = self._query_embeddings(normalized)
+        results = self.vector_store.query_batch(
+            embeddings, top_k * self.filter_overfetch if filters else top_k, **params,
+        )
+        return [self._to_chunks(query_results, top_k, filters) for query_results in results]
+
+    def _to_chunks(
+        self, results: List[Dict[str, Any]], top_k: int, filters: Optional[Dict[str, Any]],
+    ) -> List[Tuple[Chunk, float]]:
+        chunks = [
+            (
+                Chunk(
+                    filename=result['filename'],
+                    chunk_id=result['chunk_id'],
+                    content=result['content'],
+                    embedding=result.get('embedding'),
+                    metadata=result.get('metadata') or {},
+                ),
+                result.get('distance'),
             )
             for result in results
         ]
+        if filters:
+            chunks = [(chunk, distance) for chunk, distance in chunks if self._matches(chunk, filters)][:top_k]
+        return chunks
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Size, hit and miss counters of the query embedding and result caches.
+        """
+        stats = {}
+        if self.query_cache is not None:
+            stats["query_embeddings"] = self.query_cache.stats()
+        if self.result_cache is not None:
+            stats["results"] = self.result_cache.stats()
+        return stats
+
+    def _query_embedding(self, normalized: str) -> np.ndarray:
+        if self.query_cache is None:
+            return self.embedding_service.generate_query_vector(normalized)
+        embedding = self.query_cache.get(normalized)
+        if embedding is None:
+            embedding = self.embedding_service.generate_query_vector(normalized)
+            self.query_cache.put(normalized, embedding)
+        return embedding
+
+    def _query_embeddings(self, normalized: List[str]) -> np.ndarray:
+        """
+        Embeddings of `normalized` queries, row i for query i. Cache misses
+        are encoded together, each distinct query once.
+        """
+        cached = {}
+        if self.query_cache is not None:
+            for query in normalized:
+                embedding = self.query_cache.get(query)
+                if embedding is not None:
+                    cached[query] = embedding
+        missing = list(dict.fromkeys(query for query in normalized if query not in cached))
+        if missing:
+            for query, embedding in zip(missing, self.embedding_service.generate_query_vectors(missing)):
+                cached[query] = embedding
+                if self.query_cache is not None:
+                    self.query_cache.put(query, embedding)
+        return np.stack([np.asarray(cached[query], dtype=np.float32) for query in normalized])
+
+    @staticmethod
+    def _matches(chunk: Chunk, filters: Dict[str, Any]) -> bool:
+        for key, value in filters.items():
+            actual = chunk.filename if key == "filename" else chunk.metadata.get(key)
+            if actual != value:
+                return False
+        return True
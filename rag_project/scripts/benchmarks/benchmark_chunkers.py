@@ -0,0 +1,53 @@
+"""
+Compare BasicChunker and SentenceChunker throughput on a large synthetic
+document, and report how many chunks exceed the model's token window.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_chunkers --megabytes 8
+"""
+import argparse
+import random
+import time
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.chunker.sentence_chunker import SentenceChunker
+from rag_project.core.domain.document import Document
+from rag_project.scripts.benchmarks.common import random_text
+
+
+def build_document(megabytes: float) -> Document:
+    rng = random.Random(42)
+    sentences = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        sentence = random_text(rng, rng.randint(4, 40)).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return Document(filename="synthetic.txt", content=" ".join(sentences))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=8)
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--max-tokens", type=int, default=256)
+    args = parser.parse_args()
+
+    document = build_document(args.megabytes)
+    sentence_chunker = SentenceChunker(model_name=args.model, max_tokens=args.max_tokens)
+    tokenizer = sentence_chunker.tokenizer
+
+    for name, chunker in (("basic", BasicChunker()), ("sentence", sentence_chunker)):
+        start = time.perf_counter()
+        chunks = chunker.chunk(document)
+        elapsed = time.perf_counter() - start
+
+        lengths = [len(ids) for ids in tokenizer([chunk.content for chunk in chunks])["input_ids"]]
+        truncated = sum(length > args.max_tokens for length in lengths)
+        print(f"{name:>9}: {len(chunks)} chunks in {elapsed:.2f}s "
+              f"({args.megabytes / elapsed:.2f} MB/s), mean {sum(lengths) / len(lengths):.0f} tokens, "
+              f"{truncated} chunks over {args.max_tokens} tokens")
+
+
+if __name__ == "__main__":
+    main()
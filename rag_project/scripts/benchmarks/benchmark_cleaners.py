@@ -0,0 +1,68 @@
+"""
+Measure cleaning throughput (docs/sec and MB/s) of SimpleCleaner and the
+RuleCleaner presets, serially and with segment-parallel cleaning.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_cleaners --docs 200 --doc-kb 64 --workers 4
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from rag_project.adapters.cleaner.rule_cleaner import RuleCleaner
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.core.ports.cleaner_port import CleanerPort
+from rag_project.scripts.benchmarks.common import random_text
+
+SEPARATORS = [". ", ",\n", "  ", "\n\n\n", "() ", " 0.3.20 ", "\t", " -> "]
+
+
+def build_documents(num_docs: int, doc_kb: int) -> List[str]:
+    rng = random.Random(42)
+    documents = []
+    for _ in range(num_docs):
+        parts = []
+        size = 0
+        while size < doc_kb * 1024:
+            part = random_text(rng, rng.randint(3, 15)) + rng.choice(SEPARATORS)
+            parts.append(part)
+            size += len(part)
+        documents.append("".join(parts))
+    return documents
+
+
+def run(name: str, cleaner: CleanerPort, documents: List[str]) -> None:
+    megabytes = sum(len(document) for document in documents) / (1024 * 1024)
+    start = time.perf_counter()
+    for document in documents:
+        cleaner.clean(document)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {len(documents) / elapsed:8.1f} docs/s {megabytes / elapsed:7.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--doc-kb", type=int, default=64)
+    parser.add_argument("--large-mb", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    documents = build_documents(args.docs, args.doc_kb)
+    run("SimpleCleaner", SimpleCleaner(), documents)
+    run("RuleCleaner[simple]", RuleCleaner.from_preset("simple"), documents)
+    run("RuleCleaner[code]", RuleCleaner.from_preset("code"), documents)
+
+    large = build_documents(1, args.large_mb * 1024)
+    run("SimpleCleaner large", SimpleCleaner(), large)
+    for preset in ("simple", "code"):
+        run(f"RuleCleaner[{preset}] large", RuleCleaner.from_preset(preset), large)
+        parallel = RuleCleaner.from_preset(preset, num_workers=args.workers, segment_size=1024 * 1024)
+        parallel.clean(large[0][:2 * 1024 * 1024])  # start the pool outside the timing
+        run(f"[{preset}] {args.workers} workers", parallel, large)
+        parallel.close()
+
+
+if __name__ == "__main__":
+    main()
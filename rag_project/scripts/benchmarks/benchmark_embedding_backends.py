@@ -0,0 +1,70 @@
+"""
+Compare the SentenceTransformer (PyTorch) backend with ONNX Runtime, fp32
+and dynamically quantized int8: cosine agreement with PyTorch, single-query
+latency and batch throughput. The first ONNX run exports and quantizes the
+model into the cache directory; that step is not timed.
+
+Requires sentence-transformers, torch, onnxruntime and the model weights.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_embedding_backends --chunks 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from rag_project.adapters.embedding.onnx_backend import OnnxEmbeddingBackend
+from rag_project.adapters.embedding.sentence_transformer_backend import SentenceTransformerBackend
+from rag_project.scripts.benchmarks.common import random_text
+
+
+def latency_ms(backend, queries) -> float:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        backend.encode([query])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--cache-dir", default="~/.cache/rag_project/onnx")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = [random_text(rng, rng.randint(8, 200)) for _ in range(args.chunks)]
+    queries = [random_text(rng, rng.randint(4, 16)) for _ in range(args.queries)]
+
+    backends = {
+        "pytorch": SentenceTransformerBackend(args.model),
+        "onnx-fp32": OnnxEmbeddingBackend(args.model, cache_dir=args.cache_dir, quantize=False),
+        "onnx-int8": OnnxEmbeddingBackend(args.model, cache_dir=args.cache_dir, quantize=True),
+    }
+    reference = None
+    print(f"{'backend':<10} {'chunks/s':>9} {'p50 query ms':>13} {'min cos':>8} {'mean cos':>9}")
+    for label, backend in backends.items():
+        backend.encode(texts[:args.batch_size])  # load, export and warm up
+
+        start = time.perf_counter()
+        embeddings = backend.encode(texts, batch_size=args.batch_size)
+        throughput = len(texts) / (time.perf_counter() - start)
+        latency = latency_ms(backend, queries)
+
+        if reference is None:
+            reference = embeddings
+        cosine = np.sum(reference * embeddings, axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(embeddings, axis=1)
+        )
+        print(f"{label:<10} {throughput:9.1f} {latency:13.2f} {cosine.min():8.4f} {cosine.mean():9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Recall@k and query latency of the FAISS index types against the exact flat
+index, over a sweep of search parameters (nprobe for IVF, ef_search for
+HNSW). Vectors are drawn from a Gaussian mixture and normalized, which is
+closer to sentence embeddings than uniform noise; queries are perturbed
+corpus vectors.
+
+Queries go through FaissVectorStore.query one at a time, as the retrieval
+service issues them.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_faiss_ann --vectors 100000 --nlist 1024
+"""
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+
+def make_vectors(rng, count: int, dim: int, clusters: int) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def build(store: FaissVectorStore, vectors: np.ndarray, batch_size: int = 10000) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), batch_size):
+        rows = vectors[offset:offset + batch_size]
+        chunks = [Chunk(filename="bench", chunk_id=offset + i, content="") for i in range(len(rows))]
+        store.insert_batch(ChunkBatch(chunks=chunks, embeddings=rows))
+    store.train()
+    return time.perf_counter() - start
+
+
+def search(store: FaissVectorStore, queries: np.ndarray, top_k: int, **params) -> Tuple[List[List[int]], float]:
+    results = []
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        records = store.query(query, top_k, **params)
+        timings.append(time.perf_counter() - start)
+        results.append([record["chunk_id"] for record in records])
+    return results, float(np.percentile(timings, 50) * 1000)
+
+
+def recall(results: List[List[int]], truth: List[List[int]]) -> float:
+    return float(np.mean([len(set(found) & set(exact)) / len(exact) for found, exact in zip(results, truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--nprobes", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--ef-searches", type=int, nargs="+", default=[16, 32, 64, 128])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(rng, args.vectors, args.dim, args.clusters)
+    queries = vectors[rng.integers(0, args.vectors, args.queries)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    stores: Dict[str, FaissVectorStore] = {
+        "flat": FaissVectorStore(args.dim),
+        "hnsw": FaissVectorStore(args.dim, index_type="hnsw"),
+        "ivf_flat": FaissVectorStore(args.dim, index_type="ivf_flat", nlist=args.nlist),
+        "ivf_pq": FaissVectorStore(args.dim, index_type="ivf_pq", nlist=args.nlist, pq_m=args.pq_m),
+    }
+    build_times = {label: build(store, vectors) for label, store in stores.items()}
+
+    truth, flat_ms = search(stores["flat"], queries, args.top_k)
+    print(f"{'index':<10} {'params':<14} {'build s':>8} {f'recall@{args.top_k}':>10} {'p50 ms':>8}")
+    print(f"{'flat':<10} {'-':<14} {build_times['flat']:8.1f} {1.0:10.3f} {flat_ms:8.3f}")
+    for label in ("hnsw", "ivf_flat", "ivf_pq"):
+        sweep = [{"ef_search": ef} for ef in args.ef_searches] if label == "hnsw" else \
+                [{"nprobe": nprobe} for nprobe in args.nprobes]
+        for params in sweep:
+            results, p50 = search(stores[label], queries, args.top_k, **params)
+            name, value = next(iter(params.items()))
+            print(f"{label:<10} {f'{name}={value}':<14} {build_times[label]:8.1f} "
+                  f"{recall(results, truth):10.3f} {p50:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Start-up cost of a FAISS vector store: rebuilding it from the embeddings,
+loading a saved copy into memory, and opening it memory-mapped.
+
+Every start runs in a fresh subprocess and reports the time until the first
+query returns, the RSS the store added, and the private part of it (from
+/proc/self/smaps_rollup). `--readers` memory-mapped processes are then
+started together to show that they share one page-cached copy: their
+private memory stays small while RSS counts the shared pages in each.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_faiss_persistence --chunks 200000 --index-type flat
+"""
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+from rag_project.scripts.benchmarks.common import random_text
+
+
+def memory_mb():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return fields["Rss"], fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+
+
+def make_data(chunks: int, dim: int, words: int):
+    rng = random.Random(0)
+    vectors = np.random.default_rng(0).standard_normal((chunks, dim)).astype(np.float32)
+    records = [
+        Chunk(filename=f"doc{i // 50}.md", chunk_id=i % 50, content=random_text(rng, words), metadata={"page": i % 7})
+        for i in range(chunks)
+    ]
+    return vectors, records
+
+
+def build(args, vectors, records) -> FaissVectorStore:
+    store = FaissVectorStore(args.dim, index_type=args.index_type, nlist=args.nlist)
+    for start in range(0, len(records), 10000):
+        store.insert_batch(ChunkBatch(chunks=records[start:start + 10000], embeddings=vectors[start:start + 10000]))
+    store.train()
+    return store
+
+
+def child(mode: str, args) -> None:
+    query = np.random.default_rng(1).standard_normal(args.dim).astype(np.float32)
+    if mode == "rebuild":
+        # Embeddings are assumed available; only the store construction is timed
+        vectors, records = make_data(args.chunks, args.dim, args.words)
+    rss_before, private_before = memory_mb()
+    start = time.perf_counter()
+    if mode == "rebuild":
+        store = build(args, vectors, records)
+    else:
+        store = FaissVectorStore.load(args.directory, mmap=mode == "mmap")
+    store.query(query, 5)
+    elapsed = (time.perf_counter() - start) * 1000
+    rss, private = memory_mb()
+    print(f"{mode:<8} start+query={elapsed:9.1f} ms  rss=+{rss - rss_before:7.1f} MB  "
+          f"private=+{private - private_before:7.1f} MB", flush=True)
+    if args.hold:
+        time.sleep(args.hold)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--words", type=int, default=80)
+    parser.add_argument("--index-type", default="flat")
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    parser.add_argument("--hold", type=float, default=0.0, help=argparse.SUPPRESS)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args)
+        return
+
+    common = ["--chunks", str(args.chunks), "--dim", str(args.dim), "--words", str(args.words),
+              "--index-type", args.index_type, "--nlist", str(args.nlist)]
+    with tempfile.TemporaryDirectory() as directory:
+        store = build(args, *make_data(args.chunks, args.dim, args.words))
+        store.save(directory)
+        del store
+
+        for mode in ("rebuild", "memory", "mmap"):
+            subprocess.run([sys.executable, "-m", __spec__.name, "--child", mode, "--directory", directory, *common],
+                           check=True)
+
+        print(f"{args.readers} concurrent memory-mapped readers:")
+        readers = [
+            subprocess.Popen([sys.executable, "-m", __spec__.name, "--child", "mmap", "--directory", directory,
+                              "--hold", "2", *common])
+            for _ in range(args.readers)
+        ]
+        for reader in readers:
+            reader.wait()
+
+
+if __name__ == "__main__":
+    main()
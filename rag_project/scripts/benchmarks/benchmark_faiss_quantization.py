@@ -0,0 +1,71 @@
+"""
+Memory and recall@k of compressed FAISS indexes (int8 scalar quantization
+and product quantization), with and without exact re-scoring against the
+memory-mapped float32 vectors, compared with the uncompressed flat index.
+
+Each store is built, saved and reopened memory-mapped, as a retrieval node
+would open it. "index MB" is the size of the index that search scans;
+"exact MB" is the float32 copy used for re-scoring, which stays on disk
+apart from the candidate rows each query reads.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_faiss_quantization --vectors 100000
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.scripts.benchmarks.benchmark_faiss_ann import build, make_vectors, recall, search
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--rescore-factors", type=int, nargs="+", default=[0, 4, 10])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(rng, args.vectors, args.dim, args.clusters)
+    queries = vectors[rng.integers(0, args.vectors, args.queries)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    configs = [("flat", 0)] + [
+        (index_type, factor)
+        for index_type in ("sq8", "pq", "ivf_sq8", "ivf_pq")
+        for factor in args.rescore_factors
+    ]
+    truth = None
+    flat_mb = None
+    print(f"{'index':<9} {'rescore':>7} {'index MB':>9} {'vs flat':>8} {'exact MB':>9} "
+          f"{f'recall@{args.top_k}':>10} {'p50 ms':>8}")
+    for index_type, factor in configs:
+        with tempfile.TemporaryDirectory() as directory:
+            store = FaissVectorStore(args.dim, index_type=index_type, nlist=args.nlist, pq_m=args.pq_m,
+                                     nprobe=args.nprobe, rescore_factor=factor)
+            build(store, vectors)
+            store.save(directory)
+            del store
+            store = FaissVectorStore.load(directory)
+            index_mb = os.path.getsize(os.path.join(directory, "index.faiss")) / 2 ** 20
+            vectors_path = os.path.join(directory, "vectors.npy")
+            exact_mb = os.path.getsize(vectors_path) / 2 ** 20 if os.path.exists(vectors_path) else 0.0
+
+            results, p50 = search(store, queries, args.top_k)
+            if truth is None:
+                truth, flat_mb = results, index_mb
+            print(f"{index_type:<9} {factor or '-':>7} {index_mb:9.1f} {flat_mb / index_mb:7.1f}x {exact_mb:9.1f} "
+                  f"{recall(results, truth):10.3f} {p50:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure time and peak RSS of handing embeddings to FaissVectorStore as
+Python lists (the former `tolist()` path) versus one float32 ChunkBatch
+matrix. Embeddings are random, so the numbers cover only conversion and
+insertion. Also times encoding the batch for pgvector COPY, text versus binary.
+
+Each measurement runs in a fresh subprocess so peak RSS is not shared.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_float32_batches --chunks 1000000
+"""
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.adapters.vector_store.pg_vector_store import _copy_binary, _copy_text
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+VECTOR_DIM = 384
+
+
+def make_batch(num_chunks: int, dim: int) -> ChunkBatch:
+    rng = np.random.default_rng(0)
+    chunks = [Chunk(filename=f"doc_{i // 100}.txt", chunk_id=i % 100, content="x" * 64) for i in range(num_chunks)]
+    return ChunkBatch(chunks=chunks, embeddings=rng.random((num_chunks, dim), dtype=np.float32))
+
+
+def copy_text(chunks) -> bytes:
+    # The text COPY format used by PgVectorStore's "copy" insert mode
+    buffer = io.StringIO()
+    for chunk in chunks:
+        buffer.write(f"{_copy_text(chunk.filename)}\t{chunk.chunk_id}\t{_copy_text(chunk.content)}\t[")
+        buffer.write(",".join(map(str, chunk.embedding)))
+        buffer.write(f"]\t{_copy_text(json.dumps(chunk.metadata))}\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def measure(mode: str, num_chunks: int, dim: int) -> None:
+    batch = make_batch(num_chunks, dim)
+    base_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    start = time.perf_counter()
+    if mode == "faiss-lists":
+        # As before: every row boxed into a list, validated on the Chunk, then rebuilt
+        FaissVectorStore(dim).insert(batch.to_chunks())
+    elif mode == "faiss-matrix":
+        FaissVectorStore(dim).insert_batch(batch)
+    elif mode == "copy-text":
+        copy_text(batch.to_chunks())
+    else:
+        _copy_binary(batch)
+    elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>13} chunks={num_chunks:<8} time={elapsed:7.2f}s "
+          f"peak_rss={peak_mb:8.1f} MB (+{peak_mb - base_mb:.1f} MB over the input batch)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=VECTOR_DIM)
+    parser.add_argument("--modes", nargs="+", default=["faiss-lists", "faiss-matrix", "copy-text", "copy-binary"])
+    parser.add_argument("--child", metavar="MODE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child, args.chunks, args.dim)
+        return
+
+    for mode in args.modes:
+        subprocess.run(
+            [sys.executable, "-m", __spec__.name, "--child", mode, "--chunks", str(args.chunks), "--dim", str(args.dim)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
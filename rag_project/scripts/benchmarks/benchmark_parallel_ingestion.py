@@ -0,0 +1,50 @@
+"""
+Compare serial and parallel DataService.process_files throughput on a
+synthetic corpus of text files.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_parallel_ingestion --files 2000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.adapters.loader.text_loader import TextLoader
+from rag_project.core.services.data_service import DataService
+from rag_project.scripts.benchmarks.common import NullMetadataRepo, NullSaver, build_corpus
+
+
+def run(service: DataService, directory: str, workers: int):
+    start = time.perf_counter()
+    chunks = service.process_files(directory, num_workers=workers)
+    return chunks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_corpus(directory, args.files, args.words)
+        service = DataService([TextLoader()], SimpleCleaner(), BasicChunker(), NullSaver(), NullMetadataRepo())
+
+        serial_chunks, serial_time = run(service, directory, 1)
+        parallel_chunks, parallel_time = run(service, directory, args.workers)
+
+    identical = [(c.filename, c.chunk_id, c.content) for c in serial_chunks] == \
+                [(c.filename, c.chunk_id, c.content) for c in parallel_chunks]
+
+    print(f"Files: {args.files}, chunks: {len(serial_chunks)}")
+    print(f"Serial:            {serial_time:.2f}s ({args.files / serial_time:.1f} files/s)")
+    print(f"Parallel ({args.workers} workers): {parallel_time:.2f}s ({args.files / parallel_time:.1f} files/s)")
+    print(f"Speed-up: {serial_time / parallel_time:.2f}x, identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
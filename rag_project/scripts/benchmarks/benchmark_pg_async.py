@@ -0,0 +1,102 @@
+"""
+Compare the psycopg PgVectorStore with the asyncpg AsyncPgVectorStore:
+insert rows/sec (COPY BINARY one batch at a time versus pipelined COPYs on
+several connections) and query throughput (client threads on the SQLAlchemy
+pool versus coroutines on one event loop).
+
+Requires DATABASE_URL to point at a PostgreSQL database with pgvector and the
+schema from `schema_setup.init_db`. Benchmark rows use a dedicated filename
+and are deleted after the run.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_pg_async --rows 50000 --clients 32
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from rag_project.adapters.database.async_connection import AsyncPgPool
+from rag_project.adapters.database.connection import get_session_factory
+from rag_project.adapters.vector_store.asyncpg_vector_store import AsyncPgVectorStore
+from rag_project.adapters.vector_store.pg_vector_store import PgVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+BENCH_FILENAME = "__benchmark_pg_async__"
+VECTOR_DIM = 384
+
+
+def make_batch(num_rows: int) -> ChunkBatch:
+    rng = np.random.default_rng(42)
+    chunks = [Chunk(filename=BENCH_FILENAME, chunk_id=i, content=f"benchmark chunk {i}") for i in range(num_rows)]
+    return ChunkBatch(chunks=chunks, embeddings=rng.standard_normal((num_rows, VECTOR_DIM), dtype=np.float32))
+
+
+def time_insert(store, batch: ChunkBatch) -> float:
+    store.delete([BENCH_FILENAME])
+    start = time.perf_counter()
+    store.insert_batch(batch)
+    return time.perf_counter() - start
+
+
+def sync_queries(store: PgVectorStore, queries: np.ndarray, clients: int, top_k: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        list(executor.map(lambda query: store.query(query, top_k), queries))
+    return len(queries) / (time.perf_counter() - start)
+
+
+async def async_queries(store: AsyncPgVectorStore, queries: np.ndarray, clients: int, top_k: int) -> float:
+    in_flight = asyncio.Semaphore(clients)
+
+    async def one(query):
+        async with in_flight:
+            await store.aquery(query, top_k)
+
+    await store.aquery(queries[0], top_k)  # opens this loop's pool
+    start = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--insert-concurrency", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    batch = make_batch(args.rows)
+    queries = np.random.default_rng(7).standard_normal((args.queries, VECTOR_DIM), dtype=np.float32)
+    pool_size = max(args.clients, args.insert_concurrency)
+
+    sync_store = PgVectorStore(
+        get_session_factory(pool_size=pool_size, max_overflow=0), insert_mode="copy", batch_size=args.batch_size,
+    )
+    async_store = AsyncPgVectorStore(
+        pool=AsyncPgPool(min_size=pool_size, max_size=pool_size),
+        batch_size=args.batch_size,
+        insert_concurrency=args.insert_concurrency,
+    )
+
+    for label, store in (("psycopg copy", sync_store), ("asyncpg copy", async_store)):
+        elapsed = time_insert(store, batch)
+        print(f"{label:>16}: {args.rows} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+    qps = sync_queries(sync_store, queries, args.clients, args.top_k)
+    print(f"{'psycopg query':>16}: {qps:,.0f} QPS with {args.clients} threads")
+    qps = asyncio.run(async_queries(async_store, queries, args.clients, args.top_k))
+    print(f"{'asyncpg query':>16}: {qps:,.0f} QPS with {args.clients} coroutines")
+
+    sync_store.delete([BENCH_FILENAME])
+    async_store.close()
+
+
+if __name__ == "__main__":
+    main()
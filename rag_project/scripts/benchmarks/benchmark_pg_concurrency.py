@@ -0,0 +1,74 @@
+"""
+Query throughput of PgVectorStore under concurrent clients, with one
+connection shared by every request (the previous long-lived session) versus
+a connection pool with one session per request.
+
+Requires DATABASE_URL to point at a PostgreSQL database with pgvector and
+rows in `embeddings` (e.g. loaded by benchmark_pg_index). Each client thread
+issues `--queries` queries back to back; the pool's counters are printed
+after each run.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_pg_concurrency --clients 1 4 16 32
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from rag_project.adapters.database.connection import get_session_factory, pool_stats
+from rag_project.adapters.vector_store.pg_vector_store import PgVectorStore
+
+VECTOR_DIM = 384
+
+
+def run(store: PgVectorStore, clients: int, queries: int, top_k: int):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(seed: int):
+        rng = np.random.default_rng(seed)
+        local = []
+        for _ in range(queries):
+            start = time.perf_counter()
+            store.query(rng.standard_normal(VECTOR_DIM).astype(np.float32), top_k)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--index-type", default="hnsw")
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--max-overflow", type=int, default=16)
+    args = parser.parse_args()
+
+    setups = {
+        "single connection": {"pool_size": 1, "max_overflow": 0},
+        f"pool {args.pool_size}+{args.max_overflow}": {"pool_size": args.pool_size, "max_overflow": args.max_overflow},
+    }
+    print(f"{'setup':<20} {'clients':>7} {'QPS':>9} {'p99 ms':>8}  pool")
+    for label, pool_options in setups.items():
+        store = PgVectorStore(get_session_factory(**pool_options), index_type=args.index_type)
+        store.query(np.zeros(VECTOR_DIM, dtype=np.float32), args.top_k)  # warm up
+        for clients in args.clients:
+            qps, p99 = run(store, clients, args.queries, args.top_k)
+            print(f"{label:<20} {clients:>7} {qps:9.1f} {p99:8.2f}  {pool_stats(**pool_options)}")
+
+
+if __name__ == "__main__":
+    main()
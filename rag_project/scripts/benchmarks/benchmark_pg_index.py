@@ -0,0 +1,114 @@
+"""
+Query latency and recall@k of PgVectorStore with no index (sequential
+scan), HNSW and IVFFlat, over a sweep of ef_search / probes, optionally
+with halfvec or binary quantized indexes and exact re-scoring.
+
+Requires DATABASE_URL to point at a scratch PostgreSQL database with
+pgvector >= 0.7 and the schema from `schema_setup.init_db`: the benchmark
+loads `--rows` clustered vectors under a dedicated filename (skipped with
+`--reuse` if they are already there) and creates and drops indexes on
+`embeddings`. Recall is measured against the sequential-scan results,
+taken before any index is created.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_pg_index --rows 1000000 --quantizations none halfvec
+"""
+import argparse
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import text
+
+from rag_project.adapters.database.connection import get_engine, get_session_factory
+from rag_project.adapters.vector_store.pg_vector_store import PgVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+from rag_project.scripts.benchmarks.benchmark_faiss_ann import make_vectors, recall
+
+BENCH_FILENAME = "__benchmark_pg_index__"
+VECTOR_DIM = 384
+
+
+def load_rows(store: PgVectorStore, rows: int, clusters: int, batch_size: int = 10000) -> None:
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        count = min(batch_size, rows - offset)
+        vectors = make_vectors(rng, count, VECTOR_DIM, clusters)
+        chunks = [Chunk(filename=BENCH_FILENAME, chunk_id=offset + i, content="") for i in range(count)]
+        store.insert_batch(ChunkBatch(chunks=chunks, embeddings=vectors))
+    print(f"Loaded {rows} rows in {time.perf_counter() - start:.1f}s")
+
+
+def run_queries(store: PgVectorStore, queries: np.ndarray, top_k: int, **params):
+    results: List[List[int]] = []
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        records = store.query(query, top_k, **params)
+        timings.append((time.perf_counter() - start) * 1000)
+        results.append([record["id"] for record in records])
+    p50, p99 = np.percentile(timings, [50, 99])
+    return results, p50, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--ef-searches", type=int, nargs="+", default=[40, 100, 200])
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 10, 40])
+    parser.add_argument("--ivf-lists", type=int, default=1000)
+    parser.add_argument("--quantizations", nargs="+", default=["none"], choices=["none", "halfvec", "binary"])
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--maintenance-work-mem", default="2GB")
+    parser.add_argument("--reuse", action="store_true", help="keep rows loaded by an earlier run")
+    args = parser.parse_args()
+
+    session_factory = get_session_factory()
+    stores = {
+        (index_type, quantization): PgVectorStore(
+            session_factory, vector_dim=VECTOR_DIM, index_type=index_type, quantization=quantization,
+            ivf_lists=args.ivf_lists, rescore_factor=args.rescore_factor,
+            maintenance_work_mem=args.maintenance_work_mem,
+        )
+        for index_type in ("hnsw", "ivfflat")
+        for quantization in args.quantizations
+    }
+    for store in stores.values():
+        store.drop_index()
+
+    plain = PgVectorStore(session_factory, insert_mode="copy", batch_size=10000)
+    if not args.reuse:
+        plain.delete([BENCH_FILENAME])
+        load_rows(plain, args.rows, args.clusters)
+        with get_engine().connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM ANALYZE embeddings"))
+
+    rng = np.random.default_rng(1)
+    queries = make_vectors(rng, args.queries, VECTOR_DIM, args.clusters)
+    truth, p50, p99 = run_queries(plain, queries, args.top_k)
+    print(f"{'index':<18} {'params':<14} {'build s':>8} {f'recall@{args.top_k}':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    print(f"{'seqscan':<18} {'-':<14} {'-':>8} {1.0:10.3f} {p50:8.2f} {p99:8.2f}")
+
+    for index_type, sweep in (("hnsw", [{"ef_search": ef} for ef in args.ef_searches]),
+                              ("ivfflat", [{"probes": probes} for probes in args.probes])):
+        for quantization in args.quantizations:
+            store = stores[index_type, quantization]
+            start = time.perf_counter()
+            store.create_index()
+            build_time = time.perf_counter() - start
+            label = index_type if quantization == "none" else f"{index_type}+{quantization}"
+            for params in sweep:
+                results, p50, p99 = run_queries(store, queries, args.top_k, **params)
+                name, value = next(iter(params.items()))
+                print(f"{label:<18} {f'{name}={value}':<14} {build_time:8.1f} "
+                      f"{recall(results, truth):10.3f} {p50:8.2f} {p99:8.2f}")
+            store.drop_index()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare PgVectorStore insert modes (ORM, executemany, COPY) in rows/sec.
+
+Requires DATABASE_URL to point at a PostgreSQL database with pgvector and the
+schema from `schema_setup.init_db`. Benchmark rows use a dedicated filename
+and are deleted after each run.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_pg_insert --rows 20000 --batch-size 1000
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from rag_project.adapters.database.connection import get_session_factory
+from rag_project.adapters.vector_store.pg_vector_store import INSERT_MODES, PgVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.scripts.benchmarks.common import random_text
+
+BENCH_FILENAME = "__benchmark_pg_insert__"
+VECTOR_DIM = 384
+
+
+def make_chunks(num_rows: int) -> List[Chunk]:
+    rng = random.Random(42)
+    return [
+        Chunk(
+            filename=BENCH_FILENAME,
+            chunk_id=i,
+            content=random_text(rng, 80),
+            embedding=[rng.uniform(-1, 1) for _ in range(VECTOR_DIM)],
+        )
+        for i in range(num_rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", default=list(INSERT_MODES), choices=INSERT_MODES)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.rows)
+    session_factory = get_session_factory()
+    for mode in args.modes:
+        store = PgVectorStore(session_factory, insert_mode=mode, batch_size=args.batch_size)
+        store.delete([BENCH_FILENAME])
+
+        start = time.perf_counter()
+        store.insert(chunks)
+        elapsed = time.perf_counter() - start
+
+        store.delete([BENCH_FILENAME])
+        print(f"{mode:>12}: {args.rows} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Throughput of FaissVectorStore.query_batch (one FAISS search over the query
+matrix) against calling FaissVectorStore.query once per query, for each
+index type and several batch sizes. Results of both paths are checked to be
+identical.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_query_batch --vectors 50000 --queries 2000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.scripts.benchmarks.benchmark_faiss_ann import build, make_vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 256, 2000])
+    parser.add_argument("--index-types", nargs="+", default=["flat", "hnsw", "ivf_flat"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(rng, args.vectors, args.dim, args.clusters)
+    queries = vectors[rng.integers(0, len(vectors), args.queries)] + 0.05 * rng.standard_normal(
+        (args.queries, args.dim)
+    ).astype(np.float32)
+
+    print(f"{'index':<10} {'mode':<16} {'QPS':>10} {'speed-up':>9}")
+    for index_type in args.index_types:
+        store = FaissVectorStore(args.dim, index_type=index_type, nlist=256)
+        build(store, vectors)
+
+        start = time.perf_counter()
+        single = [store.query(query, args.top_k) for query in queries]
+        single_qps = len(queries) / (time.perf_counter() - start)
+        print(f"{index_type:<10} {'one at a time':<16} {single_qps:10,.0f} {1.0:8.1f}x")
+
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            batched = []
+            for offset in range(0, len(queries), batch_size):
+                batched.extend(store.query_batch(queries[offset:offset + batch_size], args.top_k))
+            qps = len(queries) / (time.perf_counter() - start)
+            assert [[r["chunk_id"] for r in hits] for hits in batched] == [[r["chunk_id"] for r in hits] for hits in single]
+            print(f"{index_type:<10} {f'batch {batch_size}':<16} {qps:10,.0f} {qps / single_qps:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
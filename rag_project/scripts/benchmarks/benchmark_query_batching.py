@@ -0,0 +1,127 @@
+"""
+Throughput versus latency of query embedding under concurrent load, with
+and without the micro-batching query encoder.
+
+An open-loop load generator issues queries at a fixed rate (Poisson
+arrivals); latency is measured from each query's scheduled arrival to the
+moment its embedding is available, so queueing delay is included. The
+unbatched baseline serves queries from a pool of `--clients` threads that
+each call the backend directly.
+
+By default the backend is simulated: one forward pass at a time costs
+`--overhead-ms` plus `--per-query-ms` per query in the batch, which is the
+shape of a small transformer on CPU. Pass `--backend onnx` or
+`--backend sentence_transformers` to measure a real model.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_query_batching --rates 200 500 1000
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from rag_project.core.services.query_batcher import MicroBatchingQueryEncoder
+from rag_project.scripts.benchmarks.common import random_text
+
+
+class SimulatedBackend:
+    """
+    Sleep-based cost model of an embedding model that runs one batch at a time.
+    """
+    def __init__(self, overhead_ms: float, per_query_ms: float, dimension: int = 384):
+        self.overhead = overhead_ms / 1000
+        self.per_query = per_query_ms / 1000
+        self.dimension = dimension
+        self._lock = threading.Lock()
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        with self._lock:
+            time.sleep(self.overhead + self.per_query * len(texts))
+        return np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+
+def make_backend(args):
+    if args.backend == "onnx":
+        from rag_project.adapters.embedding.onnx_backend import OnnxEmbeddingBackend
+        return OnnxEmbeddingBackend(args.model)
+    if args.backend == "sentence_transformers":
+        from rag_project.adapters.embedding.sentence_transformer_backend import SentenceTransformerBackend
+        return SentenceTransformerBackend(args.model)
+    return SimulatedBackend(args.overhead_ms, args.per_query_ms)
+
+
+def run_load(submit, queries: List[str], rate: float, seed: int) -> List[float]:
+    """
+    Issue `queries` at `rate` per second and return per-query latencies in ms.
+    `submit(query)` must return a concurrent.futures.Future.
+    """
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    futures = []
+    scheduled = time.perf_counter()
+    for query in queries:
+        scheduled += rng.expovariate(rate)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        future = submit(query)
+        future.add_done_callback(lambda _, at=scheduled: latencies.append((time.perf_counter() - at) * 1000))
+        futures.append(future)
+    for future in futures:
+        future.result()
+    return latencies
+
+
+def report(label: str, rate: float, latencies: List[float], elapsed: float, extra: str = "") -> None:
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{label:<22} {rate:>7.0f} {len(latencies) / elapsed:>9.1f} {p50:>8.2f} {p99:>9.2f} {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=["simulated", "onnx", "sentence_transformers"], default="simulated")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--overhead-ms", type=float, default=4.0)
+    parser.add_argument("--per-query-ms", type=float, default=0.25)
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 200, 500, 1000])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32])
+    parser.add_argument("--delays-ms", type=float, nargs="+", default=[1.0, 2.0, 5.0])
+    args = parser.parse_args()
+
+    backend = make_backend(args)
+    rng = random.Random(42)
+    queries = [random_text(rng, rng.randint(4, 16)) for _ in range(args.queries)]
+    backend.encode(queries[:32])  # load and warm up
+
+    print(f"{'mode':<22} {'rate/s':>7} {'served/s':>9} {'p50 ms':>8} {'p99 ms':>9}")
+    for rate in args.rates:
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            start = time.perf_counter()
+            latencies = run_load(lambda query: pool.submit(backend.encode, [query]), queries, rate, seed=1)
+            report("unbatched", rate, latencies, time.perf_counter() - start)
+
+        for batch_size in args.batch_sizes:
+            for delay_ms in args.delays_ms:
+                batcher = MicroBatchingQueryEncoder(
+                    lambda texts: backend.encode(texts, batch_size=len(texts)),
+                    max_batch_size=batch_size,
+                    max_delay_ms=delay_ms,
+                )
+                start = time.perf_counter()
+                latencies = run_load(batcher.submit, queries, rate, seed=1)
+                elapsed = time.perf_counter() - start
+                batcher.close()
+                mean_batch = batcher.stats()["mean_batch_size"]
+                report(f"batch={batch_size} delay={delay_ms}ms", rate, latencies, elapsed,
+                       f"mean batch {mean_batch:.1f}")
+
+
+if __name__ == "__main__":
+    main()
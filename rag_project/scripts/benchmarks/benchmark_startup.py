@@ -0,0 +1,76 @@
+"""
+Track cold-start cost of the pipeline: importing rag_project.core.pipeline,
+constructing PipelineSingleton, and first access to selected components.
+Also lists which heavy third-party packages each stage pulled in.
+
+Each run uses a fresh interpreter so nothing is already imported.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_startup --components cleaner chunker registry
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_PACKAGES = (
+    "torch", "sentence_transformers", "transformers", "onnxruntime", "faiss",
+    "sqlalchemy", "pgvector", "pdfplumber", "bs4", "ijson", "requests", "langchain",
+)
+
+
+def heavy_modules():
+    return sorted({name.split(".")[0] for name in sys.modules} & set(HEAVY_PACKAGES))
+
+
+def child(components):
+    start = time.perf_counter()
+    from rag_project.core.pipeline import PipelineSingleton
+    import_time = time.perf_counter() - start
+    import_heavy = heavy_modules()
+
+    start = time.perf_counter()
+    pipeline = PipelineSingleton()
+    construct_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in components:
+        getattr(pipeline, name)
+    access_time = time.perf_counter() - start
+
+    print(f"{import_time:.4f} {construct_time:.4f} {access_time:.4f} "
+          f"{','.join(import_heavy) or '-'} {','.join(heavy_modules()) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--components", nargs="*", default=["cleaner", "chunker", "registry"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.components)
+        return
+
+    rows = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", __spec__.name, "--child", "--components", *args.components],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        rows.append(output)
+
+    import_time, construct_time, access_time = (
+        statistics.median(float(row[column]) for row in rows) for column in range(3)
+    )
+    print(f"Median of {args.runs} cold starts:")
+    print(f"  import pipeline module:   {import_time * 1000:8.1f} ms (heavy packages: {rows[-1][3]})")
+    print(f"  PipelineSingleton():      {construct_time * 1000:8.1f} ms")
+    print(f"  access {' '.join(args.components) or 'nothing'}: {access_time * 1000:8.1f} ms "
+          f"(heavy packages: {rows[-1][4]})")
+
+
+if __name__ == "__main__":
+    main()
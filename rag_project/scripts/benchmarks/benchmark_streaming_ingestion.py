@@ -0,0 +1,79 @@
+"""
+Measure peak RSS of whole-corpus versus streaming ingestion for growing
+corpus sizes. Embeddings are faked with random 384-d vectors so the numbers
+reflect the pipeline's own buffering rather than the model.
+
+Each measurement runs in a fresh subprocess so peak RSS is not shared.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_streaming_ingestion --sizes 500 2000 8000
+"""
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.adapters.loader.text_loader import TextLoader
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.services.data_service import DataService
+from rag_project.scripts.benchmarks.common import NullMetadataRepo, NullSaver, build_corpus
+
+VECTOR_DIM = 384
+
+
+def fake_embed(chunks: List[Chunk]) -> None:
+    rng = random.Random(0)
+    for chunk in chunks:
+        chunk.embedding = [rng.random() for _ in range(VECTOR_DIM)]
+
+
+def measure(mode: str, num_files: int, words: int, batch_size: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        build_corpus(directory, num_files, words)
+        service = DataService([TextLoader()], SimpleCleaner(), BasicChunker(), NullSaver(), NullMetadataRepo())
+
+        start = time.perf_counter()
+        inserted = 0
+        if mode == "full":
+            chunks = service.process_files(directory)
+            fake_embed(chunks)
+            inserted = len(chunks)
+        else:
+            for batch in service.iter_chunk_batches(directory, batch_size):
+                fake_embed(batch)
+                inserted += len(batch)
+        elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>9} files={num_files:<7} chunks={inserted:<8} peak_rss={peak_mb:8.1f} MB time={elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "FILES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child[0], int(args.child[1]), args.words, args.batch_size)
+        return
+
+    for size in args.sizes:
+        for mode in ("full", "streaming"):
+            subprocess.run(
+                [sys.executable, "-m", __spec__.name, "--child", mode, str(size),
+                 "--words", str(args.words), "--batch-size", str(args.batch_size)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Measure peak RSS and time of the original whole-file loaders versus the
+streaming notebook, JSON and HTML loaders on large synthetic files.
+
+Each measurement runs in a fresh subprocess so peak RSS is not shared.
+
+Usage:
+    python -m rag_project.scripts.benchmarks.benchmark_streaming_loaders --mb 200
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+from rag_project.adapters.loader.html_json_adapter import HtmlLoader, JsonLoader
+from rag_project.adapters.loader.notebook_adapter import NotebookLoader
+from rag_project.scripts.benchmarks.common import random_text
+
+FORMATS = ("notebook", "json", "html")
+
+
+def original_notebook(path: str) -> int:
+    with open(path, 'r', encoding='utf-8') as file:
+        notebook = json.load(file)
+    content = "\n".join(
+        "".join(cell.get("source", []))
+        for cell in notebook.get("cells", []) if cell.get("cell_type") == "markdown"
+    )
+    return len(content)
+
+
+def original_json(path: str) -> int:
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    return len(json.dumps(data, indent=2))
+
+
+def original_html(path: str) -> int:
+    with open(path, 'r', encoding='utf-8') as file:
+        soup = BeautifulSoup(file, "html.parser")
+    return len(soup.get_text())
+
+
+def streaming_notebook(path: str) -> int:
+    return len(NotebookLoader().load(path).content)
+
+
+def streaming_json(path: str) -> int:
+    return sum(len(part.content) for part in JsonLoader().load_parts(path))
+
+
+def streaming_html(path: str) -> int:
+    return sum(len(part.content) for part in HtmlLoader().load_parts(path))
+
+
+def build_file(fmt: str, path: str, target_mb: int) -> None:
+    rng = random.Random(42)
+    target = target_mb * 1024 * 1024
+    size = 0
+    with open(path, "w", encoding="utf-8") as file:
+        if fmt == "notebook":
+            # Markdown cells interleaved with code cells carrying ~1 MB image outputs
+            file.write('{"cells": [')
+            index = 0
+            while size < target:
+                image = base64.b64encode(rng.randbytes(768 * 1024)).decode("ascii")
+                cells = [
+                    {"cell_type": "markdown", "metadata": {}, "source": [random_text(rng, 200)]},
+                    {"cell_type": "code", "execution_count": index, "metadata": {}, "source": ["plot()"],
+                     "outputs": [{"output_type": "display_data", "data": {"image/png": image}, "metadata": {}}]},
+                ]
+                text = ("," if index else "") + ",".join(json.dumps(cell) for cell in cells)
+                file.write(text)
+                size += len(text)
+                index += 1
+            file.write('], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}')
+        elif fmt == "json":
+            file.write("[")
+            index = 0
+            while size < target:
+                record = {"id": index, "score": rng.random(), "tags": [random_text(rng, 1) for _ in range(3)],
+                          "body": random_text(rng, 40), "meta": {"ok": True, "parent": None}}
+                text = ("," if index else "") + json.dumps(record)
+                file.write(text)
+                size += len(text)
+                index += 1
+            file.write("]")
+        else:
+            file.write("<!DOCTYPE html><html><head><title>Synthetic</title></head><body>")
+            while size < target:
+                text = (f"<div class=\"section\"><h2>{random_text(rng, 4)}</h2>"
+                        f"<p>{random_text(rng, 60)} <a href=\"#x\">{random_text(rng, 2)}</a></p>"
+                        f"<script>var x = 1;</script></div>\n")
+                file.write(text)
+                size += len(text)
+            file.write("</body></html>")
+
+
+def measure(fmt: str, mode: str, path: str) -> None:
+    loader = globals()[f"{mode}_{fmt}"]
+    start = time.perf_counter()
+    length = loader(path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    file_mb = os.path.getsize(path) / 1024 / 1024
+    print(f"{fmt:>8} {mode:>9} file={file_mb:7.1f} MB text={length:<11} "
+          f"peak_rss={peak_mb:8.1f} MB time={elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=100, help="Approximate size of each synthetic file")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--child", nargs=3, metavar=("FORMAT", "MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats:
+            path = os.path.join(directory, f"large_{fmt}")
+            build_file(fmt, path, args.mb)
+            for mode in ("original", "streaming"):
+                subprocess.run([sys.executable, "-m", __spec__.name, "--child", fmt, mode, path], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Shared helpers for the benchmark scripts: synthetic corpora and no-op adapters.
+"""
+import os
+import random
+from typing import Dict, List
+
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.ports.metadata_repository_port import MetadataRepositoryPort
+from rag_project.core.ports.saver_port import SaverPort
+
+WORDS = ["graph", "chain", "agent", "tool", "retriever", "prompt", "model", "state", "node", "edge"]
+
+
+class NullSaver(SaverPort):
+    def save_chunks(self, chunks: List[Chunk]) -> None:
+        pass
+
+    def delete_chunks(self, filenames: List[str]) -> None:
+        pass
+
+
+class NullMetadataRepo(MetadataRepositoryPort):
+    def insert_metadata(self, filename: str, source: str, ingestion_timestamp: str):
+        pass
+
+    def insert_metadata_batch(self, entries: List[Dict[str, str]]):
+        pass
+
+    def fetch_metadata(self):
+        return []
+
+    def delete_metadata(self, filenames: List[str]):
+        pass
+
+    def fetch_manifest(self) -> Dict[str, str]:
+        return {}
+
+    def update_manifest(self, entries: Dict[str, str]):
+        pass
+
+    def delete_manifest(self, filepaths: List[str]):
+        pass
+
+
+def random_text(rng: random.Random, num_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(num_words))
+
+
+def build_corpus(directory: str, num_files: int, words_per_file: int, seed: int = 42) -> None:
+    """
+    Write `num_files` synthetic text files of `words_per_file` words into `directory`.
+    """
+    rng = random.Random(seed)
+    for i in range(num_files):
+        with open(os.path.join(directory, f"doc_{i:06d}.txt"), "w", encoding="utf-8") as file:
+            file.write(random_text(rng, words_per_file))
+
+
+def build_pdf(path: str, num_pages: int, lines_per_page: int = 40, words_per_line: int = 12, seed: int = 42) -> None:
+    """
+    Write a minimal multi-page PDF with a Helvetica text layer, without any
+    PDF-writing dependency.
+    """
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for _ in range(num_pages):
+        lines = [random_text(rng, words_per_line) for _ in range(lines_per_page)]
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream.encode("ascii")))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>".encode("ascii")
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as file:
+        file.write(data)
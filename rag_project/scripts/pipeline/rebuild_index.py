@@ -0,0 +1,9 @@
+from rag_project.core.pipeline import PipelineSingleton
+
+if __name__ == "__main__":
+    pipeline = PipelineSingleton()
+    if pipeline.vector_store_type != "pgvector":
+        raise SystemExit("Index rebuilds apply to the pgvector store only")
+    print(f"🔧 Rebuilding {pipeline.vector_store.index_name}...")
+    pipeline.vector_store.rebuild_index()
+    print("✅ Index rebuilt")
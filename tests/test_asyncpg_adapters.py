@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+
+from rag_project.adapters.database.async_connection import AsyncPgPool, asyncpg_dsn
+from rag_project.adapters.vector_store.asyncpg_vector_store import AsyncPgVectorStore
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+
+def test_dsn_drops_the_sqlalchemy_driver():
+    assert asyncpg_dsn("postgresql+psycopg://user:pw@host:5432/db") == "postgresql://user:pw@host:5432/db"
+    assert asyncpg_dsn("postgres://user@host/db") == "postgres://user@host/db"
+
+
+def test_query_uses_positional_parameters():
+    pool = AsyncPgPool(dsn="postgresql://localhost/unused")
+    plain = AsyncPgVectorStore(pool=pool, index_type="hnsw")
+    assert "CAST($1 AS vector)" in plain._query_sql
+    assert "LIMIT $2" in plain._query_sql
+    assert "$3" not in plain._query_sql
+
+    rescored = AsyncPgVectorStore(pool=pool, index_type="hnsw", quantization="halfvec", rescore_factor=4)
+    assert "CAST($1 AS vector)::halfvec(384)" in rescored._query_sql
+    assert "LIMIT $3" in rescored._query_sql
+    assert ":embedding" not in rescored._query_sql and ":candidates" not in rescored._query_sql
+
+
+def test_pool_runs_coroutines_on_its_background_loop():
+    pool = AsyncPgPool(dsn="postgresql://localhost/unused")
+
+    async def loop_name():
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop()
+
+    loop = pool.run(loop_name())
+    assert loop is pool.run(loop_name())
+    pool.close()
+    assert pool._loop is None
+
+
+def test_port_async_methods_default_to_the_sync_ones():
+    store = FaissVectorStore(vector_dim=4)
+    vectors = np.eye(4, dtype=np.float32)
+    chunks = [Chunk(filename=f"doc{i}.txt", chunk_id=i, content=f"chunk {i}") for i in range(4)]
+
+    async def scenario():
+        await store.ainsert_batch(ChunkBatch(chunks=chunks, embeddings=vectors))
+        found = await store.aquery(vectors[2], top_k=1)
+        await store.adelete(["doc2.txt"])
+        return found, await store.aquery(vectors[2], top_k=1)
+
+    found, after_delete = asyncio.run(scenario())
+    assert found[0]["chunk_id"] == 2
+    assert after_delete[0]["chunk_id"] != 2
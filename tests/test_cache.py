@@ -0,0 +1,29 @@
+from rag_project.core.services.cache import LRUCache, TTLCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_ttl_entries_expire_and_invalidate():
+    now = [0.0]
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=lambda: now[0])
+    cache.put("q", ["result"])
+    now[0] = 4.9
+    assert cache.get("q") == ["result"]
+    now[0] = 5.0
+    assert cache.get("q") is None
+    assert len(cache) == 0
+
+    cache.put("q", ["result"])
+    cache.invalidate()
+    assert cache.get("q") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 2, "hit_rate": 1 / 3, "invalidations": 1}
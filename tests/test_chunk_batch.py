@@ -0,0 +1,56 @@
+import json
+import struct
+import numpy as np
+import pytest
+from rag_project.adapters.vector_store.pg_vector_store import _copy_binary
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+
+def _batch(rows=3, dim=4):
+    chunks = [Chunk(filename="dir/é.txt", chunk_id=i, content=f"line\t{i}\n", metadata={"page": i}) for i in range(rows)]
+    return ChunkBatch(chunks=chunks, embeddings=np.arange(rows * dim, dtype=np.float32).reshape(rows, dim))
+
+
+def test_float32_matrix_is_not_copied():
+    matrix = np.zeros((2, 3), dtype=np.float32)
+    batch = ChunkBatch(chunks=[Chunk(filename="a", chunk_id=i, content="") for i in range(2)], embeddings=matrix)
+    assert batch.embeddings is matrix
+    assert batch.slice(1, 2).embeddings.base is matrix
+
+
+def test_rows_must_match_chunks():
+    with pytest.raises(ValueError):
+        ChunkBatch(chunks=[Chunk(filename="a", chunk_id=0, content="")], embeddings=np.zeros((2, 3)))
+
+
+def test_copy_binary_round_trip():
+    """
+    Decoding the COPY BINARY stream gives back every field of every row.
+    """
+    batch = _batch()
+    data = _copy_binary(batch)
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+
+    position = 19
+    rows = []
+    while True:
+        (count,) = struct.unpack_from("!h", data, position)
+        position += 2
+        if count == -1:
+            break
+        fields = []
+        for _ in range(count):
+            (length,) = struct.unpack_from("!i", data, position)
+            fields.append(data[position + 4:position + 4 + length])
+            position += 4 + length
+        rows.append(fields)
+    assert position == len(data)
+
+    for chunk, vector, (filename, chunk_id, content, embedding, metadata) in zip(batch.chunks, batch.embeddings, rows):
+        assert filename.decode("utf-8") == chunk.filename
+        assert struct.unpack("!i", chunk_id)[0] == chunk.chunk_id
+        assert content.decode("utf-8") == chunk.content
+        assert struct.unpack("!hh", embedding[:4]) == (len(vector), 0)
+        assert np.array_equal(np.frombuffer(embedding[4:], dtype=">f4"), vector)
+        assert json.loads(metadata) == chunk.metadata
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from rag_project.adapters.database.connection import PoolMetrics, session_scope
+
+
+def test_session_scope_commits_rolls_back_and_returns_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    metrics = PoolMetrics(engine)
+    factory = sessionmaker(bind=engine)
+    with session_scope(factory) as session:
+        session.execute(text("CREATE TABLE items (name TEXT)"))
+        session.execute(text("INSERT INTO items VALUES ('kept')"))
+
+    with pytest.raises(RuntimeError):
+        with session_scope(factory) as session:
+            session.execute(text("INSERT INTO items VALUES ('dropped')"))
+            raise RuntimeError("request failed")
+
+    with session_scope(factory) as session:
+        assert session.execute(text("SELECT name FROM items")).scalars().all() == ["kept"]
+    stats = metrics.stats()
+    assert stats["checkouts"] == 3 and stats["checkedout"] == 0
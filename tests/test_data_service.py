@@ -0,0 +1,205 @@
+import pytest
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.adapters.loader.text_loader import TextLoader
+from rag_project.adapters.metadata.metadata_sqlite import MetadataSQLite
+from rag_project.adapters.saver.file_saver import FileSaver
+from rag_project.adapters.saver.packed_saver import PackedChunkSaver
+from rag_project.core.services.data_service import DataService
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    raw = tmp_path / "raw"
+    (raw / "sub").mkdir(parents=True)
+    (raw / "a.txt").write_text("alpha " * 20, encoding="utf-8")
+    (raw / "b.txt").write_text("beta " * 20, encoding="utf-8")
+    (raw / "sub" / "a.txt").write_text("nested " * 20, encoding="utf-8")
+    (raw / "ignored.bin").write_bytes(b"\x00\x01")
+    return raw
+
+
+@pytest.fixture
+def service(tmp_path):
+    metadata = MetadataSQLite(str(tmp_path / "metadata.db"))
+    saver = PackedChunkSaver(str(tmp_path / "processed"))
+    yield DataService([TextLoader()], SimpleCleaner(), BasicChunker(chunk_size=32, overlap=8), saver, metadata)
+    saver.close()
+    metadata.close()
+
+
+def test_first_sync_plans_every_file_and_commit_records_them(raw_dir, service):
+    plan = service.plan_sync(str(raw_dir))
+    assert plan.new == ["a.txt", "b.txt", "sub/a.txt"]
+    assert plan.changed == plan.deleted == plan.unchanged == []
+    assert sorted(plan.hashes) == plan.new
+
+    service.commit_sync(plan)
+    assert service.metadata_repo.fetch_manifest() == plan.hashes
+
+    again = service.plan_sync(str(raw_dir))
+    assert again.unchanged == ["a.txt", "b.txt", "sub/a.txt"]
+    assert again.to_ingest() == again.stale() == []
+    assert again.hashes == {}
+
+
+def test_sync_detects_changed_deleted_and_new_files(raw_dir, service):
+    service.commit_sync(service.plan_sync(str(raw_dir)))
+
+    (raw_dir / "a.txt").write_text("changed " * 20, encoding="utf-8")
+    (raw_dir / "b.txt").unlink()
+    (raw_dir / "sub" / "c.txt").write_text("new " * 20, encoding="utf-8")
+    # Rewriting a file with the same content keeps it unchanged
+    (raw_dir / "sub" / "a.txt").write_text("nested " * 20, encoding="utf-8")
+
+    plan = service.plan_sync(str(raw_dir))
+    assert plan.new == ["sub/c.txt"]
+    assert plan.changed == ["a.txt"]
+    assert plan.deleted == ["b.txt"]
+    assert plan.unchanged == ["sub/a.txt"]
+    assert plan.to_ingest() == ["sub/c.txt", "a.txt"]
+    assert plan.stale() == ["sub/c.txt", "a.txt", "b.txt"]
+
+    chunks = [chunk for document in service.iter_document_chunks(str(raw_dir), files=plan.to_ingest()) for chunk in document]
+    assert {chunk.filename for chunk in chunks} == {"a.txt", "sub/c.txt"}
+
+    previous = service.metadata_repo.fetch_manifest()
+    service.commit_sync(plan)
+    manifest = service.metadata_repo.fetch_manifest()
+    assert sorted(manifest) == ["a.txt", "sub/a.txt", "sub/c.txt"]
+    assert manifest["a.txt"] != previous["a.txt"]
+    assert manifest["sub/a.txt"] == previous["sub/a.txt"]
+
+
+def test_an_uncommitted_sync_is_planned_again(raw_dir, service):
+    first = service.plan_sync(str(raw_dir))
+    # Ingestion was interrupted before commit_sync: the files are still new
+    assert service.plan_sync(str(raw_dir)) == first
+    assert service.metadata_repo.fetch_manifest() == {}
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_serial_and_pooled_ingestion_store_the_same_chunks(raw_dir, service, num_workers):
+    tasks = service._collect_tasks(str(raw_dir))
+    assert [relpath for _, _, relpath in tasks] == ["a.txt", "b.txt", "sub/a.txt"]
+
+    chunks = service.process_files(str(raw_dir), num_workers=num_workers)
+    expected = service.process_files(str(raw_dir), num_workers=1)
+    assert [(chunk.filename, chunk.chunk_id, chunk.content) for chunk in chunks] == [
+        (chunk.filename, chunk.chunk_id, chunk.content) for chunk in expected
+    ]
+    assert list(dict.fromkeys(chunk.filename for chunk in chunks)) == ["a.txt", "b.txt", "sub/a.txt"]
+
+    # Every document was saved and recorded in this process
+    for chunk in chunks:
+        assert service.saver.get_chunk(chunk.filename, chunk.chunk_id).content == chunk.content
+    recorded = [row[1] for row in service.metadata_repo.fetch_metadata()]
+    assert recorded[:3] == ["a.txt", "b.txt", "sub/a.txt"]
+    assert {row[2] for row in service.metadata_repo.fetch_metadata()} == {"TXT"}
+
+
+def test_pooled_ingestion_yields_documents_in_listing_order(raw_dir, service):
+    for index in range(10):
+        (raw_dir / f"doc{index:02d}.txt").write_text(f"document {index} " * 10, encoding="utf-8")
+    documents = list(service.iter_document_chunks(str(raw_dir), num_workers=2))
+    assert [chunks[0].filename for chunks in documents] == [
+        relpath for _, _, relpath in service._collect_tasks(str(raw_dir))
+    ]
+
+
+@pytest.mark.parametrize("saver_class", [FileSaver, PackedChunkSaver])
+def test_removed_files_lose_their_saved_chunks_and_metadata(raw_dir, tmp_path, saver_class):
+    (raw_dir / "a.txt.txt").write_text("suffix " * 20, encoding="utf-8")
+    metadata = MetadataSQLite(str(tmp_path / "removed.db"))
+    output_dir = tmp_path / "removed"
+    saver = saver_class(str(output_dir))
+    service = DataService([TextLoader()], SimpleCleaner(), BasicChunker(chunk_size=32, overlap=8), saver, metadata)
+    chunks = service.process_files(str(raw_dir))
+
+    service.remove_files(["a.txt", "sub/a.txt", "missing.txt"])
+    assert sorted(row[1] for row in metadata.fetch_metadata()) == ["a.txt.txt", "b.txt"]
+    if saver_class is FileSaver:
+        remaining = sorted(path.relative_to(output_dir).as_posix() for path in output_dir.rglob("*.txt"))
+        assert remaining == sorted(
+            f"{chunk.filename}_chunk_{chunk.chunk_id}.txt" for chunk in chunks
+            if chunk.filename in ("a.txt.txt", "b.txt")
+        )
+    else:
+        assert {filename for filename, _ in saver.keys()} == {"a.txt.txt", "b.txt"}
+        saver.close()
+    metadata.close()
+
+
+class RecordingMetadata(MetadataSQLite):
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.batches = []
+
+    def insert_metadata_batch(self, entries):
+        self.batches.append([entry["filename"] for entry in entries])
+        super().insert_metadata_batch(entries)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_metadata_is_written_in_batches_and_flushed_when_the_consumer_stops(raw_dir, tmp_path, num_workers):
+    for index in range(4):
+        (raw_dir / f"doc{index}.txt").write_text(f"document {index}", encoding="utf-8")
+    metadata = RecordingMetadata(str(tmp_path / "recorded.db"))
+    saver = PackedChunkSaver(str(tmp_path / "batched"))
+    service = DataService(
+        [TextLoader()], SimpleCleaner(), BasicChunker(chunk_size=32, overlap=8), saver, metadata,
+        metadata_batch_size=3,
+    )
+
+    service.process_files(str(raw_dir), num_workers=num_workers)
+    assert metadata.batches == [
+        ["a.txt", "b.txt", "doc0.txt"], ["doc1.txt", "doc2.txt", "doc3.txt"], ["sub/a.txt"],
+    ]
+
+    # Stopping after two documents still records both
+    metadata.batches.clear()
+    documents = service.iter_document_chunks(str(raw_dir), num_workers=num_workers)
+    next(documents)
+    next(documents)
+    documents.close()
+    assert metadata.batches == [["a.txt", "b.txt"]]
+    assert len(metadata.fetch_metadata()) == 9
+    saver.close()
+    metadata.close()
+
+
+def test_yielded_documents_wait_for_at_most_one_metadata_batch(raw_dir, tmp_path):
+    for index in range(5):
+        (raw_dir / f"doc{index}.txt").write_text(f"document {index}", encoding="utf-8")
+    metadata = MetadataSQLite(str(tmp_path / "window.db"))
+    saver = PackedChunkSaver(str(tmp_path / "window"))
+    service = DataService(
+        [TextLoader()], SimpleCleaner(), BasicChunker(chunk_size=32, overlap=8), saver, metadata,
+        metadata_batch_size=3,
+    )
+    recorded = []
+    for yielded, chunks in enumerate(service.iter_document_chunks(str(raw_dir)), start=1):
+        # Chunks are saved before the document is yielded
+        assert all((chunk.filename, chunk.chunk_id) in saver for chunk in chunks)
+        recorded.append(len(metadata.fetch_metadata()))
+        assert yielded - 2 <= recorded[-1] <= yielded
+    assert recorded == [0, 0, 3, 3, 3, 6, 6, 6]
+    assert len(metadata.fetch_metadata()) == 8
+    saver.close()
+    metadata.close()
+
+
+def test_a_failing_metadata_batch_is_rolled_back_as_a_whole(tmp_path):
+    metadata = MetadataSQLite(str(tmp_path / "metadata.db"))
+    entries = [
+        {"filename": "a.txt", "source": "TXT", "ingestion_timestamp": "2024-01-01T00:00:00"},
+        {"filename": "b.txt", "source": "TXT"},
+    ]
+    with pytest.raises(Exception):
+        metadata.insert_metadata_batch(entries)
+    assert metadata.fetch_metadata() == []
+
+    metadata.insert_metadata_batch(entries[:1])
+    assert [row[1] for row in metadata.fetch_metadata()] == ["a.txt"]
+    metadata.close()
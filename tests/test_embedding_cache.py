@@ -0,0 +1,33 @@
+import numpy as np
+from rag_project.adapters.cache.sqlite_embedding_cache import SqliteEmbeddingCache
+
+
+def _vectors(keys, dim=4):
+    return {key: np.full(dim, index, dtype=np.float32) for index, key in enumerate(keys)}
+
+
+def test_round_trip_is_keyed_by_model(tmp_path):
+    """
+    Vectors come back as float32 and only for the model that stored them.
+    """
+    cache = SqliteEmbeddingCache(str(tmp_path / "cache.db"))
+    cache.put_many("model-a", _vectors([b"x", b"y"]))
+
+    found = cache.get_many("model-a", [b"x", b"y", b"z"])
+    assert set(found) == {b"x", b"y"}
+    assert found[b"y"].dtype == np.float32
+    assert np.array_equal(found[b"y"], np.full(4, 1, dtype=np.float32))
+    assert cache.get_many("model-b", [b"x"]) == {}
+
+
+def test_evicts_least_recently_used(tmp_path):
+    """
+    Once the size limit is exceeded, entries that were not read recently go first.
+    """
+    cache = SqliteEmbeddingCache(str(tmp_path / "cache.db"), max_bytes=3 * 16, evict_to=1.0)
+    cache.put_many("m", _vectors([b"a", b"b", b"c"]))
+    cache.get_many("m", [b"a", b"c"])
+    cache.put_many("m", _vectors([b"d"]))
+
+    assert set(cache.get_many("m", [b"a", b"b", b"c", b"d"])) == {b"a", b"c", b"d"}
+    assert cache.total_bytes == 3 * 16
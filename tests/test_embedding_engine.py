@@ -0,0 +1,81 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.ports.embedding_backend_port import EmbeddingBackendPort
+from rag_project.core.services.embedding_engine import plan_batches
+from rag_project.core.services.embedding_service import EmbeddingService
+
+
+class HashingBackend(EmbeddingBackendPort):
+    """
+    Deterministic embeddings derived from a hash of each text, one token per word.
+    Records the batches it encodes.
+    """
+    name = "hashing"
+    dimension = 8
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        self.batches.append(list(texts))
+        rows = [np.frombuffer(hashlib.sha256(text.encode()).digest()[:8], dtype=np.uint8) for text in texts]
+        return np.asarray(rows, dtype=np.float32).reshape(-1, 8)
+
+    def token_lengths(self, texts):
+        return [len(text.split()) + 2 for text in texts]
+
+
+def test_batches_cover_every_input_once():
+    lengths = [5, 120, 7, 64, 3, 120, 30, 9]
+    batches = plan_batches(lengths, tokens_per_batch=256, max_batch_size=4)
+    assert sorted(position for batch in batches for position in batch) == list(range(len(lengths)))
+
+
+def test_batches_respect_padded_token_budget():
+    """
+    Every batch fits the budget once padded to its longest input, so long and
+    short inputs end up in different batches.
+    """
+    lengths = [5, 120, 7, 64, 3, 120, 30, 9, 4, 6]
+    batches = plan_batches(lengths, tokens_per_batch=256, max_batch_size=100)
+    for batch in batches:
+        assert len(batch) == 1 or len(batch) * max(lengths[p] for p in batch) <= 256
+    assert batches[0] == [1, 5]
+    assert sorted(batches[-1]) == [0, 4, 8, 9]
+
+
+def test_batch_size_is_capped():
+    batches = plan_batches([1] * 10, tokens_per_batch=1000, max_batch_size=4)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_bucketed_engine_returns_the_rows_of_the_default_engine(num_workers):
+    lengths = [3, 40, 1, 17, 40, 8, 2, 25, 5, 33, 1, 12] * 3
+    chunks = [
+        Chunk(filename="doc.txt", chunk_id=index, content=" ".join([f"w{index}"] * length))
+        for index, length in enumerate(lengths)
+    ]
+    expected = EmbeddingService(backend=HashingBackend()).embed_batch(chunks).embeddings
+
+    backend = HashingBackend()
+    service = EmbeddingService(
+        backend=backend, engine="bucketed", num_workers=num_workers, tokens_per_batch=96, max_batch_size=6,
+    )
+    try:
+        embeddings = service.embed_batch(chunks).embeddings
+    finally:
+        service.close()
+    np.testing.assert_array_equal(embeddings, expected)
+
+    if num_workers == 1:
+        # Several batches, none of them in input order, were scattered back
+        assert len(backend.batches) > 3
+        assert [text for batch in backend.batches for text in batch] != [chunk.content for chunk in chunks]
+    else:
+        # The batches were encoded by the workers' copies of the backend
+        assert backend.batches == []
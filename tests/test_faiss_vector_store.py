@@ -0,0 +1,218 @@
+import os
+
+import numpy as np
+import pytest
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+
+
+def make_batch(vectors, start=0):
+    chunks = [Chunk(filename=f"doc{i % 4}", chunk_id=start + i, content=str(start + i)) for i in range(len(vectors))]
+    return ChunkBatch(chunks=chunks, embeddings=vectors)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat", "ivf_pq"])
+def test_index_types_find_exact_match_and_skip_deleted(index_type):
+    vectors = np.random.default_rng(0).standard_normal((2000, 32)).astype(np.float32)
+    store = FaissVectorStore(32, index_type=index_type, nlist=8, pq_m=8, pq_bits=4)
+    for start in range(0, len(vectors), 500):
+        store.insert_batch(make_batch(vectors[start:start + 500], start))
+    assert store.is_trained
+
+    assert store.query(vectors[9], 3, nprobe=8)[0]["chunk_id"] == 9
+    store.delete(["doc1"])
+    results = store.query(vectors[9], 3, nprobe=8, ef_search=128)
+    assert results and all(record["filename"] != "doc1" for record in results)
+
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_pq"])
+def test_ivf_buffers_until_trained_and_shrinks_nlist_for_small_corpora(index_type):
+    vectors = np.random.default_rng(1).standard_normal((100, 16)).astype(np.float32)
+    store = FaissVectorStore(16, index_type=index_type, nlist=1024, pq_m=8, pq_bits=8)
+    store.insert_batch(make_batch(vectors))
+    assert not store.is_trained and store.index.ntotal == 0
+
+    assert store.query(vectors[42], 1)[0]["chunk_id"] == 42
+    assert store.is_trained and store.index.ntotal == 100 and store.index.nlist == 2
+    if index_type == "ivf_pq":
+        # 100 points cannot train 256-centroid codebooks
+        assert store.index.pq.nbits == 6
+
+
+def test_search_params_of_other_stores_are_ignored():
+    vectors = np.random.default_rng(5).standard_normal((200, 8)).astype(np.float32)
+    store = FaissVectorStore(8, index_type="ivf_flat", nlist=4, nprobe=4)
+    store.insert_batch(make_batch(vectors))
+    assert store.query(vectors[3], 1, probes=10, nprobe=4)[0]["chunk_id"] == 3
+    assert store.query_batch(vectors[:2], 1, probes=10)[1][0]["chunk_id"] == 1
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat"])
+def test_save_and_load_memory_mapped(tmp_path, index_type):
+    vectors = np.random.default_rng(2).standard_normal((600, 16)).astype(np.float32)
+    # Deleted rows are saved as such rather than compacted away
+    store = FaissVectorStore(16, index_type=index_type, nlist=4, compact_threshold=1.0)
+    batch = make_batch(vectors[:400])
+    batch.chunks[7].metadata = {"page": 3}
+    store.insert_batch(batch)
+    store.delete(["doc2"])
+    store.save(str(tmp_path))
+
+    loaded = FaissVectorStore.load(str(tmp_path), nprobe=4)
+    assert FaissVectorStore.is_saved(str(tmp_path)) and len(loaded.chunk_table) == 400
+    record = loaded.query(vectors[7], 1)[0]
+    assert record.pop("distance") == pytest.approx(0.0, abs=1e-5)
+    assert record == {"chunk_id": 7, "filename": "doc3", "content": "7", "metadata": {"page": 3}}
+    assert all(record["filename"] != "doc2" for record in loaded.query(vectors[6], 5))
+
+    # Inserting into a mapped store switches to an in-memory index
+    loaded.insert_batch(make_batch(vectors[400:], 400))
+    assert loaded.query(vectors[555], 1)[0]["chunk_id"] == 555
+    loaded.save(str(tmp_path))
+    assert FaissVectorStore.load(str(tmp_path), mmap=False).index.ntotal == 600
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat"])
+def test_saves_are_versioned_and_a_mapped_store_keeps_its_version(tmp_path, index_type):
+    directory = str(tmp_path)
+    vectors = np.random.default_rng(6).standard_normal((300, 16)).astype(np.float32)
+    first = FaissVectorStore(16, index_type=index_type, nlist=4)
+    first.insert_batch(make_batch(vectors[:200]))
+    first.save(directory)
+    reader = FaissVectorStore.load(directory, nprobe=4)
+
+    # Another writer replaces the store with different contents, twice
+    other = FaissVectorStore(16, index_type=index_type, nlist=4)
+    other.insert_batch(make_batch(vectors[200:], 200))
+    other.save(directory)
+    other.save(directory)
+    assert len([name for name in os.listdir(directory) if name.startswith("version-")]) == 2
+    assert len(FaissVectorStore.load(directory).chunk_table) == 100
+
+    # The reader's first insert copies the index it has mapped, not the newer file
+    reader.insert_batch(make_batch(vectors[250:251], 1000))
+    assert reader.index.ntotal == 201
+    assert reader.query(vectors[5], 1)[0]["chunk_id"] == 5
+    assert reader.query(vectors[250], 1)[0]["chunk_id"] == 1000
+
+    # A save that dies before switching CURRENT leaves the current version in use
+    os.makedirs(os.path.join(directory, "version-99999999999999999999-1"))
+    assert len(FaissVectorStore.load(directory).chunk_table) == 100
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat", "ivf_pq", "sq8", "pq", "ivf_sq8"])
+def test_compaction_drops_deleted_rows_and_keeps_results(index_type):
+    vectors = np.random.default_rng(10).standard_normal((1200, 16)).astype(np.float32)
+    store = FaissVectorStore(
+        16, index_type=index_type, nlist=4, pq_m=4, pq_bits=6, train_size=1000,
+        rescore_factor=10 if index_type == "sq8" else 0,
+    )
+    store.insert_batch(make_batch(vectors))
+    store.delete(["doc1", "doc2"])
+    queries = vectors[[0, 3, 7, 400]]
+    before = store.query_batch(queries, 5, nprobe=4)
+
+    store.compact()
+    assert store.index.ntotal == len(store.chunk_table) == 600 and not store._deleted
+    if store.exact_vectors is not None:
+        assert len(store.exact_vectors) == 600
+    after = store.query_batch(queries, 5, nprobe=4)
+    for previous, current in zip(before, after):
+        assert all(record["filename"] in ("doc0", "doc3") for record in current)
+        if index_type == "hnsw":
+            # The graph is rebuilt, so only the exact match is certain to stay first
+            assert current[0]["chunk_id"] == previous[0]["chunk_id"]
+        else:
+            assert [(r["chunk_id"], r["content"]) for r in current] == [(r["chunk_id"], r["content"]) for r in previous]
+
+    # The renumbered store can be written to and deleted from again
+    store.insert_batch(make_batch(vectors[:4], 5000))
+    assert store.query(vectors[1], 1, nprobe=4)[0]["chunk_id"] == 5001
+    store.delete(["doc0"])
+    assert all(record["filename"] == "doc3" for record in store.query(vectors[0], 5, nprobe=4))
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat"])
+def test_save_compacts_once_deleted_rows_pass_the_threshold(tmp_path, index_type):
+    vectors = np.random.default_rng(11).standard_normal((400, 16)).astype(np.float32)
+    store = FaissVectorStore(16, index_type=index_type, nlist=4, compact_threshold=0.3)
+    store.insert_batch(make_batch(vectors))
+    store.delete(["doc1"])
+    store.save(str(tmp_path))
+    loaded = FaissVectorStore.load(str(tmp_path), nprobe=4)
+    assert loaded.index.ntotal == 400 and len(loaded._deleted) == 100
+
+    # A second deleted quarter takes the deleted rows past the threshold
+    loaded.delete(["doc2"])
+    loaded.save(str(tmp_path))
+    compacted = FaissVectorStore.load(str(tmp_path), nprobe=4)
+    assert compacted.index.ntotal == len(compacted.chunk_table) == 200 and not compacted._deleted
+    assert compacted.compact_threshold == 0.3
+    assert compacted.query(vectors[7], 1)[0]["chunk_id"] == 7
+    assert {record["filename"] for record in compacted.query(vectors[5], 10)} <= {"doc0", "doc3"}
+
+
+@pytest.mark.parametrize("index_type", ["sq8", "pq", "ivf_sq8"])
+def test_quantized_index_with_exact_rescoring_survives_reload(tmp_path, index_type):
+    vectors = np.random.default_rng(3).standard_normal((1500, 32)).astype(np.float32)
+    store = FaissVectorStore(32, index_type=index_type, nlist=4, pq_m=4, pq_bits=6, rescore_factor=50, train_size=1000)
+    store.insert_batch(make_batch(vectors))
+    assert store.is_trained
+
+    exact = np.argsort(((vectors - vectors[11]) ** 2).sum(axis=1))[:5]
+    assert [record["chunk_id"] for record in store.query(vectors[11], 5, nprobe=4)] == exact.tolist()
+
+    store.save(str(tmp_path))
+    loaded = FaissVectorStore.load(str(tmp_path), nprobe=4)
+    assert isinstance(loaded.exact_vectors._base, np.memmap)
+    assert [record["chunk_id"] for record in loaded.query(vectors[11], 5)] == exact.tolist()
+
+
+@pytest.mark.parametrize("index_type", ["sq8", "pq", "ivf_sq8"])
+def test_quantized_indexes_skip_deleted_rows(index_type):
+    vectors = np.random.default_rng(7).standard_normal((1000, 16)).astype(np.float32)
+    store = FaissVectorStore(16, index_type=index_type, nlist=4, pq_m=4, train_size=1000)
+    store.insert_batch(make_batch(vectors))
+    store.delete(["doc1"])
+
+    for row in (1, 5, 9):
+        results = store.query(vectors[row], 5, nprobe=4)
+        assert len(results) == 5 and all(record["filename"] != "doc1" for record in results)
+    assert store.query(vectors[2], 1, nprobe=4)[0]["chunk_id"] == 2
+
+
+def test_pq_trains_on_a_corpus_smaller_than_its_codebook():
+    vectors = np.random.default_rng(8).standard_normal((100, 16)).astype(np.float32)
+    store = FaissVectorStore(16, index_type="pq", pq_m=4, pq_bits=8, rescore_factor=10)
+    store.insert_batch(make_batch(vectors))
+    assert store.query(vectors[42], 1)[0]["chunk_id"] == 42
+    assert store.index.pq.nbits == 6
+
+
+def test_rescoring_a_store_saved_without_vectors_is_refused(tmp_path):
+    vectors = np.random.default_rng(9).standard_normal((300, 16)).astype(np.float32)
+    store = FaissVectorStore(16, index_type="sq8", train_size=300)
+    store.insert_batch(make_batch(vectors))
+    store.save(str(tmp_path))
+    with pytest.raises(ValueError, match="saved without them"):
+        FaissVectorStore.load(str(tmp_path), rescore_factor=4)
+
+
+@pytest.mark.parametrize("index_type,rescore_factor", [("flat", 0), ("sq8", 10)])
+def test_query_batch_matches_single_queries(index_type, rescore_factor):
+    vectors = np.random.default_rng(4).standard_normal((1000, 16)).astype(np.float32)
+    store = FaissVectorStore(16, index_type=index_type, train_size=1000, rescore_factor=rescore_factor)
+    store.insert_batch(make_batch(vectors))
+    store.delete(["doc2"])
+
+    batched = store.query_batch(vectors[:6], 4)
+    assert len(batched) == 6
+    for query, results in zip(vectors[:6], batched):
+        assert [r["chunk_id"] for r in results] == [r["chunk_id"] for r in store.query(query, 4)]
+        distances = [r["distance"] for r in results]
+        assert distances == sorted(distances)
+        assert all(r["filename"] != "doc2" for r in results)
+    assert batched[1][0]["chunk_id"] == 1 and batched[1][0]["distance"] == pytest.approx(0.0, abs=1e-4)
+    assert store.query_batch(np.empty((0, 16), dtype=np.float32), 4) == []
@@ -0,0 +1,102 @@
+import pytest
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.adapters.loader.markdown_adapter import MarkdownLoader
+from rag_project.adapters.loader.text_loader import TextLoader
+from rag_project.adapters.metadata.metadata_sqlite import MetadataSQLite
+from rag_project.adapters.saver.packed_saver import PackedChunkSaver
+from rag_project.core.domain.document import Document
+from rag_project.core.ports.plugin_port import Plugin
+from rag_project.core.services.data_service import DataService
+from rag_project.core.services.loader_registry import LoaderRegistry
+
+
+class LogLoader(Plugin):
+    """
+    A plugin without extensions, found through `supports`.
+    """
+    def supports(self, filename: str) -> bool:
+        return filename.startswith("log")
+
+    def load(self, filepath: str) -> Document:
+        return Document(filename=filepath, content="")
+
+
+class OtherTextLoader(TextLoader):
+    pass
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for relpath in ("b.txt", "a.TXT", "c.md", "log_today", "skip.bin", "z/inner.txt", "m/deep/x.txt", "m/y.md", "m/tmp/t.txt"):
+        path = tmp_path / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("content", encoding="utf-8")
+    (tmp_path / "big.txt").write_text("x" * 100, encoding="utf-8")
+    return tmp_path
+
+
+def relpaths(registry, directory):
+    return [relpath for _, _, relpath in registry.iter_files(str(directory))]
+
+
+def test_find_uses_extensions_then_probes_supports():
+    text, other, log = TextLoader(), OtherTextLoader(), LogLoader()
+    registry = LoaderRegistry([text, other, MarkdownLoader(), log])
+    # Earlier plugins win and extensions match regardless of case
+    assert registry.find("notes.TXT") is text
+    assert isinstance(registry.find("readme.markdown"), MarkdownLoader)
+    assert registry.find("log_2024") is log
+    assert registry.find("image.png") is None
+
+
+def test_walk_lists_files_then_subdirectories_in_name_order(tree):
+    registry = LoaderRegistry([TextLoader(), MarkdownLoader(), LogLoader()])
+    assert relpaths(registry, tree) == [
+        "a.TXT", "b.txt", "big.txt", "c.md", "log_today",
+        "m/y.md", "m/deep/x.txt", "m/tmp/t.txt", "z/inner.txt",
+    ]
+    plugin, filepath, relpath = next(registry.iter_files(str(tree)))
+    assert isinstance(plugin, TextLoader) and filepath == str(tree / "a.TXT")
+
+
+def test_directory_symlinks_are_not_followed(tree):
+    (tree / "m" / "deep" / "up").symlink_to(tree, target_is_directory=True)
+    (tree / "z" / "self").symlink_to(tree / "z", target_is_directory=True)
+    (tree / "m" / "link.txt").symlink_to(tree / "b.txt")
+    (tree / "dangling.txt").symlink_to(tree / "missing.txt")
+
+    registry = LoaderRegistry([TextLoader(), MarkdownLoader(), LogLoader()])
+    # The walk terminates, and linked files are listed under their own name
+    assert relpaths(registry, tree) == [
+        "a.TXT", "b.txt", "big.txt", "c.md", "log_today",
+        "m/link.txt", "m/y.md", "m/deep/x.txt", "m/tmp/t.txt", "z/inner.txt",
+    ]
+
+
+def test_include_exclude_size_and_recursion_filters(tree, capsys):
+    plugins = [TextLoader(), MarkdownLoader()]
+    assert relpaths(LoaderRegistry(plugins, include=["*.md"]), tree) == ["c.md", "m/y.md"]
+    # Excluding a directory skips everything below it
+    assert relpaths(LoaderRegistry(plugins, exclude=["m/tmp", "*.md", "big*"]), tree) == [
+        "a.TXT", "b.txt", "m/deep/x.txt", "z/inner.txt",
+    ]
+    assert "big.txt" not in relpaths(LoaderRegistry(plugins, max_file_size=50), tree)
+    assert "Skipping big.txt" in capsys.readouterr().out
+    assert relpaths(LoaderRegistry(plugins, recursive=False), tree) == ["a.TXT", "b.txt", "big.txt", "c.md"]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_data_service_ingests_exactly_the_registry_files(tree, tmp_path_factory, num_workers):
+    work = tmp_path_factory.mktemp("work")
+    plugins = [TextLoader(), MarkdownLoader()]
+    registry = LoaderRegistry(plugins, exclude=["m/*"], max_file_size=50)
+    saver = PackedChunkSaver(str(work / "processed"))
+    metadata = MetadataSQLite(str(work / "metadata.db"))
+    service = DataService(plugins, SimpleCleaner(), BasicChunker(), saver, metadata, registry=registry)
+
+    chunks = service.process_files(str(tree), num_workers=num_workers)
+    assert [chunk.filename for chunk in chunks] == ["a.TXT", "b.txt", "c.md", "z/inner.txt"]
+    saver.close()
+    metadata.close()
@@ -0,0 +1,172 @@
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from tokenizers import Tokenizer, models, pre_tokenizers, processors
+from transformers import PreTrainedTokenizerFast
+
+from rag_project.adapters.cache.sqlite_embedding_cache import SqliteEmbeddingCache
+from rag_project.adapters.embedding.onnx_backend import OnnxEmbeddingBackend
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.services.embedding_service import EmbeddingService
+
+WORDS = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"]
+VOCAB = {"[UNK]": 0, "[CLS]": 1, "[SEP]": 2, "[PAD]": 3, **{word: 4 + index for index, word in enumerate(WORDS)}}
+DIMENSION = 6
+# Token embeddings of the stub model; padding positions get huge values so
+# that pooling over them would show
+TOKEN_TABLE = np.random.default_rng(0).standard_normal((len(VOCAB), DIMENSION)).astype(np.float32)
+TOKEN_TABLE[VOCAB["[PAD]"]] = 1e3
+
+
+def make_tokenizer():
+    backend = Tokenizer(models.WordLevel(VOCAB, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    backend.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 1), ("[SEP]", 2)],
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=backend, unk_token="[UNK]", cls_token="[CLS]", sep_token="[SEP]", pad_token="[PAD]",
+    )
+
+
+class StubSession:
+    """
+    Stands in for onnxruntime.InferenceSession: looks the token ids up in
+    TOKEN_TABLE and records the shape of every batch it runs.
+    """
+    def __init__(self):
+        self.batches = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def get_outputs(self):
+        return [SimpleNamespace(name="last_hidden_state", shape=["batch", "sequence", DIMENSION])]
+
+    def run(self, output_names, feed):
+        assert set(feed) == {"input_ids", "attention_mask"}
+        assert all(array.dtype == np.int64 for array in feed.values())
+        self.batches.append(feed["input_ids"].shape)
+        return [TOKEN_TABLE[feed["input_ids"]]]
+
+
+class StubbedOnnxBackend(OnnxEmbeddingBackend):
+    """
+    The real backend with the exported model and tokenizer replaced by
+    stubs, built lazily like the originals so that pickling drops them.
+    """
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = StubSession()
+        return self._session
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            self._tokenizer = make_tokenizer()
+        return self._tokenizer
+
+
+def sentence(index, words):
+    return " ".join(WORDS[(index + offset) % len(WORDS)] for offset in range(words))
+
+
+def make_chunks(texts):
+    return [Chunk(filename="doc.txt", chunk_id=index, content=text) for index, text in enumerate(texts)]
+
+
+def expected_embedding(text, normalize=True):
+    ids = [VOCAB["[CLS]"], *(VOCAB[word] for word in text.split()), VOCAB["[SEP]"]]
+    pooled = TOKEN_TABLE[ids].mean(axis=0)
+    return pooled / np.linalg.norm(pooled) if normalize else pooled
+
+
+@pytest.mark.parametrize("normalize", [True, False])
+def test_padding_is_masked_out_of_the_mean_pooling(tmp_path, normalize):
+    backend = StubbedOnnxBackend(cache_dir=str(tmp_path), normalize=normalize)
+    texts = [sentence(0, 1), sentence(1, 7), sentence(2, 3)]
+    embeddings = backend.encode(texts, batch_size=8)
+
+    assert embeddings.dtype == np.float32 and embeddings.shape == (3, DIMENSION)
+    # One padded batch of the longest text's 9 tokens
+    assert backend.session.batches == [(3, 9)]
+    for text, embedding in zip(texts, embeddings):
+        np.testing.assert_allclose(embedding, expected_embedding(text, normalize), rtol=1e-5, atol=1e-6)
+    norms = np.linalg.norm(embeddings, axis=1)
+    if normalize:
+        np.testing.assert_allclose(norms, 1.0, rtol=1e-5)
+    else:
+        assert not np.allclose(norms, 1.0)
+
+
+def test_batches_are_sorted_by_length_and_rows_returned_in_input_order(tmp_path):
+    backend = StubbedOnnxBackend(cache_dir=str(tmp_path))
+    lengths = [2, 9, 1, 5, 7, 3, 8]
+    texts = [sentence(index, length) for index, length in enumerate(lengths)]
+    embeddings = backend.encode(texts, batch_size=3)
+
+    # Longest first: each batch is padded to a length close to its own texts
+    assert backend.session.batches == [(3, 11), (3, 7), (1, 3)]
+    np.testing.assert_allclose(embeddings, np.stack([expected_embedding(text) for text in texts]), rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(embeddings[2], backend.encode([texts[2]])[0], rtol=1e-5, atol=1e-6)
+    assert backend.token_lengths(texts) == [length + 2 for length in lengths]
+    assert backend.dimension == DIMENSION
+
+
+def test_cached_embeddings_are_keyed_by_the_backend_name(tmp_path):
+    cache = SqliteEmbeddingCache(str(tmp_path / "cache.db"))
+    int8 = StubbedOnnxBackend(model_name="all-MiniLM-L6-v2", cache_dir=str(tmp_path))
+    assert int8.name == "sentence-transformers/all-MiniLM-L6-v2:onnx-int8"
+
+    service = EmbeddingService(backend=int8, cache=cache)
+    assert service.model_name == int8.name
+    texts = [sentence(0, 4), sentence(1, 2)]
+    service.embed_batch(make_chunks(texts))
+    assert service.cache_misses == 2 and len(int8.session.batches) == 1
+
+    # The same texts are served from the cache for the same backend...
+    again = EmbeddingService(backend=int8, cache=cache)
+    again.embed_batch(make_chunks(texts))
+    assert again.cache_hits == 2 and len(int8.session.batches) == 1
+
+    # ...but the fp32 model's embeddings differ and are not shared with it
+    fp32 = StubbedOnnxBackend(model_name="all-MiniLM-L6-v2", cache_dir=str(tmp_path), quantize=False)
+    assert fp32.name == "sentence-transformers/all-MiniLM-L6-v2:onnx-fp32"
+    other = EmbeddingService(backend=fp32, cache=cache)
+    other.embed_batch(make_chunks(texts))
+    assert other.cache_misses == 2 and len(fp32.session.batches) == 1
+    cache.close()
+
+
+def test_pickling_drops_the_session_and_tokenizer(tmp_path):
+    backend = StubbedOnnxBackend(cache_dir=str(tmp_path), max_seq_length=64, num_threads=2)
+    backend.encode([sentence(0, 3)])
+    assert backend._session is not None and backend._tokenizer is not None
+
+    copy = pickle.loads(pickle.dumps(backend))
+    assert copy._session is None and copy._tokenizer is None
+    assert (copy.name, copy.model_path, copy.max_seq_length, copy.num_threads) == (
+        backend.name, backend.model_path, backend.max_seq_length, backend.num_threads,
+    )
+    # The original keeps its loaded session
+    assert backend._session is not None
+
+
+def test_the_bucketed_pool_encodes_with_a_copy_per_worker(tmp_path):
+    texts = [sentence(index, 1 + index % 9) for index in range(40)]
+    serial = StubbedOnnxBackend(cache_dir=str(tmp_path)).encode(texts)
+
+    service = EmbeddingService(
+        backend=StubbedOnnxBackend(cache_dir=str(tmp_path)), engine="bucketed",
+        num_workers=2, tokens_per_batch=32, max_batch_size=8,
+    )
+    try:
+        pooled = service.embed_batch(make_chunks(texts)).embeddings
+    finally:
+        service.close()
+    np.testing.assert_allclose(pooled, serial, rtol=1e-5, atol=1e-6)
+    # The batches ran in the workers; this process only asked for the dimension
+    assert service.backend.session.batches == []
@@ -0,0 +1,158 @@
+import os
+
+import numpy as np
+import pytest
+
+from rag_project.adapters.saver.file_saver import FileSaver
+from rag_project.adapters.saver.packed_saver import PackedChunkSaver
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.ports.saver_port import SaverPort
+
+
+def make_chunks(filename, contents):
+    return [Chunk(filename=filename, chunk_id=i, content=content) for i, content in enumerate(contents)]
+
+
+def test_appended_chunks_are_read_back_and_the_latest_save_wins(tmp_path):
+    saver = PackedChunkSaver(str(tmp_path))
+    saver.save_chunks(make_chunks("a.txt", ["first", "", "café ☃"]))
+    saver.save_chunks(make_chunks("docs/b.txt", ["other"]))
+
+    assert len(saver) == 4
+    assert ("a.txt", 2) in saver and ("a.txt", 3) not in saver
+    assert saver.get_chunk("a.txt", 2).content == "café ☃"
+    assert saver.get_chunk("a.txt", 1).content == ""
+    assert saver.get_chunk("docs/b.txt", 0).content == "other"
+
+    saver.save_chunks([Chunk(filename="a.txt", chunk_id=0, content="rewritten")])
+    assert saver.get_chunk("a.txt", 0).content == "rewritten"
+    assert len(saver) == 4
+    with pytest.raises(KeyError):
+        saver.get_chunk("missing.txt", 0)
+    saver.close()
+
+
+def test_shards_roll_over_and_survive_a_reopen(tmp_path):
+    saver = PackedChunkSaver(str(tmp_path), max_shard_bytes=10)
+    saver.save_chunks(make_chunks("a.txt", ["0123456", "789abc", "defghi"]))
+    saver.close()
+    assert sorted(name for name in os.listdir(tmp_path) if name.startswith("shard_")) == [
+        "shard_00000.bin", "shard_00001.bin", "shard_00002.bin",
+    ]
+
+    reopened = PackedChunkSaver(str(tmp_path), max_shard_bytes=10)
+    assert sorted(reopened.keys()) == [("a.txt", 0), ("a.txt", 1), ("a.txt", 2)]
+    # Appends continue in the last shard and are readable alongside the old chunks
+    reopened.save_chunks(make_chunks("b.txt", ["gh"]))
+    assert [reopened.get_chunk("a.txt", i).content for i in range(3)] == ["0123456", "789abc", "defghi"]
+    assert reopened.get_chunk("b.txt", 0).content == "gh"
+    assert not os.path.exists(tmp_path / "shard_00003.bin")
+    reopened.close()
+
+    assert PackedChunkSaver(str(tmp_path)).get_chunk("b.txt", 0).content == "gh"
+
+
+@pytest.mark.parametrize("torn_bytes", [3, 24])
+def test_a_torn_index_record_is_truncated_on_open(tmp_path, torn_bytes):
+    saver = PackedChunkSaver(str(tmp_path))
+    saver.save_chunks(make_chunks("a.txt", ["kept"]))
+    index_path = tmp_path / "index.bin"
+    intact_size = index_path.stat().st_size
+
+    # Simulate a crash midway through writing the next record: a partial
+    # header, or a full header whose filename was cut short
+    saver.save_chunks(make_chunks("a-much-longer-filename.txt", ["lost"]))
+    with open(index_path, "r+b") as file:
+        file.truncate(intact_size + torn_bytes)
+
+    reopened = PackedChunkSaver(str(tmp_path))
+    assert index_path.stat().st_size == intact_size
+    assert list(reopened.keys()) == [("a.txt", 0)]
+    reopened.save_chunks(make_chunks("c.txt", ["after"]))
+    reopened.close()
+
+    reopened = PackedChunkSaver(str(tmp_path))
+    assert reopened.get_chunk("a.txt", 0).content == "kept"
+    assert reopened.get_chunk("c.txt", 0).content == "after"
+
+
+def test_close_compacts_the_log_into_a_mapped_sorted_table(tmp_path):
+    saver = PackedChunkSaver(str(tmp_path))
+    saver.save_chunks(make_chunks("b.txt", ["b0", "b1"]) + make_chunks("a.txt", ["a0"]))
+    saver.close()
+    assert (tmp_path / "index.bin").stat().st_size == 0
+
+    reopened = PackedChunkSaver(str(tmp_path))
+    # Nothing is replayed: lookups bisect the memory-mapped table
+    assert reopened._tail == {} and isinstance(reopened._table, np.memmap)
+    assert list(reopened._table["key"]) == sorted(reopened._table["key"])
+    assert len(reopened) == 3
+    assert reopened.get_chunk("b.txt", 1).content == "b1"
+
+    # New writes land in the log tail and take precedence over the table
+    reopened.save_chunks([Chunk(filename="a.txt", chunk_id=0, content="a0 again")])
+    reopened.save_chunks(make_chunks("c.txt", ["c0"]))
+    assert len(reopened) == 4
+    assert reopened.get_chunk("a.txt", 0).content == "a0 again"
+    assert sorted(reopened.keys()) == [("a.txt", 0), ("b.txt", 0), ("b.txt", 1), ("c.txt", 0)]
+    reopened.close()
+
+    reopened = PackedChunkSaver(str(tmp_path))
+    assert reopened.get_chunk("a.txt", 0).content == "a0 again"
+    assert sorted(reopened.keys()) == [("a.txt", 0), ("b.txt", 0), ("b.txt", 1), ("c.txt", 0)]
+    reopened.close()
+
+
+def test_a_log_past_its_threshold_is_compacted_while_writing(tmp_path):
+    saver = PackedChunkSaver(str(tmp_path), compact_log_bytes=100)
+    for index in range(10):
+        saver.save_chunks(make_chunks(f"doc{index}.txt", ["x" * index]))
+        assert (tmp_path / "index.bin").stat().st_size < 100
+    assert len(saver._table) > 0
+    assert [saver.get_chunk(f"doc{index}.txt", 0).content for index in range(10)] == ["x" * index for index in range(10)]
+    saver.close()
+
+
+@pytest.mark.parametrize("reopen", [False, True])
+def test_deleted_files_disappear_before_and_after_compaction(tmp_path, reopen):
+    saver = PackedChunkSaver(str(tmp_path))
+    saver.save_chunks(make_chunks("a.txt", ["a0", "a1"]) + make_chunks("b.txt", ["b0"]))
+    saver.close()
+
+    saver = PackedChunkSaver(str(tmp_path))
+    saver.save_chunks(make_chunks("a.txt", ["a0", "a1", "a2"]))
+    saver.delete_chunks(["a.txt", "missing.txt"])
+    assert len(saver) == 1
+    assert ("a.txt", 0) not in saver
+    with pytest.raises(KeyError):
+        saver.get_chunk("a.txt", 2)
+
+    # Re-ingesting a deleted file brings back only its new chunks
+    saver.save_chunks(make_chunks("a.txt", ["new"]))
+    if reopen:
+        # Replay the log without compacting it first
+        saver = PackedChunkSaver(str(tmp_path))
+    assert len(saver) == 2
+    assert sorted(saver.keys()) == [("a.txt", 0), ("b.txt", 0)]
+    assert saver.get_chunk("a.txt", 0).content == "new"
+    saver.close()
+
+    saver = PackedChunkSaver(str(tmp_path))
+    assert sorted(saver.keys()) == [("a.txt", 0), ("b.txt", 0)]
+    assert len(saver) == 2
+    saver.close()
+
+
+def test_packed_saver_stores_what_the_file_saver_writes(tmp_path):
+    chunks = make_chunks("docs/a.txt", ["alpha", "beta"]) + make_chunks("b.txt", ["gamma"])
+    packed = PackedChunkSaver(str(tmp_path / "packed"))
+    files = FileSaver(str(tmp_path / "files"))
+
+    for saver in (packed, files):
+        assert isinstance(saver, SaverPort)
+        saver.save_chunks(chunks)
+
+    for chunk in chunks:
+        path = tmp_path / "files" / f"{chunk.filename}_chunk_{chunk.chunk_id}.txt"
+        assert packed.get_chunk(chunk.filename, chunk.chunk_id).content == path.read_text(encoding="utf-8")
+    packed.close()
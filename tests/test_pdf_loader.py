@@ -0,0 +1,90 @@
+import pytest
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.adapters.loader.pdf_adapter import PdfLoader
+from rag_project.adapters.metadata.metadata_sqlite import MetadataSQLite
+from rag_project.adapters.saver.packed_saver import PackedChunkSaver
+from rag_project.core.services.data_service import DataService
+
+
+def write_pdf(path, pages):
+    """
+    Write a minimal PDF with one line of Helvetica text per page; empty
+    strings give pages without text.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(pages))
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+
+
+PAGES = [f"Page {number} text" for number in range(1, 6)] + ["", "Last page"]
+
+
+def test_pages_are_yielded_in_order_with_their_number(tmp_path):
+    path = tmp_path / "doc.pdf"
+    write_pdf(path, PAGES)
+    loader = PdfLoader()
+    parts = list(loader.load_parts(str(path)))
+
+    assert [part.content for part in parts] == PAGES
+    assert [part.metadata for part in parts] == [{"page": number} for number in range(1, 8)]
+    assert {part.filename for part in parts} == {"doc.pdf"}
+    assert loader.load(str(path)).content == "\n".join(text for text in PAGES if text)
+
+
+def test_page_ranges_extracted_in_a_pool_match_the_serial_pages(tmp_path):
+    path = tmp_path / "doc.pdf"
+    write_pdf(path, PAGES)
+    serial = [(part.content, part.metadata) for part in PdfLoader().load_parts(str(path))]
+
+    loader = PdfLoader(num_workers=2, pages_per_task=2, min_parallel_pages=3)
+    try:
+        assert [(part.content, part.metadata) for part in loader.load_parts(str(path))] == serial
+        assert loader._executor is not None
+    finally:
+        loader.close()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_chunk_ids_run_on_across_pages(tmp_path, num_workers):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    write_pdf(raw / "a.pdf", PAGES)
+    write_pdf(raw / "b.pdf", ["Only page of b"])
+    saver = PackedChunkSaver(str(tmp_path / "processed"))
+    metadata = MetadataSQLite(str(tmp_path / "metadata.db"))
+    service = DataService([PdfLoader()], SimpleCleaner(), BasicChunker(chunk_size=8, overlap=0), saver, metadata)
+
+    chunks = service.process_files(str(raw), num_workers=num_workers)
+    a_chunks = [chunk for chunk in chunks if chunk.filename == "a.pdf"]
+    assert [chunk.chunk_id for chunk in a_chunks] == list(range(len(a_chunks)))
+    # "Page 1 text" is cleaned and cut into two chunks; the empty page gives none
+    assert [(chunk.content, chunk.metadata["page"]) for chunk in a_chunks[:2]] == [("Page 1 t", 1), ("ext", 1)]
+    assert sorted({chunk.metadata["page"] for chunk in a_chunks}) == [1, 2, 3, 4, 5, 7]
+    assert [(chunk.chunk_id, chunk.metadata) for chunk in chunks if chunk.filename == "b.pdf"] == [
+        (0, {"page": 1}), (1, {"page": 1}),
+    ]
+    for chunk in chunks:
+        assert saver.get_chunk(chunk.filename, chunk.chunk_id).content == chunk.content
+    saver.close()
+    metadata.close()
@@ -0,0 +1,169 @@
+import json
+import re
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from rag_project.adapters.database.models import Embedding
+from rag_project.adapters.vector_store.pg_vector_store import PgVectorStore, _copy_text
+from rag_project.core.domain.chunk import Chunk
+
+# Every character the COPY text format treats specially, a literal \N that
+# must not read back as NULL, and non-ASCII text
+TRICKY = "tab\there\nnew line\r\\back\\slash \\N é 漢字 😀"
+
+
+def compiled(store):
+    return store._query_sql.compile(dialect=postgresql.psycopg.dialect())
+
+
+def test_query_binds_the_vector_instead_of_formatting_it():
+    store = PgVectorStore(session_factory=None, index_type="hnsw")
+    statement = compiled(store)
+    assert "CAST(%(embedding)s AS vector)" in str(statement)
+    vector = np.array([0.5, -1.25], dtype=np.float32)
+    assert statement.binds["embedding"].type.bind_processor(None)(vector) == "[0.5,-1.25]"
+
+
+def test_quantized_index_ddl_matches_the_ranking_expression():
+    store = PgVectorStore(session_factory=None, index_type="hnsw", quantization="halfvec", rescore_factor=4, hnsw_m=24)
+    ddl = store._index_ddl(store.index_name, concurrently=True)
+    assert ddl == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS embeddings_embedding_hnsw_halfvec ON embeddings "
+        "USING hnsw ((embedding::halfvec(384)) halfvec_l2_ops) WITH (m = 24, ef_construction = 64)"
+    )
+    sql = str(compiled(store))
+    assert "ORDER BY embedding::halfvec(384) <-> CAST(%(embedding)s AS vector)::halfvec(384)" in sql
+    assert "LIMIT %(candidates)s" in sql
+
+    ivf = PgVectorStore(session_factory=None, index_type="ivfflat", ivf_lists=100)
+    assert ivf._index_ddl(ivf.index_name, concurrently=False).endswith(
+        "USING ivfflat (embedding vector_l2_ops) WITH (lists = 100)"
+    )
+
+
+def test_batch_query_runs_the_single_query_per_array_element():
+    store = PgVectorStore(session_factory=None, index_type="hnsw", quantization="binary", rescore_factor=4)
+    sql = str(store._batch_query_sql)
+    assert "unnest(CAST(:embeddings AS vector[])) WITH ORDINALITY AS queries (embedding, position)" in sql
+    assert "CROSS JOIN LATERAL" in sql
+    assert "ORDER BY binary_quantize(embedding)::bit(384) <~> binary_quantize(queries.embedding)::bit(384)" in sql
+    assert "embedding <-> queries.embedding AS distance" in sql
+    assert ":embedding " not in sql and ":embedding)" not in sql
+
+
+def parse_copy_text(data: bytes):
+    """
+    Split a COPY text stream into rows of fields, undoing its escapes the
+    way the server does; an unescaped \\N is NULL.
+    """
+    escapes = {"t": "\t", "n": "\n", "r": "\r"}
+    rows = []
+    for line in data.decode("utf-8").split("\n")[:-1]:
+        rows.append([
+            None if field == "\\N" else re.sub(r"\\(.)", lambda match: escapes.get(match[1], match[1]), field)
+            for field in line.split("\t")
+        ])
+    return rows
+
+
+def tricky_chunks():
+    return [
+        Chunk(
+            filename=f"dir/{TRICKY[:3]}é\\{index}.txt", chunk_id=index, content=f"{TRICKY} {index}",
+            embedding=[0.5, -1.25, float(index)], metadata={"heading": TRICKY, "page": index},
+        )
+        for index in range(3)
+    ]
+
+
+def test_copy_text_escapes_backslashes_and_separators_only():
+    assert _copy_text("a\tb\nc\rd\\e\\N é") == "a\\tb\\nc\\rd\\\\e\\\\N é"
+    escaped = _copy_text(TRICKY)
+    assert "\t" not in escaped and "\n" not in escaped and "\r" not in escaped
+    assert parse_copy_text(f"{escaped}\n".encode("utf-8")) == [[TRICKY]]
+
+
+class Psycopg3Cursor:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @contextmanager
+    def copy(self, sql):
+        written = []
+        yield SimpleNamespace(write=written.append)
+        self.session.copies.append((sql, "".join(written).encode("utf-8")))
+
+
+class Psycopg2Cursor(Psycopg3Cursor):
+    def copy_expert(self, sql, buffer):
+        self.session.copies.append((sql, buffer.read().encode("utf-8")))
+
+
+class RecordingSession:
+    """
+    Records the COPY streams and executed statements of the insert paths.
+    """
+    def __init__(self, psycopg2=True):
+        self.copies = []
+        self.executed = []
+        cursor = (Psycopg2Cursor if psycopg2 else Psycopg3Cursor)(self)
+        driver = SimpleNamespace(cursor=lambda: cursor)
+        self._connection = SimpleNamespace(connection=SimpleNamespace(driver_connection=driver))
+
+    def connection(self):
+        return self._connection
+
+    def execute(self, statement, parameters=None):
+        self.executed.append((statement, parameters))
+
+
+@pytest.mark.parametrize("psycopg2", [True, False])
+def test_copy_insert_round_trips_every_field(psycopg2):
+    chunks = tricky_chunks()
+    session = RecordingSession(psycopg2)
+    PgVectorStore(session_factory=None, insert_mode="copy")._insert_copy(session, chunks)
+
+    [(sql, data)] = session.copies
+    assert sql == "COPY embeddings (filename, chunk_id, content, embedding, doc_metadata) FROM STDIN"
+    # One line per row: every raw tab and newline in the stream is a separator
+    assert data.count(b"\n") == len(chunks) and data.count(b"\t") == 4 * len(chunks)
+    assert "漢字 😀".encode("utf-8") in data
+    rows = parse_copy_text(data)
+    assert len(rows) == len(chunks)
+    for chunk, (filename, chunk_id, content, embedding, metadata) in zip(chunks, rows):
+        assert filename == chunk.filename
+        assert int(chunk_id) == chunk.chunk_id
+        assert content == chunk.content
+        assert json.loads(embedding) == chunk.embedding
+        assert json.loads(metadata) == chunk.metadata
+
+
+def test_executemany_binds_one_parameter_set_per_chunk():
+    chunks = tricky_chunks()
+    session = RecordingSession()
+    PgVectorStore(session_factory=None, insert_mode="executemany")._insert_executemany(session, chunks)
+
+    [(statement, parameters)] = session.executed
+    assert statement.table is Embedding.__table__
+    assert parameters == [
+        {
+            "filename": chunk.filename,
+            "chunk_id": chunk.chunk_id,
+            "content": chunk.content,
+            "embedding": chunk.embedding,
+            "doc_metadata": chunk.metadata,
+        }
+        for chunk in chunks
+    ]
+    # Values are bound as they are: no COPY escaping on this path
+    assert parameters[0]["content"].startswith(TRICKY)
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from rag_project.adapters.chunker.basic_chunker import BasicChunker
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+from rag_project.adapters.loader.text_loader import TextLoader
+from rag_project.adapters.metadata.metadata_sqlite import MetadataSQLite
+from rag_project.adapters.saver.packed_saver import PackedChunkSaver
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.core.pipeline import PipelineSingleton
+from rag_project.core.ports.embedding_backend_port import EmbeddingBackendPort
+from rag_project.core.services.data_service import DataService
+from rag_project.core.services.embedding_service import EmbeddingService
+
+DIMENSION = 16
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class HashingBackend(EmbeddingBackendPort):
+    """
+    Deterministic embeddings derived from a hash of each text.
+    """
+    name = "hashing"
+    dimension = DIMENSION
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        rows = [np.frombuffer(hashlib.sha256(text.encode()).digest()[:DIMENSION], dtype=np.uint8) for text in texts]
+        return np.asarray(rows, dtype=np.float32).reshape(-1, DIMENSION)
+
+    def token_lengths(self, texts):
+        return [len(text.split()) + 2 for text in texts]
+
+
+def make_pipeline(raw_dir, work_dir, streaming):
+    PipelineSingleton()  # reads settings.yaml into the class attributes
+    pipeline = object.__new__(PipelineSingleton)
+    pipeline.raw_dir = str(raw_dir)
+    pipeline.streaming = streaming
+    pipeline.incremental = False
+    pipeline.batch_size = 3
+    pipeline.vector_store_type = "faiss"
+    pipeline.faiss_directory = ""
+    # Instance attributes take precedence over the lazily built components
+    pipeline.data_service = DataService(
+        [TextLoader()], SimpleCleaner(), BasicChunker(chunk_size=24, overlap=6),
+        PackedChunkSaver(str(work_dir / "processed")), MetadataSQLite(str(work_dir / "metadata.db")),
+    )
+    pipeline.embedding_service = EmbeddingService(backend=HashingBackend())
+    pipeline.vector_store = FaissVectorStore(DIMENSION)
+    return pipeline
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    raw = tmp_path / "raw"
+    (raw / "sub").mkdir(parents=True)
+    for index, relpath in enumerate(["a.txt", "b.txt", "sub/c.txt", "sub/d.txt"]):
+        (raw / relpath).write_text(f"document {index} " + "word " * (5 + 7 * index), encoding="utf-8")
+    return raw
+
+
+def test_streaming_ingestion_stores_what_whole_corpus_ingestion_stores(raw_dir, tmp_path, capsys):
+    stores = {}
+    for streaming in (False, True):
+        work_dir = tmp_path / f"work_{streaming}"
+        work_dir.mkdir()
+        pipeline = make_pipeline(raw_dir, work_dir, streaming)
+        pipeline.run_ingestion()
+        assert ("streaming ingestion" in capsys.readouterr().out) == streaming
+        stores[streaming] = pipeline.vector_store
+        pipeline.data_service.saver.close()
+        pipeline.data_service.metadata_repo.close()
+
+    whole, streamed = stores[False], stores[True]
+    assert whole.index.ntotal == streamed.index.ntotal > 3
+    assert [whole.chunk_table.record(row) for row in range(whole.index.ntotal)] == [
+        streamed.chunk_table.record(row) for row in range(streamed.index.ntotal)
+    ]
+    np.testing.assert_array_equal(
+        whole.index.reconstruct_n(0, whole.index.ntotal), streamed.index.reconstruct_n(0, streamed.index.ntotal),
+    )
+    query = HashingBackend().encode(["document 2"])[0]
+    assert whole.query(query, top_k=5) == streamed.query(query, top_k=5)
+
+
+def test_incremental_ingestion_keeps_one_copy_of_every_live_file(raw_dir, tmp_path):
+    pipeline = make_pipeline(raw_dir, tmp_path, streaming=True)
+    pipeline.faiss_directory = str(tmp_path / "faiss")
+    data_service = pipeline.data_service
+
+    def state():
+        saved = {}
+        for filename, chunk_id in data_service.saver.keys():
+            saved.setdefault(filename, []).append(data_service.saver.get_chunk(filename, chunk_id).content)
+        store = pipeline.vector_store
+        live = [store.chunk_table.record(row) for row in range(len(store.chunk_table)) if row not in store._deleted]
+        recorded = sorted(row[1] for row in data_service.metadata_repo.fetch_metadata())
+        return recorded, {name: sorted(contents) for name, contents in saved.items()}, live
+
+    pipeline.run_incremental_ingestion()
+    recorded, saved, live = state()
+    assert recorded == sorted(saved) == ["a.txt", "b.txt", "sub/c.txt", "sub/d.txt"]
+
+    (raw_dir / "a.txt").write_text("changed " * 9, encoding="utf-8")
+    (raw_dir / "b.txt").unlink()
+    pipeline.run_incremental_ingestion()
+    recorded, saved, live = state()
+    assert recorded == sorted(saved) == ["a.txt", "sub/c.txt", "sub/d.txt"]
+    assert {name: sorted(record["content"] for record in live if record["filename"] == name) for name in saved} == saved
+    assert all("changed" in content for content in saved["a.txt"])
+    # More than a fifth of the rows were stale, so the save compacted them away
+    assert pipeline.vector_store.index.ntotal == len(live)
+
+    (raw_dir / "sub" / "c.txt").unlink()
+    pipeline.run_incremental_ingestion()
+    recorded, saved, live = state()
+    assert recorded == sorted(saved) == ["a.txt", "sub/d.txt"]
+    assert sorted({record["filename"] for record in live}) == ["a.txt", "sub/d.txt"]
+    data_service.saver.close()
+    data_service.metadata_repo.close()
+
+
+RETRIEVAL_ONLY = """
+import json, sys
+from rag_project.core.pipeline import PipelineSingleton
+
+pipeline = PipelineSingleton()
+PipelineSingleton.vector_store_type = "faiss"
+PipelineSingleton.faiss_directory = ""
+PipelineSingleton.metadata_type = "sqlite"
+PipelineSingleton.metadata_sqlite_path = sys.argv[1]
+PipelineSingleton.embedding_cache = False
+pipeline.metadata_repo
+pipeline.retrieval_service
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def test_a_retrieval_only_process_never_imports_the_ingestion_stack(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", RETRIEVAL_ONLY, str(tmp_path / "metadata.db")],
+        cwd=REPO_ROOT, env={**os.environ, "PYTHONPATH": REPO_ROOT}, capture_output=True, text=True, check=True,
+    )
+    modules = json.loads(result.stdout.splitlines()[-1])
+    assert "rag_project.core.services.retrieval_service" in modules
+    assert "rag_project.adapters.vector_store.faiss_vector_store" in modules
+    heavy = [
+        name for name in modules
+        if name.split(".")[0] in ("pdfplumber", "sentence_transformers", "torch")
+        or name.startswith("rag_project.adapters.loader")
+    ]
+    assert heavy == []
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from rag_project.core.services.query_batcher import MicroBatchingQueryEncoder
+
+
+class RecordingEncoder:
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, queries):
+        self.release.wait(5)
+        self.calls.append(list(queries))
+        return np.array([[len(query), i] for i, query in enumerate(queries)], dtype=np.float32)
+
+
+def test_concurrent_queries_share_one_encode_call():
+    encode = RecordingEncoder()
+    batcher = MicroBatchingQueryEncoder(encode, max_batch_size=8, max_delay_ms=1000)
+    futures = [batcher.submit(query) for query in ["a", "bb", "a", "ccc"]]
+    encode.release.set()
+
+    results = [future.result(5) for future in futures]
+    batcher.close()
+
+    assert encode.calls == [["a", "bb", "ccc"]]
+    assert [row[0] for row in results] == [1, 2, 1, 3]
+    assert batcher.stats() == {"batches": 1, "queries": 4, "mean_batch_size": 4.0}
+
+
+def test_batch_size_limit_and_errors_reach_callers():
+    calls = []
+
+    def encode(queries):
+        calls.append(len(queries))
+        if "bad" in queries:
+            raise RuntimeError("encode failed")
+        return np.zeros((len(queries), 2), dtype=np.float32)
+
+    batcher = MicroBatchingQueryEncoder(encode, max_batch_size=2, max_delay_ms=50)
+    futures = [batcher.submit(query) for query in ["q1", "q2", "q3"]]
+    assert all(future.result(5).shape == (2,) for future in futures)
+    assert calls[0] == 2
+
+    try:
+        batcher.encode("bad", timeout=5)
+    except RuntimeError as error:
+        assert str(error) == "encode failed"
+    else:
+        raise AssertionError("expected the encode error")
+    batcher.close()
+
+
+def test_aencode_from_asyncio():
+    batcher = MicroBatchingQueryEncoder(lambda queries: np.ones((len(queries), 3), dtype=np.float32))
+
+    async def run():
+        return await asyncio.gather(*(batcher.aencode(f"q{i}") for i in range(5)))
+
+    results = asyncio.run(run())
+    batcher.close()
+    assert len(results) == 5 and all(row.shape == (3,) for row in results)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from rag_project.adapters.vector_store.faiss_vector_store import FaissVectorStore
+from rag_project.core.domain.chunk import Chunk
+from rag_project.core.domain.chunk_batch import ChunkBatch
+from rag_project.core.services.retrieval_service import RetrievalService
+
+WORDS = ["alpha", "beta", "gamma", "delta"]
+
+
+class OneHotEmbeddings:
+    """
+    Embeds a query as the one-hot vector of its word, counting encode calls.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def generate_query_vector(self, query):
+        return self.generate_query_vectors([query])[0]
+
+    def generate_query_vectors(self, queries):
+        self.calls.append(list(queries))
+        return np.eye(len(WORDS), dtype=np.float32)[[WORDS.index(query) for query in queries]]
+
+
+def make_service():
+    store = FaissVectorStore(len(WORDS))
+    chunks = [Chunk(filename=f"{word}.txt", chunk_id=i, content=word, metadata={"word": word}) for i, word in enumerate(WORDS)]
+    store.insert_batch(ChunkBatch(chunks=chunks, embeddings=np.eye(len(WORDS), dtype=np.float32)))
+    embeddings = OneHotEmbeddings()
+    return RetrievalService(store, embeddings), embeddings
+
+
+def test_retrieve_batch_encodes_once_and_returns_distances():
+    service, embeddings = make_service()
+    service.retrieve("gamma", 1)
+
+    results = service.retrieve_batch(["beta", " gamma ", "beta", "delta"], top_k=2)
+    # "gamma" is cached and the repeated "beta" is encoded once
+    assert embeddings.calls == [["gamma"], ["beta", "delta"]]
+    assert [[chunk.content for chunk, _ in hits] for hits in results] == [
+        ["beta", "alpha"], ["gamma", "alpha"], ["beta", "alpha"], ["delta", "alpha"],
+    ]
+    assert results[0][0][1] == 0.0 and results[0][1][1] == 2.0
+    assert [chunk.content for chunk in service.retrieve("delta", 1)] == ["delta"]
+
+
+def test_retrieve_batch_applies_filters_per_query():
+    service, _ = make_service()
+    results = service.retrieve_batch(["alpha", "beta"], top_k=1, filters={"word": "gamma"})
+    assert [[chunk.content for chunk, _ in hits] for hits in results] == [["gamma"], ["gamma"]]
+    assert service.retrieve_batch([], top_k=1) == []
+
+
+def test_results_of_a_search_overlapping_a_write_are_not_cached():
+    store = FaissVectorStore(len(WORDS))
+    service = RetrievalService(store, OneHotEmbeddings(), result_ttl_seconds=60)
+    search = store.query
+
+    def query_during_write(embedding, top_k, **search_params):
+        results = search(embedding, top_k, **search_params)
+        # The write lands after the search read the index, before its results are cached
+        store.insert_batch(ChunkBatch(
+            chunks=[Chunk(filename="beta.txt", chunk_id=0, content="beta")],
+            embeddings=np.eye(len(WORDS), dtype=np.float32)[[1]],
+        ))
+        return results
+
+    store.query = query_during_write
+    assert service.retrieve("beta", 1) == []
+    assert store.write_generation == 1
+    assert len(service.result_cache) == 0
+
+    store.query = search
+    assert [chunk.content for chunk in service.retrieve("beta", 1)] == ["beta"]
+    assert [chunk.content for chunk in service.retrieve("beta", 1)] == ["beta"]
+    assert service.cache_stats()["results"]["hits"] == 1
@@ -0,0 +1,42 @@
+import pytest
+from rag_project.adapters.cleaner.rule_cleaner import RuleCleaner
+from rag_project.adapters.cleaner.simple_cleaner import SimpleCleaner
+
+SAMPLE = (
+    "  Install langchain-core>=0.3.20 “now”,   then run:\r\n\n\n\n"
+    "def extract(text):  \n    return chain.invoke({'text': text})\t\t# done\n\n"
+    "Set LANGCHAIN_TRACING_V2 and LANGCHAIN_API_KEY . \u200b "
+)
+
+
+@pytest.mark.parametrize("text", [SAMPLE, "", "   ", "a , b", "x\t \n y", SAMPLE * 50])
+def test_simple_preset_matches_simple_cleaner(text):
+    """
+    The "simple" preset must reproduce SimpleCleaner exactly.
+    """
+    assert RuleCleaner.from_preset("simple").clean(text) == SimpleCleaner().clean(text)
+
+
+def test_code_preset_keeps_code_and_versions():
+    """
+    The "code" preset normalizes layout but keeps punctuation.
+    """
+    cleaned = RuleCleaner.from_preset("code").clean(SAMPLE)
+    assert "langchain-core>=0.3.20" in cleaned
+    assert '"now"' in cleaned
+    assert "return chain.invoke({'text': text})" in cleaned
+    assert "\n\n\n" not in cleaned
+    assert "\r" not in cleaned and "\u200b" not in cleaned
+
+
+@pytest.mark.parametrize("preset", ["simple", "code"])
+def test_parallel_segments_match_serial(preset):
+    """
+    Segment-parallel cleaning gives the same result as a single pass.
+    """
+    text = SAMPLE * 200
+    parallel = RuleCleaner.from_preset(preset, num_workers=2, segment_size=1000)
+    try:
+        assert parallel.clean(text) == RuleCleaner.from_preset(preset).clean(text)
+    finally:
+        parallel.close()
@@ -0,0 +1,120 @@
+import pytest
+from tokenizers import Tokenizer, models, pre_tokenizers, processors
+from transformers import PreTrainedTokenizerFast
+
+from rag_project.adapters.chunker.sentence_chunker import SentenceChunker
+from rag_project.core.domain.document import Document
+from rag_project.core.ports.cleaner_port import CleanerPort
+from rag_project.core.ports.plugin_port import Plugin
+from rag_project.core.services.data_service import _load_clean_chunk
+
+
+@pytest.fixture
+def tokenizer():
+    # One token per whitespace-separated word, plus [CLS] and [SEP] like the embedding models
+    backend = Tokenizer(models.WordLevel({"[UNK]": 0, "[CLS]": 1, "[SEP]": 2}, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    backend.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 1), ("[SEP]", 2)],
+    )
+    return PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", cls_token="[CLS]", sep_token="[SEP]")
+
+
+def sentence(index: int, words: int) -> str:
+    return " ".join([f"s{index}"] + ["w"] * (words - 2) + ["end."])
+
+
+def test_sentences_are_packed_whole_within_the_token_budget(tokenizer):
+    text = " ".join(sentence(i, 4) for i in range(6))
+    chunker = SentenceChunker(max_tokens=10, tokenizer=tokenizer)
+    assert chunker.token_budget == 8
+
+    chunks = chunker.chunk(Document(filename="doc.txt", content=text))
+    # Two 4-word sentences fill the 8-token budget
+    assert [chunk.content for chunk in chunks] == [
+        f"{sentence(0, 4)} {sentence(1, 4)}",
+        f"{sentence(2, 4)} {sentence(3, 4)}",
+        f"{sentence(4, 4)} {sentence(5, 4)}",
+    ]
+    assert [chunk.chunk_id for chunk in chunks] == [0, 1, 2]
+    for chunk in chunks:
+        start, end = chunk.metadata["start_offset"], chunk.metadata["end_offset"]
+        assert text[start:end] == chunk.content
+
+
+def test_no_chunk_exceeds_the_model_window(tokenizer):
+    text = " ".join(sentence(i, 3 + i % 5) for i in range(40))
+    chunker = SentenceChunker(max_tokens=12, tokenizer=tokenizer, block_size=32)
+    chunks = chunker.chunk(Document(filename="doc.txt", content=text))
+
+    lengths = [len(ids) for ids in tokenizer([chunk.content for chunk in chunks])["input_ids"]]
+    assert max(lengths) <= 12
+    # Small blocks must not drop or duplicate any word
+    assert " ".join(chunk.content for chunk in chunks).split() == text.split()
+
+
+def test_a_sentence_longer_than_the_budget_is_split_at_tokens(tokenizer):
+    text = f"{sentence(0, 2)} {sentence(1, 11)} {sentence(2, 2)}"
+    chunker = SentenceChunker(max_tokens=6, tokenizer=tokenizer)
+    chunks = chunker.chunk(Document(filename="doc.txt", content=text))
+
+    assert [len(chunk.content.split()) for chunk in chunks] == [2, 4, 4, 3, 2]
+    assert chunks[0].content == sentence(0, 2)
+    assert chunks[-1].content == sentence(2, 2)
+
+
+def test_overlap_restarts_at_a_whole_sentence(tokenizer):
+    text = " ".join(sentence(i, 3) for i in range(5))
+    chunker = SentenceChunker(max_tokens=11, overlap_tokens=3, tokenizer=tokenizer)
+    chunks = chunker.chunk(Document(filename="doc.txt", content=text))
+
+    # Each chunk starts with the last sentence of the previous one
+    assert [chunk.content for chunk in chunks] == [
+        " ".join(sentence(i, 3) for i in (0, 1, 2)),
+        " ".join(sentence(i, 3) for i in (2, 3, 4)),
+    ]
+
+
+def test_empty_document_has_no_chunks(tokenizer):
+    chunker = SentenceChunker(tokenizer=tokenizer)
+    assert chunker.chunk(Document(filename="doc.txt", content="  \n ")) == []
+
+
+class PagedLoader(Plugin):
+    """
+    Loads a file in parts separated by form feeds, like the pages of a PDF.
+    """
+    def supports(self, filename):
+        return True
+
+    def load(self, filepath):
+        raise NotImplementedError
+
+    def load_parts(self, filepath):
+        with open(filepath, encoding="utf-8") as file:
+            for number, page in enumerate(file.read().split("\f"), start=1):
+                yield Document(filename=filepath, content=page, metadata={"page": number})
+
+
+class StripCleaner(CleanerPort):
+    def clean(self, text):
+        return text.strip()
+
+
+def test_offsets_of_a_document_loaded_in_parts_index_the_whole_document(tokenizer, tmp_path):
+    pages = [" ".join(sentence(page * 10 + i, 3 + i % 4) for i in range(5 + page)) for page in range(3)]
+    path = tmp_path / "paged.txt"
+    path.write_text("\f".join(f"  {page}\n" for page in pages), encoding="utf-8")
+
+    filename, chunks = _load_clean_chunk(
+        PagedLoader(), StripCleaner(), SentenceChunker(max_tokens=10, tokenizer=tokenizer), str(path), "paged.txt",
+    )
+    full_text = "".join(pages)
+    assert filename == "paged.txt"
+    assert {chunk.metadata["page"] for chunk in chunks} == {1, 2, 3}
+    assert [chunk.chunk_id for chunk in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert full_text[chunk.metadata["start_offset"]:chunk.metadata["end_offset"]] == chunk.content
+    # Spans no longer restart at 0 on every page
+    starts = [chunk.metadata["start_offset"] for chunk in chunks]
+    assert starts == sorted(set(starts))
@@ -0,0 +1,105 @@
+import io
+import json
+import mmap
+
+import pytest
+from bs4 import BeautifulSoup
+
+from rag_project.adapters.loader.html_json_adapter import HtmlLoader, JsonLoader, iter_html_text, iter_json_text
+from rag_project.adapters.loader.notebook_adapter import NotebookLoader, _JsonScanner
+
+JSON_DOCUMENTS = [
+    {"a": 1, "b": [1, 2.5, -3e-7, True, False, None], "c": {}, "d": [], "e": {"f": [{}, [[]], {"g": "h"}]}},
+    [{"unicode": "café ☃ \U0001f600", "escapes": "quote \" backslash \\ tab \t newline \n"}],
+    {"int64": 9223372036854775807, "float": 0.1, "exponent": 1e300, "negative": -0.0},
+    "just a string",
+    42,
+    [],
+    {},
+]
+
+
+@pytest.mark.parametrize("document", JSON_DOCUMENTS)
+def test_iter_json_text_matches_json_dumps(document):
+    data = json.dumps(document).encode()
+    assert "".join(iter_json_text(io.BytesIO(data))) == json.dumps(json.loads(data), indent=2)
+
+
+HTML = """<!DOCTYPE html>
+<html><head><title>Title &amp; more</title>
+<style>body { color: red; }</style>
+<script>if (a < b) { document.write("<p>no</p>"); }</script></head>
+<body><!-- a comment --><h1>Heading</h1><p>Caf&eacute; &#x2603; <b>bold</b> text</p>
+<![CDATA[kept cdata]]><?php echo 1 ?>
+""" + "<p>paragraph</p>\n" * 50 + """</body></html>"""
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 64 * 1024])
+def test_iter_html_text_matches_beautifulsoup(block_size):
+    text = "".join(iter_html_text(io.StringIO(HTML), block_size=block_size))
+    assert text == BeautifulSoup(HTML, "html.parser").get_text()
+
+
+def test_loaders_yield_parts_that_join_to_the_whole_text(tmp_path):
+    html_path = tmp_path / "page.html"
+    html_path.write_text(HTML, encoding="utf-8")
+    json_path = tmp_path / "data.json"
+    json_path.write_text(json.dumps(JSON_DOCUMENTS), encoding="utf-8")
+
+    for loader, path in ((HtmlLoader(part_size=100), html_path), (JsonLoader(part_size=100), json_path)):
+        parts = list(loader.load_parts(str(path)))
+        assert len(parts) > 1
+        assert "".join(part.content for part in parts) == loader.load(str(path)).content
+
+
+def write_notebook(path, cells, indent=None):
+    notebook = {"metadata": {"kernelspec": {"name": "python3"}}, "nbformat": 4, "nbformat_minor": 5, "cells": cells}
+    path.write_text(json.dumps(notebook, indent=indent), encoding="utf-8")
+
+
+@pytest.mark.parametrize("indent", [None, 1])
+def test_notebook_keeps_only_markdown_sources(tmp_path, indent):
+    cells = [
+        {"cell_type": "markdown", "metadata": {"tags": ["a]b", "{c}"]}, "source": ["# Title\n", "Café \"quoted\""]},
+        {
+            "cell_type": "code",
+            "execution_count": 3,
+            "metadata": {},
+            "outputs": [{"output_type": "display_data", "data": {"image/png": "iVBORw0KGgo" * 1000, "text/plain": ["<Figure>"]}}],
+            "source": ["print('not markdown')"],
+        },
+        {"source": "single string source", "metadata": {}, "cell_type": "markdown"},
+        {"cell_type": "raw", "metadata": {}, "source": []},
+        {"cell_type": "markdown", "metadata": {}, "source": []},
+    ]
+    path = tmp_path / "notebook.ipynb"
+    write_notebook(path, cells, indent)
+
+    document = NotebookLoader().load(str(path))
+    assert document.filename == "notebook.ipynb"
+    assert document.content == "# Title\nCafé \"quoted\"\nsingle string source\n"
+
+
+def test_notebook_without_cells_is_empty_and_malformed_notebooks_raise(tmp_path):
+    path = tmp_path / "empty.ipynb"
+    path.write_text('{"metadata": {}, "nbformat": 4}', encoding="utf-8")
+    assert NotebookLoader().load(str(path)).content == ""
+
+    path.write_text('{"cells": [{"cell_type": "markdown", "source": ["unterminated', encoding="utf-8")
+    with pytest.raises(ValueError):
+        NotebookLoader().load(str(path))
+    path.write_text("", encoding="utf-8")
+    with pytest.raises(ValueError):
+        NotebookLoader().load(str(path))
+
+
+def test_notebook_scan_releases_mapped_pages_as_it_goes(tmp_path):
+    cells = [{"cell_type": "markdown", "metadata": {}, "source": [f"cell {i}"]} for i in range(200)]
+    path = tmp_path / "notebook.ipynb"
+    write_notebook(path, cells)
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        scanner = _JsonScanner(buffer, release_size=mmap.PAGESIZE)
+        sources = list(NotebookLoader._markdown_sources(scanner))
+        assert scanner._released > 0 and scanner._released % mmap.PAGESIZE == 0
+    assert sources == [f"cell {i}" for i in range(200)]